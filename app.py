@@ -5,23 +5,27 @@ Todo-Timed - Планировщик задач с календарем и нап
 """
 
 import sys
+import time
 import logging
 import traceback
 from pathlib import Path
 
+# Момент запуска процесса: от него отсчитываются фазы запуска (включая импорт Qt)
+PROCESS_START = time.perf_counter()
+
 # Добавляем текущую директорию в путь для импорта модулей
 sys.path.insert(0, str(Path(__file__).parent))
 
-from PySide6.QtWidgets import QApplication, QMessageBox, QSplashScreen
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QPixmap, QIcon
+from PySide6.QtWidgets import QApplication, QMessageBox
+from PySide6.QtCore import QObject, QEvent, QTimer
+from PySide6.QtGui import QIcon
 
 from core.resource_manager import ResourceManager
 from core.settings import Settings
 from core.localization import Localization
 from core.database import Database
-from core.notifications import NotificationManager, ReminderScheduler
-from ui.main_window import MainWindow
+from core.notifications import NotificationManager, ReminderScheduler, OverdueChecker
+from ui.main_window import MainWindow, load_background_pixmap
 
 # Настройка логирования
 def setup_logging():
@@ -45,10 +49,55 @@ def setup_logging():
 logger = logging.getLogger(__name__)
 
 
+class StartupProfiler:
+    """Длительность фаз запуска (с ключом --profile-startup отчет выводится в консоль)"""
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases = []
+        self._last = PROCESS_START
+    
+    def mark(self, phase: str):
+        """Завершить фазу: время с конца предыдущей фазы"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+    
+    def report(self):
+        """Записать отчет в журнал (и вывести в консоль, если профилирование включено)"""
+        lines = [f"  {phase:<24}{seconds * 1000:9.1f} мс" for phase, seconds in self.phases]
+        lines.append(f"  {'всего':<24}{(self._last - PROCESS_START) * 1000:9.1f} мс")
+        text = "Профиль запуска:\n" + "\n".join(lines)
+        
+        if self.enabled:
+            print(text)
+        logger.debug(text)
+
+
+class FirstPaintWatcher(QObject):
+    """Однократный вызов callback после первой отрисовки виджета"""
+    
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+    
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint:
+            watched.removeEventFilter(self)
+            # Вызов после завершения отрисовки, когда кадр уже на экране
+            QTimer.singleShot(0, self.callback)
+        return False
+
+
 class TodoTimedApplication:
     """Основной класс приложения"""
     
-    def __init__(self):
+    def __init__(self, profile_startup: bool = False):
+        """
+        Args:
+            profile_startup: Вывести в консоль длительность фаз запуска
+        """
         self.app = None
         self.main_window = None
         self.database = None
@@ -56,10 +105,18 @@ class TodoTimedApplication:
         self.localization = None
         self.notification_manager = None
         self.reminder_scheduler = None
-        self.splash = None
+        self.overdue_checker = None
+        self.profiler = StartupProfiler(profile_startup)
+        self.profiler.mark("импорт модулей")
         
     def initialize(self):
-        """Инициализация приложения"""
+        """
+        Инициализация приложения
+        
+        Создается только то, что нужно для первого кадра: настройки, переводы,
+        база данных и главное окно с текущим днем. Уведомления, трей, иконка
+        и обслуживание базы данных - в finish_startup после первой отрисовки.
+        """
         try:
             logger.info("Запуск Todo-Timed...")
             
@@ -68,23 +125,21 @@ class TodoTimedApplication:
             self.app.setApplicationName("Todo-Timed")
             self.app.setApplicationVersion("1.0.0")
             self.app.setOrganizationName("Todo-Timed")
-            
-            # Показываем заставку
-            self.show_splash()
+            self.profiler.mark("QApplication")
             
             # Инициализируем компоненты
             self.init_settings()
+            self.profiler.mark("настройки")
             self.init_localization()
+            self.profiler.mark("локализация")
             self.init_database()
-            self.init_notifications()
+            self.profiler.mark("база данных")
             self.init_main_window()
+            self.profiler.mark("главное окно")
             
             # Подключаем сигналы
             self.connect_signals()
             
-            # Скрываем заставку
-            self.hide_splash()
-            
             logger.info("Todo-Timed успешно инициализирован")
             return True
             
@@ -94,44 +149,9 @@ class TodoTimedApplication:
             self.show_error("Ошибка инициализации", str(e))
             return False
     
-    def show_splash(self):
-        """Показать заставку"""
-        try:
-            # Пытаемся загрузить фоновое изображение для заставки
-            bg_path = ResourceManager.get_resource_path("resources/images/background.png")
-            if bg_path and bg_path.exists():
-                pixmap = QPixmap(str(bg_path)).scaled(400, 300, Qt.AspectRatioMode.KeepAspectRatio)
-            else:
-                # Создаем простую заставку
-                pixmap = QPixmap(400, 300)
-                pixmap.fill(Qt.GlobalColor.white)
-            
-            self.splash = QSplashScreen(pixmap)
-            self.splash.show()
-            self.splash.showMessage("Загрузка Todo-Timed...", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter)
-            
-            # Обрабатываем события для отображения заставки
-            self.app.processEvents()
-            
-        except Exception as e:
-            logger.warning(f"Не удалось показать заставку: {e}")
-    
-    def hide_splash(self):
-        """Скрыть заставку"""
-        try:
-            if self.splash:
-                self.splash.finish(self.main_window)
-                self.splash = None
-        except Exception as e:
-            logger.warning(f"Ошибка скрытия заставки: {e}")
-    
     def init_settings(self):
         """Инициализация настроек"""
         try:
-            if self.splash:
-                self.splash.showMessage("Загрузка настроек...", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter)
-                self.app.processEvents()
-            
             self.settings = Settings()
             logger.debug("Настройки инициализированы")
             
@@ -142,10 +162,6 @@ class TodoTimedApplication:
     def init_localization(self):
         """Инициализация локализации"""
         try:
-            if self.splash:
-                self.splash.showMessage("Загрузка локализации...", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter)
-                self.app.processEvents()
-            
             language = self.settings.get('language', 'ru')
             self.localization = Localization(language)
             logger.debug(f"Локализация инициализирована: {language}")
@@ -157,10 +173,6 @@ class TodoTimedApplication:
     def init_database(self):
         """Инициализация базы данных"""
         try:
-            if self.splash:
-                self.splash.showMessage("Инициализация базы данных...", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter)
-                self.app.processEvents()
-            
             self.database = Database()
             logger.debug("База данных инициализирована")
             
@@ -171,13 +183,26 @@ class TodoTimedApplication:
     def init_notifications(self):
         """Инициализация системы уведомлений"""
         try:
-            if self.splash:
-                self.splash.showMessage("Настройка уведомлений...", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter)
-                self.app.processEvents()
-            
             self.notification_manager = NotificationManager(self.localization, self.settings)
             self.reminder_scheduler = ReminderScheduler(self.notification_manager)
             
+            # Подключаем сигналы уведомлений к главному окну
+            self.notification_manager.notification_clicked.connect(self.on_notification_clicked)
+            self.notification_manager.task_action_requested.connect(self.on_task_action_requested)
+            
+            # Значок в трее и напоминания о задачах загруженных дней
+            self.notification_manager.start_notification_service()
+            if self.main_window:
+                self.main_window.set_reminder_scheduler(self.reminder_scheduler)
+            
+            # Уведомления о задачах, срок которых прошел с предыдущей проверки
+            self.overdue_checker = OverdueChecker(
+                self.database,
+                self.notification_manager,
+                self.main_window.repository if self.main_window else None
+            )
+            self.overdue_checker.start_checking()
+            
             logger.debug("Система уведомлений инициализирована")
             
         except Exception as e:
@@ -188,19 +213,13 @@ class TodoTimedApplication:
     def init_main_window(self):
         """Инициализация главного окна"""
         try:
-            if self.splash:
-                self.splash.showMessage("Создание интерфейса...", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter)
-                self.app.processEvents()
-            
             self.main_window = MainWindow(
                 self.database,
                 self.localization,
-                self.settings
+                self.settings,
+                deferred_startup=True
             )
             
-            # Устанавливаем иконку приложения
-            self.set_application_icon()
-            
             logger.debug("Главное окно инициализировано")
             
         except Exception as e:
@@ -210,10 +229,10 @@ class TodoTimedApplication:
     def set_application_icon(self):
         """Установить иконку приложения"""
         try:
-            # Пытаемся использовать фоновое изображение как иконку
-            bg_path = ResourceManager.get_resource_path("resources/images/background.png")
-            if bg_path and bg_path.exists():
-                icon = QIcon(str(bg_path))
+            # Фоновое изображение (уже загруженное для окна) используется как иконка
+            pixmap = load_background_pixmap()
+            if pixmap is not None:
+                icon = QIcon(pixmap)
                 self.app.setWindowIcon(icon)
                 if self.main_window:
                     self.main_window.setWindowIcon(icon)
@@ -224,11 +243,6 @@ class TodoTimedApplication:
     def connect_signals(self):
         """Подключение сигналов между компонентами"""
         try:
-            # Подключаем сигналы уведомлений к главному окну
-            if self.notification_manager and self.main_window:
-                self.notification_manager.notification_clicked.connect(self.on_notification_clicked)
-                self.notification_manager.task_action_requested.connect(self.on_task_action_requested)
-            
             # Подключаем сигнал закрытия главного окна
             if self.main_window:
                 self.main_window.closing.connect(self.on_main_window_closing)
@@ -238,6 +252,34 @@ class TodoTimedApplication:
         except Exception as e:
             logger.error(f"Ошибка подключения сигналов: {e}")
     
+    def schedule_deferred_startup(self):
+        """Запланировать finish_startup после первой отрисовки окна"""
+        if self.main_window.isVisible():
+            FirstPaintWatcher(self.main_window.centralWidget(), self.finish_startup)
+        else:
+            # Запуск свернутым: отрисовки не будет, достаточно дождаться цикла событий
+            QTimer.singleShot(0, self.finish_startup)
+    
+    def finish_startup(self):
+        """Отложенная инициализация: уведомления, трей, иконка, обслуживание базы данных"""
+        try:
+            self.profiler.mark("первая отрисовка")
+            
+            self.init_notifications()
+            self.profiler.mark("уведомления")
+            
+            self.main_window.finish_startup()
+            self.profiler.mark("фоновые задачи окна")
+            
+            self.set_application_icon()
+            self.profiler.mark("иконка")
+            
+            self.profiler.report()
+            
+        except Exception as e:
+            logger.error(f"Ошибка отложенной инициализации: {e}")
+            logger.error(traceback.format_exc())
+    
     def on_notification_clicked(self, notification_id: str):
         """Обработка клика по уведомлению"""
         try:
@@ -268,6 +310,9 @@ class TodoTimedApplication:
             if self.reminder_scheduler:
                 self.reminder_scheduler.cancel_all_reminders()
             
+            if self.overdue_checker:
+                self.overdue_checker.stop_checking()
+            
             logger.info("Приложение завершает работу")
             
         except Exception as e:
@@ -305,6 +350,9 @@ class TodoTimedApplication:
             if not self.settings.get('start_minimized', False):
                 self.show_main_window()
             
+            # Остальное инициализируется, когда окно уже на экране
+            self.schedule_deferred_startup()
+            
             # Запускаем главный цикл приложения
             return self.app.exec()
             
@@ -326,9 +374,19 @@ class TodoTimedApplication:
             if self.reminder_scheduler:
                 self.reminder_scheduler.cancel_all_reminders()
             
+            if self.overdue_checker:
+                self.overdue_checker.stop_checking()
+            
+            if self.main_window:
+                self.main_window.wait_for_background_tasks()
+            
             if self.database:
                 self.database.close()
             
+            # Записываем отложенные изменения настроек
+            if self.settings:
+                self.settings.flush()
+            
             logger.info("Ресурсы очищены")
             
         except Exception as e:
@@ -342,7 +400,7 @@ def main():
         setup_logging()
         
         # Создаем и запускаем приложение
-        app = TodoTimedApplication()
+        app = TodoTimedApplication(profile_startup="--profile-startup" in sys.argv)
         return app.run()
         
     except KeyboardInterrupt:
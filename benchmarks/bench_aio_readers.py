@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк AioRepository: параллельные читатели в режиме WAL
+Сравнивает последовательные вызовы Database с 1/2/4/8 потоками-читателями,
+а также чтение одновременно с пакетной записью
+"""
+
+import os
+import sys
+import time
+import asyncio
+import random
+from datetime import datetime, date, timedelta
+
+from bench_utils import temp_db_path, report
+
+from core.database import Database
+from core.aio_repository import AioRepository
+from core.models import Task, TaskList
+
+SIZE = 100_000
+LISTS = 365
+QUERIES = 400
+READERS = (1, 2, 4, 8)
+WRITE_BATCHES = 20
+WRITE_BATCH_SIZE = 2_000
+
+START = date(2031, 1, 1)
+
+
+def seed(database: Database, size: int):
+    """Заполнить базу size задачами, распределенными по LISTS дням"""
+    per_list = size // LISTS
+    for day in range(LISTS):
+        list_date = START + timedelta(days=day)
+        list_id = database.create_task_list(TaskList(date=list_date))
+        due_start = datetime.combine(list_date, datetime.min.time())
+        database.create_tasks([
+            Task(list_id=list_id, title=f"Задача {day}-{i}", due_at=due_start + timedelta(minutes=i))
+            for i in range(per_list)
+        ])
+
+
+def month_ranges(count: int) -> list[tuple[date, date]]:
+    """Случайные диапазоны в 6 недель (как сетка календаря)"""
+    rnd = random.Random(7)
+    ranges = []
+    for _ in range(count):
+        start = START + timedelta(days=rnd.randrange(LISTS - 42))
+        ranges.append((start, start + timedelta(days=42)))
+    return ranges
+
+
+async def read_concurrently(repository: AioRepository, ranges: list):
+    """Выполнить все запросы одновременно"""
+    await asyncio.gather(*(
+        repository.get_task_counts_by_date(start, end) for start, end in ranges
+    ))
+
+
+async def write_batches(repository: AioRepository, list_date: date):
+    """Записать WRITE_BATCHES пакетов задач в новый список"""
+    list_id = await repository.create_task_list(TaskList(date=list_date))
+    for batch in range(WRITE_BATCHES):
+        await repository.create_tasks([
+            Task(list_id=list_id, title=f"Пакет {batch}-{i}") for i in range(WRITE_BATCH_SIZE)
+        ])
+
+
+async def timed(coroutine) -> float:
+    """Время выполнения корутины в секундах"""
+    begin = time.perf_counter()
+    await coroutine
+    return time.perf_counter() - begin
+
+
+def main():
+    """Главная функция бенчмарка"""
+    print(f"=== AioRepository, {SIZE} задач, {QUERIES} запросов get_task_counts_by_date, "
+          f"ядер: {os.cpu_count()} ===\n")
+    
+    with temp_db_path() as db_path:
+        database = Database(db_path)
+        seed(database, SIZE)
+        ranges = month_ranges(QUERIES)
+        
+        begin = time.perf_counter()
+        for start, end in ranges:
+            database.get_task_counts_by_date(start, end)
+        sequential = time.perf_counter() - begin
+        report("Database, последовательно", sequential, QUERIES)
+        
+        for readers in READERS:
+            async def run():
+                async with AioRepository(database, readers=readers) as repository:
+                    await read_concurrently(repository, ranges[:readers])  # Прогрев соединений
+                    return await timed(read_concurrently(repository, ranges))
+            
+            elapsed = asyncio.run(run())
+            report(f"AioRepository, читателей: {readers}", elapsed, QUERIES)
+            print(f"  Ускорение: x{sequential / elapsed:.2f}")
+        
+        print(f"\nЧтение и запись ({WRITE_BATCHES} пакетов по {WRITE_BATCH_SIZE} задач, 4 читателя):")
+        
+        async def run_mixed():
+            async with AioRepository(database, readers=4) as repository:
+                write_only = await timed(write_batches(repository, START - timedelta(days=1)))
+                read_only = await timed(read_concurrently(repository, ranges))
+                both = await timed(asyncio.gather(
+                    write_batches(repository, START - timedelta(days=2)),
+                    read_concurrently(repository, ranges)
+                ))
+                return write_only, read_only, both
+        
+        write_only, read_only, both = asyncio.run(run_mixed())
+        report("Только запись (один писатель)", write_only)
+        report("Только чтение", read_only)
+        report("Запись и чтение одновременно", both)
+        print(f"  Перекрытие: x{(write_only + read_only) / both:.2f} "
+              f"(читатели WAL не ждут писателя)")
+        
+        database.close()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
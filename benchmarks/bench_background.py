@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк отрисовки фона главного окна на 4K (3840x2160)
+Сравнивает сглаженное масштабирование на каждой перерисовке с кэшированным фоном
+"""
+
+import os
+import sys
+
+from bench_utils import measure, report
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt, QRect, QPoint
+from PySide6.QtGui import QPainter, QImage, QRegion
+from PySide6.QtWidgets import QApplication
+
+from ui.main_window import BackgroundWidget
+
+WIDTH, HEIGHT = 3840, 2160
+PAINTS = 50
+
+# Перерисовка строки задачи при наведении (небольшая грязная область)
+ROW_RECT = QRect(400, 300, 1200, 48)
+
+
+class LegacyBackgroundWidget(BackgroundWidget):
+    """Прежняя схема: масштабирование и прозрачность при каждой перерисовке"""
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        scaled_pixmap = self.background_pixmap.scaled(
+            self.size(),
+            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+            Qt.TransformationMode.SmoothTransformation
+        )
+        x = (self.width() - scaled_pixmap.width()) // 2
+        y = (self.height() - scaled_pixmap.height()) // 2
+        painter.setOpacity(0.1)
+        painter.drawPixmap(x, y, scaled_pixmap)
+
+
+def make_widget(widget_class) -> BackgroundWidget:
+    """Виджет размера 4K"""
+    widget = widget_class()
+    widget.resize(WIDTH, HEIGHT)
+    return widget
+
+
+def paint(widget: BackgroundWidget, target: QImage, region: QRegion = QRegion()):
+    """Отрисовать виджет (или его область) в изображение, как при перерисовке окна"""
+    widget.render(target, QPoint(), region)
+
+
+def main():
+    """Главная функция бенчмарка"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    
+    legacy = make_widget(LegacyBackgroundWidget)
+    current = make_widget(BackgroundWidget)
+    target = QImage(WIDTH, HEIGHT, QImage.Format.Format_ARGB32_Premultiplied)
+    paint(current, target)  # Первая отрисовка строит кэш
+    
+    if legacy.background_pixmap is None:
+        print("Фоновое изображение не найдено")
+        return 1
+    
+    print(f"=== Отрисовка фона {WIDTH}x{HEIGHT}: {PAINTS} перерисовок ===\n")
+    
+    for title, region in (("Полная перерисовка", QRegion()),
+                          ("Перерисовка строки (наведение)", QRegion(ROW_RECT))):
+        print(f"{title}:")
+        legacy_time = measure(lambda: [paint(legacy, target, region) for _ in range(PAINTS)])
+        current_time = measure(lambda: [paint(current, target, region) for _ in range(PAINTS)])
+        report("Масштабирование на каждой перерисовке", legacy_time, PAINTS)
+        report("Кэшированный фон", current_time, PAINTS)
+        print(f"  Ускорение: x{legacy_time / current_time:.1f}\n")
+    
+    print("Построение кэша (после изменения размера):")
+    report("Быстрое масштабирование", measure(lambda: current._render_background(smooth=False)))
+    report("Сглаженное масштабирование", measure(lambda: current._render_background(smooth=True)))
+    
+    app.processEvents()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк пакетной записи: 10k вставок задач в режиме WAL
+Сравнивает create_task в цикле, цикл внутри transaction() и create_tasks
+"""
+
+import sys
+
+from bench_utils import temp_db_path, measure, report
+
+from core.database import Database
+from core.models import Task
+
+ROWS = 10_000
+
+
+def make_tasks() -> list[Task]:
+    """Подготовить ROWS новых задач"""
+    return [Task(title=f"Импорт {i}", notes="Пакетная вставка") for i in range(ROWS)]
+
+
+def main():
+    """Главная функция бенчмарка"""
+    print(f"=== Вставка {ROWS} задач (WAL) ===\n")
+    
+    with temp_db_path() as db_path:
+        database = Database(db_path)
+        
+        def single_commits():
+            for task in make_tasks():
+                database.create_task(task)
+        
+        def single_in_transaction():
+            with database.transaction():
+                for task in make_tasks():
+                    database.create_task(task)
+        
+        def batch():
+            database.create_tasks(make_tasks())
+        
+        for name, func in (
+            ("create_task (COMMIT на строку)", single_commits),
+            ("create_task внутри transaction()", single_in_transaction),
+            ("create_tasks (executemany)", batch),
+        ):
+            seconds = measure(func, repeat=1)
+            report(name, seconds, ROWS)
+            print(f"  {'':<40} {ROWS / seconds:10.0f} строк/с")
+        
+        database.close()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк: соединение на каждый вызов против пула соединений
+Сравнивает 10k вызовов Database.get_task_by_id
+"""
+
+import sys
+
+from bench_utils import temp_db_path, measure, report
+
+from core.database import Database
+from core.models import Task
+
+CALLS = 10_000
+
+
+def run_lookups(database: Database, task_ids: list[int]):
+    """Выполнить CALLS поисков задач по ID"""
+    for i in range(CALLS):
+        database.get_task_by_id(task_ids[i % len(task_ids)])
+
+
+def main():
+    """Главная функция бенчмарка"""
+    print(f"=== get_task_by_id x {CALLS} ===\n")
+    
+    with temp_db_path() as db_path:
+        seed = Database(db_path)
+        task_ids = [seed.create_task(Task(title=f"Задача {i}")) for i in range(100)]
+        seed.close()
+        
+        results = {}
+        for name, pooled in (("Соединение на вызов", False), ("Пул соединений", True)):
+            database = Database(db_path, pooled=pooled)
+            results[name] = measure(lambda: run_lookups(database, task_ids))
+            database.close()
+            report(name, results[name], CALLS)
+        
+        speedup = results["Соединение на вызов"] / results["Пул соединений"]
+        print(f"\nУскорение пула: x{speedup:.1f}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк переключения дней: загрузка дня из SQLite против LRU-кэша DayCache
+Моделирует переходы «вчера/завтра» по неделе с 200 задачами и экземплярами в день
+"""
+
+import sys
+from datetime import datetime, date, timedelta
+
+from bench_utils import temp_db_path, measure, report
+
+from core.database import Database
+from core.day_cache import DayCache, load_day
+from core.models import Task, TaskList
+
+TASKS_PER_DAY = 200
+OCCURRENCES_PER_DAY = 20
+DAYS = 7
+SWITCHES = 1_000
+
+
+def seed(database: Database, start: date):
+    """Заполнить DAYS дней задачами и экземплярами повторяющихся задач"""
+    recurring_ids = database.create_tasks([
+        Task(title=f"Повторяющаяся {i}") for i in range(OCCURRENCES_PER_DAY)
+    ])
+    
+    for day in range(DAYS):
+        list_date = start + timedelta(days=day)
+        list_id = database.create_task_list(TaskList(date=list_date))
+        due_start = datetime.combine(list_date, datetime.min.time())
+        database.create_tasks([
+            Task(list_id=list_id, title=f"Задача {day}-{i}", due_at=due_start + timedelta(minutes=i))
+            for i in range(TASKS_PER_DAY)
+        ])
+        for task_id in recurring_ids:
+            database.save_occurrences(task_id, [due_start + timedelta(hours=9)])
+
+
+def main():
+    """Главная функция бенчмарка"""
+    start = date(2031, 1, 1)
+    # Маршрут: туда и обратно по неделе, как при нажатиях «завтра»/«вчера»
+    route = [start + timedelta(days=abs((i % (2 * DAYS - 2)) - (DAYS - 1))) for i in range(SWITCHES)]
+    
+    print(f"=== Переключение дней: {SWITCHES} переходов, {TASKS_PER_DAY} задач + "
+          f"{OCCURRENCES_PER_DAY} экземпляров в день ===\n")
+    
+    with temp_db_path() as db_path:
+        database = Database(db_path)
+        seed(database, start)
+        cache = DayCache()
+        
+        def from_database():
+            for day in route:
+                load_day(database, day)
+        
+        def from_cache():
+            for day in route:
+                entry = cache.get(day)
+                if entry is None:
+                    generation = cache.generation()
+                    cache.put(day, *load_day(database, day), generation)
+        
+        uncached = measure(from_database, repeat=1)
+        cached = measure(from_cache, repeat=1)
+        report("Загрузка дня из SQLite", uncached, SWITCHES)
+        report("DayCache (промахи только на первом проходе)", cached, SWITCHES)
+        print(f"  Ускорение: x{uncached / cached:.1f}")
+        
+        database.close()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк Localization.get_text: 1M обращений к переводам
+Сравнивает обход вложенных словарей по частям ключа с плоской таблицей,
+а также загрузку файлов переводов из JSON и из дискового кэша
+"""
+
+import os
+import sys
+import json
+import random
+import tempfile
+
+from bench_utils import measure, report
+
+# Дисковый кэш пишется во временный домашний каталог, а не в данные пользователя
+os.environ["HOME"] = tempfile.mkdtemp(prefix="todo-timed-bench-")
+os.environ["APPDATA"] = os.environ["HOME"]
+
+from core.localization import Localization, flatten_translations
+from core.resource_manager import ResourceManager
+
+LOOKUPS = 1_000_000
+
+
+class LegacyLocalization:
+    """Прежняя схема: разбиение ключа и обход вложенных словарей при каждом вызове"""
+    
+    def __init__(self, translations: dict, fallback_translations: dict):
+        self.translations = translations
+        self.fallback_translations = fallback_translations
+    
+    def get_text(self, key: str) -> str:
+        try:
+            keys = key.split('.')
+            
+            result = self._get_nested_value(self.translations, keys)
+            if result is not None:
+                return str(result)
+            
+            result = self._get_nested_value(self.fallback_translations, keys)
+            if result is not None:
+                return str(result)
+            
+            return key
+        
+        except Exception:
+            return key
+    
+    def _get_nested_value(self, data: dict, keys: list[str]):
+        try:
+            current = data
+            for key in keys:
+                if isinstance(current, dict) and key in current:
+                    current = current[key]
+                else:
+                    return None
+            return current
+        except Exception:
+            return None
+
+
+def load_json(language: str) -> dict:
+    """Прочитать файл перевода напрямую"""
+    with open(ResourceManager.get_resource_path(f"locales/{language}.json"), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    """Главная функция бенчмарка"""
+    translations = load_json("ru")
+    fallback_translations = load_json("en")
+    keys = list(flatten_translations(fallback_translations))
+    rnd = random.Random(1)
+    lookups = [rnd.choice(keys) for _ in range(LOOKUPS)]
+    
+    legacy = LegacyLocalization(translations, fallback_translations)
+    current = Localization("ru")
+    
+    assert all(legacy.get_text(key) == current.get_text(key) for key in keys)
+    
+    print(f"=== Localization.get_text: {LOOKUPS} обращений по {len(keys)} ключам ===\n")
+    
+    legacy_time = measure(lambda: [legacy.get_text(key) for key in lookups])
+    current_time = measure(lambda: [current.get_text(key) for key in lookups])
+    report("Вложенные словари (прежняя схема)", legacy_time, LOOKUPS)
+    report("Плоская таблица", current_time, LOOKUPS)
+    print(f"  Ускорение: x{legacy_time / current_time:.1f}\n")
+    
+    print("Загрузка переводов (ru + en fallback, 100 раз):")
+    
+    def load(disk_cache: bool):
+        for _ in range(100):
+            Localization._language_cache.clear()
+            Localization("ru", disk_cache=disk_cache)
+    
+    load(disk_cache=True)  # Заполняем дисковый кэш
+    report("JSON + развертывание", measure(lambda: load(disk_cache=False)), 100)
+    report("Дисковый кэш (pickle)", measure(lambda: load(disk_cache=True)), 100)
+    report("Кэш процесса", measure(lambda: [Localization("ru") for _ in range(100)]), 100)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк проверки просроченных задач: Database.get_overdue_tasks на 500k задач
+Сравнивает полное сканирование таблицы с диапазоном по частичному индексу от водяного знака
+"""
+
+import sys
+import random
+from datetime import datetime, date, timedelta
+
+from bench_utils import temp_db_path, measure, report
+
+from core.database import Database, TASK_COLUMNS
+from core.models import Task, TaskList, TaskStatus
+
+SIZE = 500_000
+LISTS = 1000
+CHECK_INTERVAL = timedelta(minutes=30)
+
+
+def seed(database: Database, size: int, now: datetime):
+    """Заполнить базу size задачами на год вокруг now, половина выполнена"""
+    rnd = random.Random(42)
+    start = date(2031, 1, 1)
+    per_list = size // LISTS
+    span = 365 * 24 * 3600
+    
+    for day in range(LISTS):
+        list_id = database.create_task_list(TaskList(date=start + timedelta(days=day)))
+        database.create_tasks([
+            Task(
+                list_id=list_id,
+                title=f"Задача {day}-{i}",
+                due_at=now + timedelta(seconds=rnd.randrange(-span // 2, span // 2)),
+                status=TaskStatus.COMPLETED if rnd.random() < 0.5 else TaskStatus.PENDING
+            )
+            for i in range(per_list)
+        ])
+
+
+def full_scan(database: Database, since: datetime, now: datetime) -> list:
+    """Прежний подход: фильтр по всей таблице без подходящего индекса"""
+    with database.get_connection() as conn:
+        return conn.execute(f"""
+            SELECT {TASK_COLUMNS} FROM tasks NOT INDEXED
+            WHERE status = 'pending' AND due_at > ? AND due_at <= ?
+            ORDER BY due_at
+        """, (since.isoformat(), now.isoformat())).fetchall()
+
+
+def main():
+    """Главная функция бенчмарка"""
+    now = datetime.now()
+    since = now - CHECK_INTERVAL
+    
+    print(f"=== get_overdue_tasks, {SIZE} задач, интервал проверки {CHECK_INTERVAL} ===\n")
+    
+    with temp_db_path() as db_path:
+        database = Database(db_path)
+        seed(database, SIZE, now)
+        
+        hits = len(database.get_overdue_tasks(now, since=since))
+        print(f"Просрочено за интервал: {hits}\n")
+        
+        scan = measure(lambda: full_scan(database, since, now), repeat=5)
+        indexed = measure(lambda: database.get_overdue_tasks(now, since=since), repeat=5)
+        report("Полное сканирование таблицы", scan)
+        report("Частичный индекс + водяной знак", indexed)
+        print(f"  Ускорение: x{scan / indexed:.1f}")
+        
+        database.close()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
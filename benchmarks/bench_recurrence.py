@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк разворачивания повторений: core.recurrence против dateutil.rrule
+Сначала сверяет результаты с dateutil на случайных правилах, затем
+разворачивает 10k правил на окне в 1 год
+"""
+
+import sys
+import random
+from datetime import datetime, time, timedelta
+
+from bench_utils import measure, report
+
+from core import recurrence
+from core.models import RecurrenceRule, RecurrenceFrequency
+
+RULES = 10_000
+CHECKED_RULES = 2_000
+WINDOW_START = datetime(2030, 1, 1)
+WINDOW_END = datetime(2030, 12, 31, 23, 59, 59)
+
+
+def dateutil_expand(rule: RecurrenceRule, dtstart: datetime,
+                    window_start: datetime, window_end: datetime) -> list[datetime]:
+    """Эталонное разворачивание через dateutil (как в редакторе задач раньше)"""
+    from dateutil.rrule import rrule, DAILY, WEEKLY, MONTHLY, YEARLY
+    from dateutil.rrule import MO, TU, WE, TH, FR, SA, SU
+    
+    freq_map = {
+        RecurrenceFrequency.DAILY: DAILY,
+        RecurrenceFrequency.WEEKLY: WEEKLY,
+        RecurrenceFrequency.MONTHLY: MONTHLY,
+        RecurrenceFrequency.YEARLY: YEARLY
+    }
+    rrule_kwargs = {'freq': freq_map[rule.frequency], 'interval': rule.interval, 'dtstart': dtstart}
+    if rule.days_of_week:
+        weekdays = [MO, TU, WE, TH, FR, SA, SU]
+        rrule_kwargs['byweekday'] = [weekdays[day] for day in rule.days_of_week]
+    if rule.until_date:
+        rrule_kwargs['until'] = datetime.combine(rule.until_date, time(23, 59, 59))
+    elif rule.count:
+        rrule_kwargs['count'] = rule.count
+    return rrule(**rrule_kwargs).between(window_start, window_end, inc=True)
+
+
+def random_rules(count: int, seed: int) -> list[tuple[RecurrenceRule, datetime]]:
+    """Случайные правила с dtstart в районе окна"""
+    rnd = random.Random(seed)
+    rules = []
+    for _ in range(count):
+        dtstart = datetime(2029, 6, 1, rnd.randint(0, 23), rnd.choice((0, 30))) + timedelta(days=rnd.randint(0, 500))
+        days_of_week = sorted(rnd.sample(range(7), rnd.randint(1, 3))) if rnd.random() < 0.5 else None
+        until_date = None
+        count_limit = None
+        kind = rnd.random()
+        if kind < 0.3:
+            until_date = (dtstart + timedelta(days=rnd.randint(0, 700))).date()
+        elif kind < 0.6:
+            count_limit = rnd.randint(1, 60)
+        rule = RecurrenceRule(
+            frequency=rnd.choice(list(RecurrenceFrequency)),
+            interval=rnd.randint(1, 4),
+            days_of_week=days_of_week,
+            until_date=until_date,
+            count=count_limit
+        )
+        rules.append((rule, dtstart))
+    return rules
+
+
+def verify() -> int:
+    """Сверить core.recurrence с dateutil, вернуть число расхождений"""
+    mismatches = 0
+    for rule, dtstart in random_rules(CHECKED_RULES, seed=1):
+        expected = dateutil_expand(rule, dtstart, WINDOW_START, WINDOW_END)
+        actual = recurrence.expand_rule(rule, dtstart, WINDOW_START, WINDOW_END)
+        if expected != actual:
+            mismatches += 1
+            print(f"  Расхождение: {rule.to_rrule_string()} dtstart={dtstart}")
+    return mismatches
+
+
+def main():
+    """Главная функция бенчмарка"""
+    backend = "NumPy" if recurrence.HAS_NUMPY else "чистый Python"
+    print(f"=== Разворачивание повторений ({backend}) ===\n")
+    
+    mismatches = verify()
+    print(f"Сверка с dateutil на {CHECKED_RULES} правилах: расхождений {mismatches}\n")
+    if mismatches:
+        return 1
+    
+    rules = random_rules(RULES, seed=2)
+    print(f"{RULES} правил, окно {WINDOW_START.date()} - {WINDOW_END.date()}:")
+    
+    def run(expand):
+        for rule, dtstart in rules:
+            expand(rule, dtstart, WINDOW_START, WINDOW_END)
+    
+    reference = measure(lambda: run(dateutil_expand), repeat=1)
+    dates_only = measure(lambda: run(recurrence.expand_dates))
+    with_datetimes = measure(lambda: run(recurrence.expand_rule))
+    
+    report("dateutil.rrule.between", reference, RULES)
+    report("recurrence.expand_dates (дни)", dates_only, RULES)
+    report("recurrence.expand_rule (datetime)", with_datetimes, RULES)
+    print(f"\nУскорение: x{reference / dates_only:.1f} (дни), x{reference / with_datetimes:.1f} (datetime)")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк планировщика напоминаний на 100k задач
+Сравнивает кучу с одним таймером с прежним подходом «QTimer на задачу»
+"""
+
+import os
+import sys
+import random
+from datetime import datetime, timedelta
+
+from bench_utils import measure, report
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+from core.notifications import ReminderScheduler
+
+SIZE = 100_000
+
+# Прежняя схема квадратична (Qt держит таймеры в упорядоченном списке),
+# поэтому она замеряется на меньшем объеме и сравнивается по времени на операцию
+LEGACY_SIZE = 10_000
+
+
+class SilentNotifications:
+    """Заглушка менеджера уведомлений: напоминания в бенчмарке не срабатывают"""
+    
+    def show_task_reminder(self, task_title: str, due_time: datetime, task_id: int):
+        pass
+
+
+class LegacyScheduler:
+    """Прежняя схема: отдельный QTimer и лямбда-обработчик на каждую задачу"""
+    
+    def __init__(self):
+        self.active_reminders = {}
+    
+    def schedule_reminder(self, task_id: int, task_title: str, reminder_time: datetime):
+        self.cancel_reminder(task_id)
+        delay_ms = int((reminder_time - datetime.now()).total_seconds() * 1000)
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self.active_reminders.pop(task_id, None))
+        timer.start(delay_ms)
+        self.active_reminders[task_id] = timer
+    
+    def cancel_reminder(self, task_id: int):
+        timer = self.active_reminders.pop(task_id, None)
+        if timer is not None:
+            timer.stop()
+    
+    def cancel_all_reminders(self):
+        for timer in self.active_reminders.values():
+            timer.stop()
+        self.active_reminders.clear()
+
+
+def make_reminders(size: int, seed: int) -> list[tuple]:
+    """Напоминания на ближайшие 20 дней в случайном порядке (прежняя схема не принимает
+    задержки больше ~24.8 суток: интервал QTimer ограничен int32 миллисекунд)"""
+    rnd = random.Random(seed)
+    start = datetime.now() + timedelta(hours=1)
+    return [
+        (task_id, f"Задача {task_id}", start + timedelta(seconds=rnd.randrange(20 * 24 * 3600)))
+        for task_id in range(size)
+    ]
+
+
+def run(scheduler, reminders: list[tuple], moved: list[tuple]) -> dict:
+    """Замерить планирование, перепланирование и отмену"""
+    def schedule():
+        scheduler.cancel_all_reminders()
+        for reminder in reminders:
+            scheduler.schedule_reminder(*reminder)
+    
+    def reschedule():
+        for reminder in moved:
+            scheduler.schedule_reminder(*reminder)
+    
+    def cancel():
+        for task_id, _, _ in reminders:
+            scheduler.cancel_reminder(task_id)
+    
+    return {
+        "schedule": measure(schedule, repeat=1),
+        "reschedule": measure(reschedule, repeat=1),
+        "cancel": measure(cancel, repeat=1),
+    }
+
+
+def main():
+    """Главная функция бенчмарка"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    
+    reminders = make_reminders(SIZE, seed=1)
+    moved = make_reminders(SIZE, seed=2)
+    
+    print(f"=== Планировщик напоминаний: куча на {SIZE}, QTimer на задачу на {LEGACY_SIZE} ===\n")
+    
+    legacy = run(LegacyScheduler(), reminders[:LEGACY_SIZE], moved[:LEGACY_SIZE])
+    heap_scheduler = ReminderScheduler(SilentNotifications())
+    current = run(heap_scheduler, reminders, moved)
+    
+    for operation, title in (("schedule", "Планирование"),
+                             ("reschedule", "Перепланирование"),
+                             ("cancel", "Отмена")):
+        print(f"{title}:")
+        report(f"QTimer на задачу ({LEGACY_SIZE})", legacy[operation], LEGACY_SIZE)
+        report(f"Куча + один таймер ({SIZE})", current[operation], SIZE)
+        legacy_per_op = legacy[operation] / LEGACY_SIZE
+        current_per_op = current[operation] / SIZE
+        print(f"  Ускорение на операцию: x{legacy_per_op / current_per_op:.1f}\n")
+    
+    heap_scheduler.cancel_all_reminders()
+    bulk = measure(lambda: heap_scheduler.schedule_reminders(reminders), repeat=1)
+    report("Пакетное планирование (heapify)", bulk, SIZE)
+    print(f"  Активных напоминаний: {heap_scheduler.get_active_reminders_count()}, "
+          f"таймеров: 1, ближайшее: {heap_scheduler.get_next_reminder_time():%Y-%m-%d %H:%M:%S}")
+    
+    app.processEvents()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
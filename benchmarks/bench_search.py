@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк полнотекстового поиска: Database.search_tasks на 200k задач
+Сравнивает индекс FTS5 с подстрочным поиском LIKE по всей таблице
+"""
+
+import sys
+import random
+from datetime import datetime, date, timedelta
+
+from bench_utils import temp_db_path, measure, report
+
+from core.database import Database
+from core.models import Task, TaskList
+
+SIZE = 200_000
+LISTS = 365
+LIMIT = 50
+BUDGET_MS = 20.0
+
+WORDS = (
+    "купить позвонить написать отправить проверить подготовить встреча отчет "
+    "молоко хлеб врач стоматолог банк налог квартира ремонт машина шиномонтаж "
+    "презентация клиент договор счет оплата проект релиз тестирование ревью "
+    "спортзал бассейн пробежка книга фильм подарок день рождения отпуск билеты "
+    "гостиница виза паспорт страховка собрание планерка созвон письмо"
+).split()
+
+QUERIES = (
+    "шиномонтаж",          # Редкое слово
+    "купить",              # Частое слово
+    "по",                  # Короткий префикс: максимум совпадений
+    "проект релиз",        # Несколько слов
+    "позвонить стомат",    # Слово и префикс
+)
+
+
+def seed(database: Database, size: int):
+    """Заполнить базу size задачами, распределенными по LISTS дням"""
+    rnd = random.Random(42)
+    start = date(2030, 1, 1)
+    per_list = size // LISTS
+    
+    for day in range(LISTS):
+        list_date = start + timedelta(days=day)
+        list_id = database.create_task_list(TaskList(date=list_date))
+        due_start = datetime.combine(list_date, datetime.min.time())
+        database.create_tasks([
+            Task(
+                list_id=list_id,
+                title=" ".join(rnd.sample(WORDS, rnd.randint(2, 5))).capitalize(),
+                notes=" ".join(rnd.sample(WORDS, rnd.randint(0, 8))),
+                due_at=due_start + timedelta(minutes=i)
+            )
+            for i in range(per_list)
+        ])
+
+
+def like_search(database: Database, query: str) -> list:
+    """Прежний подход в масштабе базы: подстрока в названии или заметках"""
+    pattern = f"%{query}%"
+    with database.get_connection() as conn:
+        return conn.execute(
+            "SELECT id FROM tasks WHERE title LIKE ? OR notes LIKE ? LIMIT ?",
+            (pattern, pattern, LIMIT)
+        ).fetchall()
+
+
+def main():
+    """Главная функция бенчмарка"""
+    print(f"=== search_tasks, {SIZE} задач, LIMIT {LIMIT} ===\n")
+    
+    with temp_db_path() as db_path:
+        database = Database(db_path)
+        seed(database, SIZE)
+        
+        slowest = 0.0
+        for query in QUERIES:
+            hits = len(database.search_tasks(query, limit=LIMIT))
+            print(f"'{query}' ({hits} результатов):")
+            
+            like = measure(lambda: like_search(database, query), repeat=5)
+            fts = measure(lambda: database.search_tasks(query, limit=LIMIT), repeat=5)
+            slowest = max(slowest, fts)
+            report("LIKE по всей таблице (без ранжирования)", like)
+            report("FTS5 + bm25", fts)
+            
+            # Следующая страница выдачи
+            report("FTS5 + bm25, вторая страница",
+                   measure(lambda: database.search_tasks(query, limit=LIMIT, offset=LIMIT), repeat=5))
+            print()
+        
+        verdict = "OK" if slowest * 1000 < BUDGET_MS else "ПРЕВЫШЕН"
+        print(f"Самый медленный запрос: {slowest * 1000:.1f} мс (бюджет {BUDGET_MS:.0f} мс): {verdict}")
+        
+        database.close()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк загрузки задач: Database.get_tasks_by_list_id на 100/1k/10k строк
+Сравнивает декодирование по индексу с прежним декодированием через sqlite3.Row
+"""
+
+import sys
+import sqlite3
+from datetime import datetime, date, timedelta
+
+from bench_utils import temp_db_path, measure, report
+
+from core.database import Database
+from core.models import Task, TaskList, TaskStatus, RecurrenceRule, RecurrenceFrequency
+
+SIZES = (100, 1_000, 10_000)
+
+
+def legacy_load(db_path, list_id: int) -> list[Task]:
+    """Прежний путь: sqlite3.Row, разбор RRULE и Enum на каждую строку"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(
+            "SELECT * FROM tasks WHERE list_id = ? ORDER BY due_at, created_at",
+            (list_id,)
+        ).fetchall()
+        tasks = []
+        for row in rows:
+            recurrence_rule = None
+            if row['recurrence_rule']:
+                recurrence_rule = RecurrenceRule.from_rrule_string(row['recurrence_rule'])
+            tasks.append(Task(
+                id=row['id'],
+                list_id=row['list_id'],
+                title=row['title'],
+                notes=row['notes'] or "",
+                due_at=datetime.fromisoformat(row['due_at']) if row['due_at'] else None,
+                status=TaskStatus(row['status']),
+                recurrence_rule=recurrence_rule,
+                recurrence_start=datetime.fromisoformat(row['recurrence_start']) if row['recurrence_start'] else None,
+                timezone=row['timezone'],
+                created_at=datetime.fromisoformat(row['created_at']),
+                updated_at=datetime.fromisoformat(row['updated_at'])
+            ))
+        return tasks
+    finally:
+        conn.close()
+
+
+def seed_list(database: Database, list_date: date, size: int) -> int:
+    """Создать список задач размера size (каждая четвертая - повторяющаяся)"""
+    list_id = database.create_task_list(TaskList(date=list_date))
+    weekly = RecurrenceRule(RecurrenceFrequency.WEEKLY, days_of_week=[0, 2, 4])
+    start = datetime.combine(list_date, datetime.min.time())
+    for i in range(size):
+        due_at = start + timedelta(minutes=i)
+        database.create_task(Task(
+            list_id=list_id,
+            title=f"Задача {i}",
+            notes="Заметка" if i % 2 else "",
+            due_at=due_at,
+            recurrence_rule=weekly if i % 4 == 0 else None,
+            recurrence_start=due_at if i % 4 == 0 else None
+        ))
+    return list_id
+
+
+def main():
+    """Главная функция бенчмарка"""
+    print("=== get_tasks_by_list_id ===\n")
+    
+    with temp_db_path() as db_path:
+        database = Database(db_path)
+        
+        for offset, size in enumerate(SIZES):
+            list_id = seed_list(database, date(2030, 1, 1) + timedelta(days=offset), size)
+            print(f"{size} строк:")
+            
+            legacy = measure(lambda: legacy_load(db_path, list_id))
+            current = measure(lambda: database.get_tasks_by_list_id(list_id))
+            report("sqlite3.Row + разбор на строку", legacy, size)
+            report("Кортежи + кэш RRULE", current, size)
+            print(f"  Ускорение: x{legacy / current:.1f}\n")
+        
+        database.close()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
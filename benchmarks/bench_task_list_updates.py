@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк обновлений TaskListWidget на 5k задач
+Сравнивает полную перефильтрацию списка с точечными вставкой, обновлением и удалением
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+from bench_utils import measure, report
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from core.localization import Localization
+from core.models import Task
+from ui.widgets.task_list import TaskListWidget
+
+SIZE = 5_000
+OPERATIONS = 1_000
+
+
+def make_tasks(size: int) -> list[Task]:
+    """Создать size задач с временем выполнения"""
+    start = datetime.combine(datetime.now().date(), datetime.min.time())
+    return [
+        Task(id=i + 1, title=f"Задача {i}", due_at=start + timedelta(seconds=i))
+        for i in range(size)
+    ]
+
+
+def flip(task: Task):
+    """Переключить статус выполнения задачи"""
+    if task.is_completed:
+        task.mark_pending()
+    else:
+        task.mark_completed()
+
+
+def wait_for_filter(app: QApplication, widget: TaskListWidget):
+    """Дождаться фонового прохода фильтрации (5k задач фильтруются в потоке)"""
+    widget._filter_pool.waitForDone()
+    app.processEvents()
+
+
+def count_model_signals(widget: TaskListWidget) -> dict:
+    """Подсчитывать сигналы модели: сколько строк затрагивает каждая операция"""
+    counters = {"reset": 0, "changed": 0, "inserted": 0, "removed": 0}
+    
+    def on_reset():
+        counters["reset"] += 1
+    
+    def on_changed(top, bottom, *_):
+        counters["changed"] += bottom.row() - top.row() + 1
+    
+    def on_inserted(_, first, last):
+        counters["inserted"] += last - first + 1
+    
+    def on_removed(_, first, last):
+        counters["removed"] += last - first + 1
+    
+    model = widget.task_model
+    model.modelReset.connect(on_reset)
+    model.dataChanged.connect(on_changed)
+    model.rowsInserted.connect(on_inserted)
+    model.rowsRemoved.connect(on_removed)
+    return counters
+
+
+def main():
+    """Главная функция бенчмарка"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    
+    widget = TaskListWidget(Localization("ru"))
+    widget.resize(500, 700)
+    widget.show()
+    app.processEvents()
+    
+    tasks = make_tasks(SIZE)
+    widget.set_tasks(tasks)
+    wait_for_filter(app, widget)
+    counters = count_model_signals(widget)
+    
+    print(f"=== TaskListWidget, {SIZE} задач, {OPERATIONS} операций ===\n")
+    
+    def full_refilter():
+        for task in tasks[:OPERATIONS]:
+            flip(task)
+            widget.apply_filters()
+            wait_for_filter(app, widget)
+    
+    def toggle():
+        for task in tasks[:OPERATIONS]:
+            flip(task)
+            widget.update_task(task)
+            app.processEvents()
+    
+    def remove_and_add():
+        for task in tasks[:OPERATIONS]:
+            widget.remove_task(task)
+            widget.add_task(task)
+        app.processEvents()
+    
+    full = measure(full_refilter, repeat=1)
+    report("Переключение + полная перефильтрация", full, OPERATIONS)
+    
+    counters.update(dict.fromkeys(counters, 0))
+    incremental = measure(toggle, repeat=1)
+    report("Переключение через update_task", incremental, OPERATIONS)
+    print(f"  Ускорение: x{full / incremental:.1f}")
+    print(f"  Сигналы модели: сбросов {counters['reset']}, перерисовано строк {counters['changed']}\n")
+    
+    counters.update(dict.fromkeys(counters, 0))
+    report("remove_task + add_task", measure(remove_and_add, repeat=1), OPERATIONS * 2)
+    print(f"  Сигналы модели: сбросов {counters['reset']}, вставлено {counters['inserted']}, "
+          f"удалено {counters['removed']}")
+    
+    widget.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Общие утилиты для бенчмарков Todo-Timed
+"""
+
+import sys
+import time
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+# Добавляем корень проекта в путь для импорта модулей
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@contextmanager
+def temp_db_path():
+    """Путь к временному файлу базы данных (удаляется после использования)"""
+    with tempfile.TemporaryDirectory(prefix="todo-timed-bench-") as tmp_dir:
+        yield Path(tmp_dir) / "bench.db"
+
+
+def measure(func: Callable[[], object], repeat: int = 3) -> float:
+    """Лучшее время выполнения func за repeat запусков (в секундах)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, seconds: float, operations: int = 1):
+    """Вывести результат измерения"""
+    per_op_us = seconds / operations * 1_000_000
+    print(f"  {name:<44} {seconds * 1000:10.1f} мс  {per_op_us:10.2f} мкс/оп")
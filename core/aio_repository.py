@@ -0,0 +1,172 @@
+"""
+Репозиторий для asyncio: методы Database как корутины
+Для фоновых и пакетных задач без GUI (генерация и синхронизация задач)
+"""
+
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from datetime import datetime, date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .database import Database
+from .models import Task, TaskList, TaskOccurrence, ExpansionState, ChangeRecord
+
+logger = logging.getLogger(__name__)
+
+
+class AioRepository:
+    """
+    Асинхронный репозиторий поверх Database
+    
+    Записи выполняются в одном потоке-писателе (SQLite допускает одного
+    писателя, очередь потоков не спорит за блокировку), чтения - в пуле
+    потоков-читателей. У каждого потока свое соединение из пула Database,
+    поэтому в режиме WAL читатели не ждут ни друг друга, ни писателя.
+    
+    Методы повторяют одноименные методы Database.
+    
+    Пример:
+        async with AioRepository(Database(path)) as repository:
+            task_list = await repository.get_task_list_by_date(date.today())
+    """
+    
+    def __init__(self, database: Database, readers: Optional[int] = None):
+        """
+        Args:
+            database: База данных (с пулом соединений на поток)
+            readers: Количество потоков-читателей (по умолчанию по числу ядер, до 8)
+        """
+        self.database = database
+        self.readers = readers or min(8, os.cpu_count() or 1)
+        
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="todo-timed-writer")
+        self._reader_pool = ThreadPoolExecutor(max_workers=self.readers,
+                                               thread_name_prefix="todo-timed-reader")
+    
+    async def __aenter__(self) -> "AioRepository":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+    
+    async def _read(self, func: Callable, *args, **kwargs) -> Any:
+        """Выполнить чтение в пуле читателей"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._reader_pool, partial(func, *args, **kwargs))
+    
+    async def _write(self, func: Callable, *args, **kwargs) -> Any:
+        """Выполнить запись в потоке-писателе"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, partial(func, *args, **kwargs))
+    
+    async def run_in_transaction(self, func: Callable[[Database], Any]) -> Any:
+        """
+        Выполнить func(database) в потоке-писателе внутри одной транзакции
+        
+        Все вызовы Database внутри func фиксируются одним COMMIT.
+        """
+        def run():
+            with self.database.transaction():
+                return func(self.database)
+        
+        return await self._write(run)
+    
+    async def close(self):
+        """Дождаться начатых операций и остановить потоки (база данных не закрывается)"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._writer.shutdown)
+        await loop.run_in_executor(None, self._reader_pool.shutdown)
+    
+    # Списки задач
+    
+    async def get_task_list_by_date(self, target_date: date) -> Optional[TaskList]:
+        return await self._read(self.database.get_task_list_by_date, target_date)
+    
+    async def create_task_list(self, task_list: TaskList) -> int:
+        return await self._write(self.database.create_task_list, task_list)
+    
+    async def update_task_list(self, task_list: TaskList):
+        await self._write(self.database.update_task_list, task_list)
+    
+    async def delete_empty_task_lists(self) -> int:
+        return await self._write(self.database.delete_empty_task_lists)
+    
+    # Задачи
+    
+    async def get_tasks_by_list_id(self, list_id: int) -> List[Task]:
+        return await self._read(self.database.get_tasks_by_list_id, list_id)
+    
+    async def get_task_by_id(self, task_id: int) -> Optional[Task]:
+        return await self._read(self.database.get_task_by_id, task_id)
+    
+    async def create_task(self, task: Task) -> int:
+        return await self._write(self.database.create_task, task)
+    
+    async def update_task(self, task: Task):
+        await self._write(self.database.update_task, task)
+    
+    async def delete_task(self, task_id: int):
+        await self._write(self.database.delete_task, task_id)
+    
+    async def create_tasks(self, tasks: List[Task]) -> List[int]:
+        return await self._write(self.database.create_tasks, tasks)
+    
+    async def update_tasks(self, tasks: List[Task]):
+        await self._write(self.database.update_tasks, tasks)
+    
+    async def delete_tasks(self, task_ids: List[int]):
+        await self._write(self.database.delete_tasks, task_ids)
+    
+    # Поиск и выборки
+    
+    async def search_tasks(self, query: str, limit: int = 50, offset: int = 0) -> List[Task]:
+        return await self._read(self.database.search_tasks, query, limit, offset)
+    
+    async def get_overdue_tasks(self, now: datetime,
+                                since: Optional[datetime] = None) -> List[Union[Task, TaskOccurrence]]:
+        return await self._read(self.database.get_overdue_tasks, now, since)
+    
+    async def get_task_counts_by_date(self, start_date: date, end_date: date) -> Dict[date, int]:
+        return await self._read(self.database.get_task_counts_by_date, start_date, end_date)
+    
+    # Экземпляры повторяющихся задач
+    
+    async def get_occurrences_by_date(self, target_date: date) -> List[TaskOccurrence]:
+        return await self._read(self.database.get_occurrences_by_date, target_date)
+    
+    async def update_occurrence(self, occurrence: TaskOccurrence):
+        await self._write(self.database.update_occurrence, occurrence)
+    
+    async def add_recurrence_exception(self, task_id: int, exception_date: date):
+        await self._write(self.database.add_recurrence_exception, task_id, exception_date)
+    
+    async def get_recurrence_exception_dates(self, task_ids: Iterable[int]) -> Dict[int, set[date]]:
+        return await self._read(self.database.get_recurrence_exception_dates, list(task_ids))
+    
+    async def get_expansion_candidates(self, until_date: date, task_id: Optional[int] = None
+                                       ) -> List[Tuple[Task, Optional[ExpansionState]]]:
+        return await self._read(self.database.get_expansion_candidates, until_date, task_id)
+    
+    async def save_occurrences(self, task_id: int, scheduled: List[datetime],
+                               replace_from: Optional[datetime] = None):
+        await self._write(self.database.save_occurrences, task_id, scheduled, replace_from)
+    
+    async def set_expansion_state(self, state: ExpansionState):
+        await self._write(self.database.set_expansion_state, state)
+    
+    async def purge_non_recurring_expansions(self) -> int:
+        return await self._write(self.database.purge_non_recurring_expansions)
+    
+    # Журнал изменений
+    
+    async def get_last_change_seq(self) -> int:
+        return await self._read(self.database.get_last_change_seq)
+    
+    async def get_changes_since(self, seq: int, limit: int = 1000) -> List[ChangeRecord]:
+        return await self._read(self.database.get_changes_since, seq, limit)
+    
+    async def prune_change_log(self, keep: Optional[int] = None) -> int:
+        return await self._write(self.database.prune_change_log, keep)
@@ -0,0 +1,135 @@
+"""
+Асинхронный фасад базы данных: отдельный поток с очередью запросов
+Результаты доставляются в поток GUI через сигналы Qt
+"""
+
+import logging
+import itertools
+import queue
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QThread, QCoreApplication, Signal
+
+from .database import Database
+
+logger = logging.getLogger(__name__)
+
+# Приоритеты очереди: запросы пользователя обслуживаются раньше фоновых
+PRIORITY_NORMAL = 0
+PRIORITY_BACKGROUND = 1
+
+
+class _RepositoryThread(QThread):
+    """Поток базы данных: выполняет запросы из очереди по одному"""
+    
+    # Сигналы
+    request_finished = Signal(int, object, object)  # id запроса, результат, исключение
+    
+    def __init__(self, requests: queue.PriorityQueue, parent=None):
+        super().__init__(parent)
+        self.requests = requests
+    
+    def run(self):
+        while True:
+            _, request_id, func, args, kwargs = self.requests.get()
+            if func is None:
+                break
+            
+            try:
+                result, error = func(*args, **kwargs), None
+            except Exception as e:
+                logger.error(f"Ошибка запроса к базе данных в фоновом потоке: {e}")
+                result, error = None, e
+            
+            self.request_finished.emit(request_id, result, error)
+
+
+class AsyncRepository(QObject):
+    """
+    Асинхронный репозиторий поверх Database
+    
+    Все запросы выполняются в одном потоке (в нем живет его соединение из пула
+    Database), поэтому записи применяются в порядке отправки. Фоновые запросы
+    (только чтение) уступают очередь запросам пользователя.
+    """
+    
+    def __init__(self, database: Database, parent=None):
+        super().__init__(parent)
+        self.database = database
+        
+        self._requests: queue.PriorityQueue = queue.PriorityQueue()
+        self._ids = itertools.count(1)
+        self._callbacks: Dict[int, Tuple[Optional[Callable], Optional[Callable]]] = {}
+        self._pending: set[int] = set()
+        
+        self._thread = _RepositoryThread(self._requests)
+        self._thread.request_finished.connect(self._on_request_finished)
+        self._thread.start()
+        
+        # Поток должен завершиться до уничтожения объектов Qt при выходе
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+    
+    def submit(self, func: Callable, *args,
+               on_result: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               background: bool = False, **kwargs) -> int:
+        """
+        Поставить вызов func(*args, **kwargs) в очередь потока базы данных
+        
+        Args:
+            func: Функция, выполняемая в потоке базы данных
+            on_result: Обработчик результата (вызывается в потоке GUI)
+            on_error: Обработчик исключения (вызывается в потоке GUI)
+            background: Фоновый запрос: выполняется после запросов пользователя
+        
+        Returns:
+            Идентификатор запроса
+        """
+        request_id = next(self._ids)
+        self._pending.add(request_id)
+        if on_result is not None or on_error is not None:
+            self._callbacks[request_id] = (on_result, on_error)
+        
+        priority = PRIORITY_BACKGROUND if background else PRIORITY_NORMAL
+        self._requests.put((priority, request_id, func, args, kwargs))
+        return request_id
+    
+    def call(self, method_name: str, *args, **kwargs) -> int:
+        """Поставить в очередь метод Database по имени (параметры как у submit)"""
+        return self.submit(getattr(self.database, method_name), *args, **kwargs)
+    
+    @property
+    def pending_count(self) -> int:
+        """Количество запросов, результат которых еще не доставлен"""
+        return len(self._pending)
+    
+    def _on_request_finished(self, request_id: int, result: Any, error: Optional[Exception]):
+        """Доставить результат запроса обработчикам в потоке GUI"""
+        self._pending.discard(request_id)
+        on_result, on_error = self._callbacks.pop(request_id, (None, None))
+        
+        try:
+            if error is None:
+                if on_result is not None:
+                    on_result(result)
+            elif on_error is not None:
+                on_error(error)
+        
+        except Exception as e:
+            logger.error(f"Ошибка обработки результата запроса к базе данных: {e}")
+    
+    def stop(self):
+        """
+        Остановить поток после уже отправленных запросов пользователя
+        
+        Фоновые запросы, не успевшие начаться, отбрасываются.
+        """
+        if not self._thread.isRunning():
+            return
+        
+        self._requests.put((PRIORITY_NORMAL, next(self._ids), None, (), {}))
+        self._thread.wait()
+        self._callbacks.clear()
+        self._pending.clear()
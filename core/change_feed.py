@@ -0,0 +1,259 @@
+"""
+Лента изменений базы данных для нескольких процессов
+Новые записи change_log доставляются сигналом Qt: проверка запускается
+изменением WAL-файла и, на случай пропущенных уведомлений, по таймеру.
+Записи самого процесса пропускаются, старые записи журнала периодически удаляются
+"""
+
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, QFileSystemWatcher, Signal
+
+from .database import Database
+from .models import ChangeRecord
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeFeed(QObject):
+    """
+    Лента изменений поверх журнала change_log
+    
+    Журнал заполняется триггерами в транзакции самой записи, поэтому лента
+    видит изменения любого процесса, работающего с тем же файлом (второй
+    экземпляр приложения, пакетная задача). Проверка - один запрос к
+    sqlite_sequence; записи журнала читаются, только если номер вырос.
+    Номера, записанные транзакциями того же объекта Database, не читаются:
+    свои изменения процесс уже применил.
+    """
+    
+    # Сигналы
+    changes_available = Signal(list)  # List[ChangeRecord] в порядке seq
+    changes_lost = Signal()  # Изменений слишком много или журнал очищен: нужна полная перезагрузка
+    
+    # Резервный опрос (уведомления файловой системы доставляются не везде)
+    POLL_INTERVAL_MS = 2000
+    
+    # Серия записей в WAL дает одну проверку
+    DEBOUNCE_MS = 50
+    
+    # Больше изменений за раз дешевле обработать полной перезагрузкой
+    MAX_DELTA = 5000
+    
+    # Период очистки старых записей журнала
+    PRUNE_INTERVAL_MS = 10 * 60 * 1000
+    
+    def __init__(self, database: Database, parent=None, repository=None):
+        """
+        Args:
+            database: База данных
+            parent: Родительский объект Qt
+            repository: AsyncRepository для чтения и очистки журнала в потоке
+                базы данных (None - запросы выполняются в потоке ленты)
+        """
+        super().__init__(parent)
+        self.database = database
+        self.repository = repository
+        
+        # С repository начальный номер читается в start(): до ответа проверок нет
+        self.last_seq: Optional[int] = None if repository is not None else database.get_last_change_seq()
+        self._poll_pending = False
+        self._poll_again = False
+        
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule_poll)
+        self._watcher.directoryChanged.connect(self._schedule_poll)
+        
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self.poll)
+        
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self.poll)
+        
+        self._prune_timer = QTimer(self)
+        self._prune_timer.setInterval(self.PRUNE_INTERVAL_MS)
+        self._prune_timer.timeout.connect(self.prune)
+    
+    @property
+    def _wal_path(self) -> Path:
+        return self.database.db_path.with_name(self.database.db_path.name + "-wal")
+    
+    def start(self):
+        """Начать отслеживание изменений"""
+        # Каталог отслеживается, чтобы заметить появление WAL-файла
+        directory = str(self.database.db_path.parent)
+        if directory not in self._watcher.directories():
+            self._watcher.addPath(directory)
+        self._watch_wal()
+        self._poll_timer.start()
+        self._prune_timer.start()
+        
+        if self.last_seq is None:
+            self.repository.submit(
+                self.database.get_last_change_seq,
+                on_result=self._on_start_seq_read,
+                on_error=lambda e: logger.error(f"Ошибка получения номера изменения: {e}")
+            )
+    
+    def _on_start_seq_read(self, last_seq: int):
+        """Начальный номер журнала: изменения до него уже учтены загруженными данными"""
+        if self.last_seq is None:
+            self.last_seq = last_seq
+            self.database.forget_own_changes(last_seq)
+    
+    def stop(self):
+        """Остановить отслеживание изменений"""
+        self._poll_timer.stop()
+        self._debounce_timer.stop()
+        self._prune_timer.stop()
+        
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+    
+    def _watch_wal(self):
+        """Отслеживать WAL-файл (после checkpoint он может быть пересоздан)"""
+        wal_path = str(self._wal_path)
+        if wal_path not in self._watcher.files() and self._wal_path.exists():
+            self._watcher.addPath(wal_path)
+    
+    def _schedule_poll(self, _path: str = ""):
+        """Отложить проверку до конца серии уведомлений"""
+        self._debounce_timer.start()
+    
+    def poll(self) -> int:
+        """
+        Проверить журнал и сообщить о новых изменениях
+        
+        С repository журнал читается в потоке базы данных, изменения доставляются
+        сигналом после чтения. Пока проверка идет, новые запросы объединяются в одну.
+        
+        Returns:
+            Количество доставленных изменений (0, если чтение выполняется асинхронно)
+        """
+        self._watch_wal()
+        
+        if self.repository is None:
+            return self._on_changes_read(self._read_changes(self.last_seq))
+        
+        if self.last_seq is None or self._poll_pending:
+            self._poll_again = self.last_seq is not None
+            return 0
+        
+        self._poll_pending = True
+        self.repository.submit(
+            self._read_changes, self.last_seq,
+            on_result=self._on_changes_read,
+            on_error=self._on_read_failed,
+            background=True
+        )
+        return 0
+    
+    def _read_changes(self, since_seq: int) -> Tuple[int, List[ChangeRecord], bool]:
+        """
+        Прочитать изменения после since_seq (вызывается в потоке базы данных)
+        
+        Returns:
+            (номер, до которого журнал пройден, изменения других процессов,
+            True - изменений слишком много или журнал очищен: нужна полная перезагрузка)
+        """
+        changes: List[ChangeRecord] = []
+        position = since_seq
+        try:
+            last_seq = self.database.get_last_change_seq()
+            if last_seq <= since_seq:
+                return since_seq, changes, False
+            
+            gaps = self._foreign_ranges(since_seq, last_seq)
+            if sum(end - start for start, end in gaps) > self.MAX_DELTA:
+                return last_seq, [], True
+            
+            for start, end in gaps:
+                # Собственные изменения перед промежутком пропускаются без чтения
+                position = start
+                while position < end:
+                    batch = self.database.get_changes_since(
+                        position, limit=min(1000, end - position))
+                    # Номера идут подряд: пропуск означает, что журнал очищен
+                    if not batch or batch[0].seq != position + 1:
+                        return last_seq, [], True
+                    
+                    changes.extend(batch)
+                    position = batch[-1].seq
+            position = last_seq
+        
+        except Exception as e:
+            # Уже прочитанные изменения доставляются: номер position их учитывает
+            logger.error(f"Ошибка чтения журнала изменений: {e}")
+        
+        return position, changes, False
+    
+    def _on_changes_read(self, result: Tuple[int, List[ChangeRecord], bool]) -> int:
+        """Доставить прочитанные изменения (в потоке ленты)"""
+        self._poll_pending = False
+        last_seq, changes, lost = result
+        
+        if lost:
+            self._lose_changes(last_seq)
+        else:
+            self.last_seq = max(self.last_seq, last_seq)
+            self.database.forget_own_changes(self.last_seq)
+            if changes:
+                logger.debug(f"Изменений в базе данных: {len(changes)}, последнее: {self.last_seq}")
+                self.changes_available.emit(changes)
+        
+        if self._poll_again:
+            self._poll_again = False
+            self.poll()
+        return len(changes)
+    
+    def _on_read_failed(self, error: Exception):
+        """Ошибка запроса к журналу: следующая проверка повторит чтение"""
+        self._poll_pending = False
+        logger.error(f"Ошибка чтения журнала изменений: {error}")
+    
+    def _foreign_ranges(self, since_seq: int, last_seq: int) -> List[Tuple[int, int]]:
+        """Диапазоны номеров (начало, конец] в (since_seq, last_seq], записанные не этим процессом"""
+        gaps = []
+        position = since_seq
+        for start, end in self.database.get_own_changes(last_seq):
+            if end <= position:
+                continue
+            if start > position:
+                gaps.append((position, start))
+            position = end
+        if position < last_seq:
+            gaps.append((position, last_seq))
+        return gaps
+    
+    def prune(self):
+        """Удалить старые записи журнала (в потоке базы данных, если задан repository)"""
+        if self.repository is not None:
+            self.repository.submit(
+                self.database.prune_change_log,
+                on_result=self._on_pruned,
+                on_error=lambda e: logger.error(f"Ошибка очистки журнала изменений: {e}"),
+                background=True
+            )
+            return
+        
+        try:
+            self._on_pruned(self.database.prune_change_log())
+        except Exception as e:
+            logger.error(f"Ошибка очистки журнала изменений: {e}")
+    
+    def _on_pruned(self, pruned: int):
+        if pruned:
+            logger.debug(f"Удалено записей журнала изменений: {pruned}")
+    
+    def _lose_changes(self, last_seq: int):
+        """Пропустить изменения до last_seq и запросить полную перезагрузку"""
+        logger.info(f"Изменения {self.last_seq + 1}..{last_seq} пропущены, нужна полная перезагрузка")
+        self.last_seq = last_seq
+        self.database.forget_own_changes(last_seq)
+        self.changes_lost.emit()
@@ -3,18 +3,103 @@
 Включает миграции, репозитории и валидацию схемы
 """
 
+import re
 import sqlite3
 import logging
+import threading
+from collections import deque
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Union
-from datetime import datetime, date
+from typing import List, Optional, Dict, Any, Union, Tuple, Iterable
+from datetime import datetime, date, timedelta
 from contextlib import contextmanager
 
 from .resource_manager import ResourceManager
-from .models import Task, TaskList, TaskOccurrence, RecurrenceException, TaskStatus
+from .models import (
+    Task, TaskList, TaskOccurrence, RecurrenceException, TaskStatus, ExpansionState,
+    ChangeRecord, parse_recurrence_rule
+)
 
 logger = logging.getLogger(__name__)
 
+# Версия схемы - номер последней миграции в migrations/ (увеличивается вместе
+# с добавлением миграции). Хранится в PRAGMA user_version: при совпадении
+# миграции и валидация схемы при запуске пропускаются
+SCHEMA_VERSION = 8
+
+# Явные списки колонок: строки декодируются по индексу, а не по имени
+TASK_LIST_COLUMNS = "id, date, title, created_at, updated_at"
+TASK_COLUMNS = (
+    "id, list_id, title, notes, due_at, status, recurrence_rule, "
+    "recurrence_start, timezone, created_at, updated_at"
+)
+# Колонки задачи с префиксом таблицы для запросов с JOIN
+TASK_COLUMNS_T = ", ".join(f"t.{column.strip()}" for column in TASK_COLUMNS.split(","))
+OCCURRENCE_COLUMNS = (
+    "o.id, o.task_id, o.scheduled_at, o.status, o.completed_at, "
+    "o.override_title, o.override_due_at, o.created_at, o.updated_at"
+)
+# Начало повторения задачи t в формате isoformat (как occurrences.get_recurrence_start)
+RECURRENCE_START_SQL = (
+    "COALESCE(t.recurrence_start, t.due_at, substr(t.created_at, 1, 10) || 'T00:00:00')"
+)
+
+INSERT_TASK_SQL = """
+    INSERT INTO tasks (
+        list_id, title, notes, due_at, status,
+        recurrence_rule, recurrence_start, timezone,
+        created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+UPDATE_TASK_SQL = """
+    UPDATE tasks SET
+        title = ?, notes = ?, due_at = ?, status = ?,
+        recurrence_rule = ?, recurrence_start = ?, timezone = ?,
+        updated_at = ?
+    WHERE id = ?
+"""
+
+# Быстрый поиск статуса без вызова Enum.__call__
+_STATUS_BY_VALUE = {status.value: status for status in TaskStatus}
+
+# Слова поискового запроса (пунктуация и операторы FTS5 отбрасываются)
+_SEARCH_TOKEN_RE = re.compile(r"\w+")
+
+
+def build_search_query(text: str) -> Optional[str]:
+    """
+    Преобразовать пользовательский ввод в запрос FTS5
+    
+    Каждое слово ищется по префиксу, все слова должны присутствовать.
+    
+    Returns:
+        Строка запроса MATCH или None, если в тексте нет слов
+    """
+    tokens = _SEARCH_TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def split_sql_script(script: str) -> List[str]:
+    """
+    Разбить SQL-скрипт на отдельные операторы
+    
+    Оператор заканчивается строкой, на которой sqlite3.complete_statement
+    считает его завершенным, поэтому тела триггеров не разрываются.
+    """
+    statements = []
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+    
+    if buffer.strip():
+        # Незавершенный оператор: ошибку сообщит SQLite при выполнении
+        statements.append(buffer.strip())
+    return statements
+
 
 class DatabaseError(Exception):
     """Исключение для ошибок базы данных"""
@@ -24,65 +109,143 @@ class DatabaseError(Exception):
 class Database:
     """Класс для работы с базой данных"""
     
-    def __init__(self, db_path: Optional[Path] = None):
+    # Pragma, которые действуют только в рамках соединения
+    CONNECTION_PRAGMAS = (
+        "PRAGMA foreign_keys = ON",
+    )
+    
+    # Сколько самых новых совпадений ранжируется по bm25 (стоимость bm25
+    # линейна по числу совпадений: ранжирование всех 80k совпадений короткого
+    # префикса на 200k задач занимает ~225 мс, окно держит поиск в пределах ~15 мс)
+    SEARCH_RANK_WINDOW = 1000
+    
+    # Сколько последних записей журнала изменений сохраняется при очистке
+    CHANGE_LOG_KEEP = 10000
+    
+    # Сколько последних диапазонов собственных изменений помнит объект
+    OWN_CHANGES_LIMIT = 1024
+    
+    def __init__(self, db_path: Optional[Path] = None, pooled: bool = True):
+        """
+        Args:
+            db_path: Путь к файлу базы данных
+            pooled: Держать долгоживущее соединение на каждый поток
+                (False - открывать новое соединение на каждый вызов)
+        """
         if db_path is None:
             db_path = ResourceManager.get_app_data_dir() / "todo_timed.db"
         
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Инициализация базы данных
+        # Пул соединений: одно соединение на поток
+        self.pooled = pooled
+        self._local = threading.local()
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._pool_lock = threading.Lock()
+        self._closed = False
+        
+        # Счетчик зафиксированных записей: кэши сверяют с ним свои данные
+        self.write_version = 0
+        
+        # Номера журнала изменений (начало, конец], записанные транзакциями этого
+        # объекта: лента изменений не сообщает процессу о его собственных записях
+        self._own_changes: deque = deque(maxlen=self.OWN_CHANGES_LIMIT)
+        self._own_changes_lock = threading.Lock()
+        
+        # Инициализация базы данных (полная - только при смене версии схемы)
+        self._ensure_schema()
+    
+    def _ensure_schema(self):
+        """
+        Привести схему базы данных к версии приложения
+        
+        Обычный запуск - одно чтение PRAGMA user_version. Миграции и валидация
+        выполняются, только если версия схемы отличается от SCHEMA_VERSION.
+        """
+        try:
+            with self.get_connection() as conn:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+        
+        except Exception as e:
+            logger.error(f"Ошибка чтения версии схемы: {e}")
+            raise DatabaseError(f"Не удалось прочитать версию схемы: {e}")
+        
+        if version == SCHEMA_VERSION:
+            logger.info(f"База данных открыта: {self.db_path} (версия схемы {version})")
+            return
+        
+        if version > SCHEMA_VERSION:
+            # База данных обновлена более новой версией приложения
+            logger.warning(f"Версия схемы {version} новее версии приложения {SCHEMA_VERSION}")
+            self._validate_schema()
+            return
+        
+        logger.info(f"Обновление схемы базы данных: {version} -> {SCHEMA_VERSION}")
         self._init_database()
         self._apply_migrations()
-        self._validate_schema()
     
     def _init_database(self):
         """Инициализация базы данных"""
         try:
             with self.get_connection() as conn:
-                # Включаем поддержку внешних ключей
-                conn.execute("PRAGMA foreign_keys = ON")
+                # Внешние ключи включаются для каждого соединения в _create_connection,
+                # а режим WAL сохраняется в самом файле базы данных
                 # Настраиваем журналирование WAL для лучшей производительности
                 conn.execute("PRAGMA journal_mode = WAL")
                 conn.commit()
             
             logger.info(f"База данных инициализирована: {self.db_path}")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка инициализации базы данных: {e}")
             raise DatabaseError(f"Не удалось инициализировать базу данных: {e}")
     
     def _apply_migrations(self):
-        """Применение миграций"""
+        """
+        Применение миграций
+        
+        Недостающие миграции, валидация схемы и запись новой версии схемы
+        выполняются одной транзакцией: при ошибке база данных остается
+        в прежнем состоянии, и миграции повторятся при следующем запуске.
+        """
         try:
             migrations_dir = ResourceManager.get_resource_path("migrations")
             if not migrations_dir or not migrations_dir.exists():
                 logger.warning("Директория миграций не найдена")
+                self._validate_schema()
                 return
             
-            # Создаем таблицу для отслеживания миграций
-            with self.get_connection() as conn:
+            migration_files = sorted(migrations_dir.glob("*.sql"))
+            if migration_files and int(migration_files[-1].stem.split("_", 1)[0]) != SCHEMA_VERSION:
+                logger.warning(f"Последняя миграция {migration_files[-1].stem} не соответствует "
+                               f"версии схемы {SCHEMA_VERSION}")
+            
+            with self.transaction() as conn:
+                # Создаем таблицу для отслеживания миграций
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS schema_migrations (
                         version TEXT PRIMARY KEY,
                         applied_at TEXT NOT NULL
                     )
                 """)
-                conn.commit()
-            
-            # Получаем список примененных миграций
-            applied_migrations = self._get_applied_migrations()
-            
-            # Применяем новые миграции
-            migration_files = sorted(migrations_dir.glob("*.sql"))
-            for migration_file in migration_files:
-                version = migration_file.stem
                 
-                if version not in applied_migrations:
-                    self._apply_migration(migration_file, version)
+                # Список читается под блокировкой записи: другой процесс
+                # мог применить миграции, пока эта транзакция ждала
+                applied_migrations = self._get_applied_migrations()
+                
+                # Применяем новые миграции
+                for migration_file in migration_files:
+                    version = migration_file.stem
+                    
+                    if version not in applied_migrations:
+                        self._apply_migration(conn, migration_file, version)
+                
+                self._validate_schema()
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             
             logger.info("Миграции успешно применены")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка применения миграций: {e}")
             raise DatabaseError(f"Не удалось применить миграции: {e}")
@@ -97,24 +260,24 @@ class Database:
             # Таблица миграций еще не создана
             return set()
     
-    def _apply_migration(self, migration_file: Path, version: str):
-        """Применить одну миграцию"""
+    def _apply_migration(self, conn: sqlite3.Connection, migration_file: Path, version: str):
+        """Применить одну миграцию в открытой транзакции"""
         try:
             migration_sql = migration_file.read_text(encoding='utf-8')
             
-            with self.get_connection() as conn:
-                # Выполняем миграцию
-                conn.executescript(migration_sql)
-                
-                # Записываем информацию о применении
-                conn.execute(
-                    "INSERT INTO schema_migrations (version, applied_at) VALUES (?, ?)",
-                    (version, datetime.now().isoformat())
-                )
-                conn.commit()
+            # Выполняем миграцию по операторам: executescript зафиксировал бы
+            # открытую транзакцию
+            for statement in split_sql_script(migration_sql):
+                conn.execute(statement)
             
-            logger.info(f"Применена миграция: {version}")
+            # Записываем информацию о применении
+            conn.execute(
+                "INSERT INTO schema_migrations (version, applied_at) VALUES (?, ?)",
+                (version, datetime.now().isoformat())
+            )
             
+            logger.info(f"Применена миграция: {version}")
+        
         except Exception as e:
             logger.error(f"Ошибка применения миграции {version}: {e}")
             raise DatabaseError(f"Не удалось применить миграцию {version}: {e}")
@@ -122,7 +285,10 @@ class Database:
     def _validate_schema(self):
         """Валидация схемы базы данных"""
         try:
-            required_tables = ['task_lists', 'tasks', 'task_occurrences', 'recurrence_exceptions']
+            required_tables = [
+                'task_lists', 'tasks', 'task_occurrences', 'recurrence_exceptions',
+                'occurrence_expansion', 'tasks_fts', 'change_log'
+            ]
             
             with self.get_connection() as conn:
                 cursor = conn.execute(
@@ -135,31 +301,168 @@ class Database:
                 raise DatabaseError(f"Отсутствуют таблицы: {missing_tables}")
             
             logger.debug("Валидация схемы базы данных прошла успешно")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка валидации схемы: {e}")
             raise DatabaseError(f"Схема базы данных некорректна: {e}")
     
+    def _create_connection(self) -> sqlite3.Connection:
+        """Открыть новое соединение и применить pragma"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30.0,
+            check_same_thread=False
+        )
+        # row_factory не задается: строки - обычные кортежи (доступ по индексу)
+        for pragma in self.CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _get_pooled_connection(self) -> sqlite3.Connection:
+        """Получить соединение текущего потока (создается один раз)"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            return conn
+        
+        if self._closed:
+            raise DatabaseError("База данных закрыта")
+        
+        conn = self._create_connection()
+        ident = threading.get_ident()
+        with self._pool_lock:
+            self._prune_dead_connections()
+            # Идентификатор завершившегося потока мог достаться новому потоку:
+            # соединение прежнего потока закрывается, а не теряется
+            stale = self._connections.pop(ident, None)
+            if stale is not None:
+                try:
+                    stale.close()
+                except sqlite3.Error as e:
+                    logger.warning(f"Ошибка закрытия соединения потока {ident}: {e}")
+            self._connections[ident] = conn
+        self._local.connection = conn
+        logger.debug(f"Открыто соединение для потока {ident}")
+        return conn
+    
+    def _prune_dead_connections(self):
+        """Закрыть соединения завершившихся потоков (вызывается под _pool_lock)"""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in [ident for ident in self._connections if ident not in alive]:
+            try:
+                self._connections.pop(ident).close()
+            except sqlite3.Error as e:
+                logger.warning(f"Ошибка закрытия соединения потока {ident}: {e}")
+    
     @contextmanager
     def get_connection(self):
         """Контекстный менеджер для работы с соединением"""
         conn = None
+        in_transaction = self._transaction_connection() is not None
         try:
-            conn = sqlite3.connect(
-                self.db_path,
-                timeout=30.0,
-                check_same_thread=False
-            )
-            conn.row_factory = sqlite3.Row  # Доступ к колонкам по имени
+            if in_transaction:
+                # Операция выполняется внутри открытой транзакции
+                conn = self._transaction_connection()
+            elif self.pooled:
+                conn = self._get_pooled_connection()
+            else:
+                conn = self._create_connection()
             yield conn
         except Exception as e:
-            if conn:
+            if conn and not in_transaction:
                 conn.rollback()
             logger.error(f"Ошибка работы с базой данных: {e}")
             raise DatabaseError(f"Ошибка базы данных: {e}")
         finally:
-            if conn:
+            if conn and not self.pooled and not in_transaction:
+                conn.close()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Контекстный менеджер транзакции для группировки нескольких записей
+        
+        Все методы Database, вызванные внутри блока в том же потоке,
+        выполняются в одной транзакции и фиксируются одним COMMIT.
+        Вложенные вызовы присоединяются к внешней транзакции.
+        
+        Yields:
+            Соединение, на котором открыта транзакция
+        """
+        conn = self._transaction_connection()
+        if conn is not None:
+            yield conn
+            return
+        
+        conn = self._get_pooled_connection() if self.pooled else self._create_connection()
+        self._local.transaction_connection = conn
+        try:
+            # Блокировка записи взята: номера журнала до COMMIT - только этой транзакции
+            conn.execute("BEGIN IMMEDIATE")
+            seq_before = self._read_change_seq(conn)
+            yield conn
+            seq_after = self._read_change_seq(conn)
+            conn.commit()
+            self.write_version += 1
+            if seq_after > seq_before:
+                with self._own_changes_lock:
+                    self._own_changes.append((seq_before, seq_after))
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Ошибка транзакции, изменения отменены: {e}")
+            if isinstance(e, DatabaseError):
+                raise
+            raise DatabaseError(f"Ошибка транзакции: {e}")
+        finally:
+            self._local.transaction_connection = None
+            if not self.pooled:
+                conn.close()
+    
+    def _transaction_connection(self) -> Optional[sqlite3.Connection]:
+        """Соединение открытой транзакции текущего потока (или None)"""
+        return getattr(self._local, 'transaction_connection', None)
+    
+    def _commit(self, conn: sqlite3.Connection):
+        """Зафиксировать изменения, если запись не идет внутри transaction()"""
+        if self._transaction_connection() is None:
+            conn.commit()
+            self.write_version += 1
+    
+    def get_change_token(self) -> Tuple[int, int]:
+        """
+        Признак изменения данных для проверки без запросов к таблицам
+        
+        Меняется при записи через этот объект (write_version) и при записи из
+        любого другого соединения - другого потока или процесса (PRAGMA
+        data_version соединения текущего потока). Без пула соединений
+        отслеживаются только записи через этот объект.
+        
+        Returns:
+            (write_version, data_version)
+        """
+        try:
+            with self.get_connection() as conn:
+                data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            return self.write_version, data_version
+        
+        except Exception as e:
+            logger.error(f"Ошибка получения версии данных: {e}")
+            raise DatabaseError(f"Не удалось получить версию данных: {e}")
+    
+    def close(self):
+        """Закрыть все соединения пула"""
+        with self._pool_lock:
+            self._closed = True
+            connections = list(self._connections.values())
+            self._connections.clear()
+        
+        for conn in connections:
+            try:
                 conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Ошибка закрытия соединения: {e}")
+        
+        self._local = threading.local()
+        logger.info("Соединения с базой данных закрыты")
     
     # Методы для работы с списками задач
     
@@ -168,21 +471,15 @@ class Database:
         try:
             with self.get_connection() as conn:
                 cursor = conn.execute(
-                    "SELECT * FROM task_lists WHERE date = ?",
+                    f"SELECT {TASK_LIST_COLUMNS} FROM task_lists WHERE date = ?",
                     (target_date.isoformat(),)
                 )
                 row = cursor.fetchone()
                 
                 if row:
-                    return TaskList(
-                        id=row['id'],
-                        date=date.fromisoformat(row['date']),
-                        title=row['title'],
-                        created_at=datetime.fromisoformat(row['created_at']),
-                        updated_at=datetime.fromisoformat(row['updated_at'])
-                    )
+                    return self._row_to_task_list(row)
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Ошибка получения списка задач: {e}")
             raise DatabaseError(f"Не удалось получить список задач: {e}")
@@ -200,9 +497,9 @@ class Database:
                     task_list.created_at.isoformat(),
                     task_list.updated_at.isoformat()
                 ))
-                conn.commit()
+                self._commit(conn)
                 return cursor.lastrowid
-                
+        
         except Exception as e:
             logger.error(f"Ошибка создания списка задач: {e}")
             raise DatabaseError(f"Не удалось создать список задач: {e}")
@@ -222,12 +519,32 @@ class Database:
                     task_list.updated_at.isoformat(),
                     task_list.id
                 ))
-                conn.commit()
-                
+                self._commit(conn)
+        
         except Exception as e:
             logger.error(f"Ошибка обновления списка задач: {e}")
             raise DatabaseError(f"Не удалось обновить список задач: {e}")
     
+    def delete_empty_task_lists(self) -> int:
+        """
+        Удалить списки задач без задач (остаются от просмотра дат в прежних версиях)
+        
+        Returns:
+            Количество удаленных списков
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.execute("""
+                    DELETE FROM task_lists
+                    WHERE NOT EXISTS (SELECT 1 FROM tasks WHERE tasks.list_id = task_lists.id)
+                """)
+                self._commit(conn)
+                return cursor.rowcount
+        
+        except Exception as e:
+            logger.error(f"Ошибка удаления пустых списков задач: {e}")
+            raise DatabaseError(f"Не удалось удалить пустые списки задач: {e}")
+    
     # Методы для работы с задачами
     
     def get_tasks_by_list_id(self, list_id: int) -> List[Task]:
@@ -235,17 +552,13 @@ class Database:
         try:
             with self.get_connection() as conn:
                 cursor = conn.execute(
-                    "SELECT * FROM tasks WHERE list_id = ? ORDER BY due_at, created_at",
+                    f"SELECT {TASK_COLUMNS} FROM tasks WHERE list_id = ? ORDER BY due_at, created_at",
                     (list_id,)
                 )
                 
-                tasks = []
-                for row in cursor.fetchall():
-                    task = self._row_to_task(row)
-                    tasks.append(task)
-                
-                return tasks
-                
+                row_to_task = self._row_to_task
+                return [row_to_task(row) for row in cursor.fetchall()]
+        
         except Exception as e:
             logger.error(f"Ошибка получения задач: {e}")
             raise DatabaseError(f"Не удалось получить задачи: {e}")
@@ -255,7 +568,7 @@ class Database:
         try:
             with self.get_connection() as conn:
                 cursor = conn.execute(
-                    "SELECT * FROM tasks WHERE id = ?",
+                    f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ?",
                     (task_id,)
                 )
                 row = cursor.fetchone()
@@ -263,36 +576,50 @@ class Database:
                 if row:
                     return self._row_to_task(row)
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Ошибка получения задачи: {e}")
             raise DatabaseError(f"Не удалось получить задачу: {e}")
     
+    def get_task_dates(self, task_id: int) -> Tuple[Optional[date], Optional[Tuple[date, date]]]:
+        """
+        Получить дни, на которых показывается задача
+        
+        Returns:
+            (дата списка задачи, (первый, последний) день ее экземпляров);
+            None - задачи или экземпляров нет
+        """
+        try:
+            with self.get_connection() as conn:
+                list_row = conn.execute("""
+                    SELECT l.date FROM tasks t
+                    JOIN task_lists l ON l.id = t.list_id
+                    WHERE t.id = ?
+                """, (task_id,)).fetchone()
+                first, last = conn.execute("""
+                    SELECT MIN(scheduled_at), MAX(scheduled_at)
+                    FROM task_occurrences WHERE task_id = ?
+                """, (task_id,)).fetchone()
+            
+            list_date = date.fromisoformat(list_row[0]) if list_row else None
+            occurrence_range = None
+            if first is not None:
+                occurrence_range = (datetime.fromisoformat(first).date(),
+                                    datetime.fromisoformat(last).date())
+            return list_date, occurrence_range
+        
+        except Exception as e:
+            logger.error(f"Ошибка получения дней задачи: {e}")
+            raise DatabaseError(f"Не удалось получить дни задачи: {e}")
+    
     def create_task(self, task: Task) -> int:
         """Создать новую задачу"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.execute("""
-                    INSERT INTO tasks (
-                        list_id, title, notes, due_at, status,
-                        recurrence_rule, recurrence_start, timezone,
-                        created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    task.list_id,
-                    task.title,
-                    task.notes,
-                    task.due_at.isoformat() if task.due_at else None,
-                    task.status.value,
-                    task.recurrence_rule.to_rrule_string() if task.recurrence_rule else None,
-                    task.recurrence_start.isoformat() if task.recurrence_start else None,
-                    task.timezone,
-                    task.created_at.isoformat(),
-                    task.updated_at.isoformat()
-                ))
-                conn.commit()
+                cursor = conn.execute(INSERT_TASK_SQL, self._task_insert_params(task))
+                self._commit(conn)
                 return cursor.lastrowid
-                
+        
         except Exception as e:
             logger.error(f"Ошибка создания задачи: {e}")
             raise DatabaseError(f"Не удалось создать задачу: {e}")
@@ -303,25 +630,9 @@ class Database:
             task.updated_at = datetime.now()
             
             with self.get_connection() as conn:
-                conn.execute("""
-                    UPDATE tasks SET
-                        title = ?, notes = ?, due_at = ?, status = ?,
-                        recurrence_rule = ?, recurrence_start = ?, timezone = ?,
-                        updated_at = ?
-                    WHERE id = ?
-                """, (
-                    task.title,
-                    task.notes,
-                    task.due_at.isoformat() if task.due_at else None,
-                    task.status.value,
-                    task.recurrence_rule.to_rrule_string() if task.recurrence_rule else None,
-                    task.recurrence_start.isoformat() if task.recurrence_start else None,
-                    task.timezone,
-                    task.updated_at.isoformat(),
-                    task.id
-                ))
-                conn.commit()
-                
+                conn.execute(UPDATE_TASK_SQL, self._task_update_params(task))
+                self._commit(conn)
+        
         except Exception as e:
             logger.error(f"Ошибка обновления задачи: {e}")
             raise DatabaseError(f"Не удалось обновить задачу: {e}")
@@ -331,30 +642,641 @@ class Database:
         try:
             with self.get_connection() as conn:
                 conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-                conn.commit()
-                
+                self._commit(conn)
+        
         except Exception as e:
             logger.error(f"Ошибка удаления задачи: {e}")
             raise DatabaseError(f"Не удалось удалить задачу: {e}")
     
-    def _row_to_task(self, row) -> Task:
-        """Преобразовать строку БД в объект Task"""
-        from .models import RecurrenceRule
+    # Пакетные операции: одна транзакция и один COMMIT на весь набор
+    
+    def create_tasks(self, tasks: List[Task]) -> List[int]:
+        """
+        Создать несколько задач в одной транзакции
         
-        recurrence_rule = None
-        if row['recurrence_rule']:
-            recurrence_rule = RecurrenceRule.from_rrule_string(row['recurrence_rule'])
+        Args:
+            tasks: Новые задачи (поле id заполняется присвоенными значениями)
+        
+        Returns:
+            Список ID в порядке следования задач
+        """
+        if not tasks:
+            return []
+        
+        try:
+            with self.transaction() as conn:
+                conn.executemany(INSERT_TASK_SQL, [self._task_insert_params(task) for task in tasks])
+                # Транзакция держит блокировку записи, поэтому AUTOINCREMENT
+                # выдал идущие подряд ID, последний из которых известен
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            
+            task_ids = list(range(last_id - len(tasks) + 1, last_id + 1))
+            for task, task_id in zip(tasks, task_ids):
+                task.id = task_id
+            return task_ids
+        
+        except Exception as e:
+            logger.error(f"Ошибка пакетного создания задач: {e}")
+            raise DatabaseError(f"Не удалось создать задачи: {e}")
+    
+    def update_tasks(self, tasks: List[Task]):
+        """Обновить несколько задач в одной транзакции"""
+        if not tasks:
+            return
+        
+        try:
+            now = datetime.now()
+            for task in tasks:
+                task.updated_at = now
+            
+            with self.transaction() as conn:
+                conn.executemany(UPDATE_TASK_SQL, [self._task_update_params(task) for task in tasks])
+        
+        except Exception as e:
+            logger.error(f"Ошибка пакетного обновления задач: {e}")
+            raise DatabaseError(f"Не удалось обновить задачи: {e}")
+    
+    def delete_tasks(self, task_ids: List[int]):
+        """Удалить несколько задач в одной транзакции"""
+        if not task_ids:
+            return
+        
+        try:
+            with self.transaction() as conn:
+                conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in task_ids])
+        
+        except Exception as e:
+            logger.error(f"Ошибка пакетного удаления задач: {e}")
+            raise DatabaseError(f"Не удалось удалить задачи: {e}")
+    
+    # Полнотекстовый поиск
+    
+    def search_tasks(self, query: str, limit: int = 50, offset: int = 0) -> List[Task]:
+        """
+        Найти задачи по названию и заметкам за все даты
+        
+        Args:
+            query: Текст запроса (слова ищутся по префиксу)
+            limit: Максимальное количество результатов
+            offset: Смещение для постраничной выдачи
+        
+        Returns:
+            Задачи в порядке релевантности (bm25, название важнее заметок)
+        
+        Если совпадений не больше SEARCH_RANK_WINDOW, ранжируются все совпадения
+        за все даты. Иначе ранжируются только SEARCH_RANK_WINDOW самых новых
+        задач, и выдача ограничена этим числом (страницы дальше пусты). Набор
+        кандидатов не зависит от offset, поэтому страницы не пересекаются и
+        не пропускают задачи.
+        """
+        match = build_search_query(query)
+        if match is None or offset >= self.SEARCH_RANK_WINDOW:
+            return []
+        
+        try:
+            with self.get_connection() as conn:
+                # Совпадения берутся по rowid без ранжирования, bm25 считается
+                # только для окна, затем читаются задачи одной страницы
+                # (rowid при равном ранге - устойчивый порядок между страницами)
+                cursor = conn.execute(
+                    f"""
+                    SELECT {TASK_COLUMNS_T}
+                    FROM (
+                        SELECT rowid, rank FROM (
+                            SELECT rowid, rank FROM tasks_fts
+                            WHERE tasks_fts MATCH ?
+                            ORDER BY rowid DESC
+                            LIMIT ?
+                        )
+                        ORDER BY rank, rowid DESC
+                        LIMIT ? OFFSET ?
+                    ) AS hits
+                    JOIN tasks t ON t.id = hits.rowid
+                    ORDER BY hits.rank, hits.rowid DESC
+                    """,
+                    (match, self.SEARCH_RANK_WINDOW, min(limit, self.SEARCH_RANK_WINDOW - offset), offset)
+                )
+                
+                row_to_task = self._row_to_task
+                return [row_to_task(row) for row in cursor.fetchall()]
+        
+        except Exception as e:
+            logger.error(f"Ошибка поиска задач: {e}")
+            raise DatabaseError(f"Не удалось выполнить поиск задач: {e}")
+    
+    # Просроченные задачи
+    
+    def get_overdue_tasks(self, now: datetime,
+                          since: Optional[datetime] = None) -> List[Union[Task, TaskOccurrence]]:
+        """
+        Получить невыполненные задачи и экземпляры, срок которых наступил в (since, now]
+        
+        Args:
+            now: Момент проверки
+            since: Момент предыдущей проверки; None - все просроченные
+        
+        Returns:
+            Задачи и экземпляры (с родительской задачей) в порядке срока выполнения
+        """
+        # Частичные индексы задаются явно: без статистики планировщик выбирает
+        # индекс по статусу и просматривает все невыполненные задачи
+        since_value = since.isoformat() if since else ""
+        now_value = now.isoformat()
+        
+        try:
+            with self.get_connection() as conn:
+                task_rows = conn.execute(f"""
+                    SELECT {TASK_COLUMNS}
+                    FROM tasks INDEXED BY idx_tasks_pending_due
+                    WHERE status = 'pending' AND due_at > ? AND due_at <= ?
+                      AND recurrence_rule IS NULL
+                    ORDER BY due_at
+                """, (since_value, now_value)).fetchall()
+                
+                occurrence_rows = conn.execute(f"""
+                    SELECT {OCCURRENCE_COLUMNS}, {TASK_COLUMNS_T}
+                    FROM task_occurrences o INDEXED BY idx_occurrences_pending_due
+                    JOIN tasks t ON t.id = o.task_id
+                    WHERE o.status = 'pending'
+                      AND COALESCE(o.override_due_at, o.scheduled_at) > ?
+                      AND COALESCE(o.override_due_at, o.scheduled_at) <= ?
+                    ORDER BY COALESCE(o.override_due_at, o.scheduled_at)
+                """, (since_value, now_value)).fetchall()
+            
+            row_to_task = self._row_to_task
+            overdue: List[Union[Task, TaskOccurrence]] = [row_to_task(row) for row in task_rows]
+            for row in occurrence_rows:
+                occurrence = self._row_to_occurrence(row[:9])
+                occurrence.parent_task = row_to_task(row[9:])
+                overdue.append(occurrence)
+            
+            if task_rows and occurrence_rows:
+                overdue.sort(key=lambda item: item.effective_due_at
+                             if isinstance(item, TaskOccurrence) else item.due_at)
+            return overdue
+        
+        except Exception as e:
+            logger.error(f"Ошибка получения просроченных задач: {e}")
+            raise DatabaseError(f"Не удалось получить просроченные задачи: {e}")
+    
+    # Календарь
+    
+    def get_task_counts_by_date(self, start_date: date, end_date: date) -> Dict[date, int]:
+        """
+        Получить количество задач по дням в диапазоне [start_date, end_date)
+        
+        Учитываются задачи списков и развернутые экземпляры повторяющихся задач.
+        
+        Returns:
+            Словарь {дата: количество}, дни без задач отсутствуют
+        """
+        try:
+            start_value = start_date.isoformat()
+            end_value = end_date.isoformat()
+            
+            with self.get_connection() as conn:
+                # Один GROUP BY по объединению: дата списка и дата экземпляра
+                # (первые 10 символов ISO-времени) через индексы по датам
+                cursor = conn.execute("""
+                    SELECT day, COUNT(*) FROM (
+                        SELECT l.date AS day
+                        FROM task_lists l
+                        JOIN tasks t ON t.list_id = l.id
+                        WHERE l.date >= ? AND l.date < ?
+                        UNION ALL
+                        SELECT substr(o.scheduled_at, 1, 10) AS day
+                        FROM task_occurrences o
+                        WHERE o.scheduled_at >= ? AND o.scheduled_at < ?
+                    )
+                    GROUP BY day
+                """, (start_value, end_value, start_value, end_value))
+                
+                return {date.fromisoformat(day): count for day, count in cursor.fetchall()}
+        
+        except Exception as e:
+            logger.error(f"Ошибка получения количества задач по дням: {e}")
+            raise DatabaseError(f"Не удалось получить количество задач по дням: {e}")
+    
+    # Методы для работы с экземплярами повторяющихся задач
+    
+    def get_occurrences_by_date(self, target_date: date) -> List[TaskOccurrence]:
+        """Получить экземпляры повторяющихся задач на дату (с родительской задачей)"""
+        try:
+            day_start = target_date.isoformat()
+            day_end = (target_date + timedelta(days=1)).isoformat()
+            
+            with self.get_connection() as conn:
+                cursor = conn.execute(f"""
+                    SELECT {OCCURRENCE_COLUMNS}, {TASK_COLUMNS_T}
+                    FROM task_occurrences o
+                    JOIN tasks t ON t.id = o.task_id
+                    WHERE o.scheduled_at >= ? AND o.scheduled_at < ?
+                    ORDER BY o.scheduled_at
+                """, (day_start, day_end))
+                
+                occurrences = []
+                for row in cursor.fetchall():
+                    occurrence = self._row_to_occurrence(row[:9])
+                    occurrence.parent_task = self._row_to_task(row[9:])
+                    occurrences.append(occurrence)
+                return occurrences
+        
+        except Exception as e:
+            logger.error(f"Ошибка получения экземпляров задач: {e}")
+            raise DatabaseError(f"Не удалось получить экземпляры задач: {e}")
+    
+    def get_occurrence_by_id(self, occurrence_id: int) -> Optional[TaskOccurrence]:
+        """Получить экземпляр повторяющейся задачи по ID (с родительской задачей)"""
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(f"""
+                    SELECT {OCCURRENCE_COLUMNS}, {TASK_COLUMNS_T}
+                    FROM task_occurrences o
+                    JOIN tasks t ON t.id = o.task_id
+                    WHERE o.id = ?
+                """, (occurrence_id,)).fetchone()
+            
+            if not row:
+                return None
+            occurrence = self._row_to_occurrence(row[:9])
+            occurrence.parent_task = self._row_to_task(row[9:])
+            return occurrence
+        
+        except Exception as e:
+            logger.error(f"Ошибка получения экземпляра задачи: {e}")
+            raise DatabaseError(f"Не удалось получить экземпляр задачи: {e}")
+    
+    def update_occurrence(self, occurrence: TaskOccurrence):
+        """Обновить экземпляр повторяющейся задачи"""
+        try:
+            occurrence.updated_at = datetime.now()
+            
+            with self.get_connection() as conn:
+                conn.execute("""
+                    UPDATE task_occurrences SET
+                        status = ?, completed_at = ?, override_title = ?,
+                        override_due_at = ?, updated_at = ?
+                    WHERE id = ?
+                """, (
+                    occurrence.status.value,
+                    occurrence.completed_at.isoformat() if occurrence.completed_at else None,
+                    occurrence.override_title,
+                    occurrence.override_due_at.isoformat() if occurrence.override_due_at else None,
+                    occurrence.updated_at.isoformat(),
+                    occurrence.id
+                ))
+                self._commit(conn)
+        
+        except Exception as e:
+            logger.error(f"Ошибка обновления экземпляра задачи: {e}")
+            raise DatabaseError(f"Не удалось обновить экземпляр задачи: {e}")
+    
+    def add_recurrence_exception(self, task_id: int, exception_date: date):
+        """Пропустить дату повторения: добавить исключение и удалить экземпляр"""
+        try:
+            exception = RecurrenceException(task_id=task_id, exception_date=exception_date)
+            
+            with self.transaction() as conn:
+                conn.execute("""
+                    INSERT OR IGNORE INTO recurrence_exceptions (task_id, exception_date, created_at)
+                    VALUES (?, ?, ?)
+                """, (
+                    exception.task_id,
+                    exception.exception_date.isoformat(),
+                    exception.created_at.isoformat()
+                ))
+                conn.execute("""
+                    DELETE FROM task_occurrences
+                    WHERE task_id = ? AND scheduled_at >= ? AND scheduled_at < ?
+                """, (
+                    task_id,
+                    exception_date.isoformat(),
+                    (exception_date + timedelta(days=1)).isoformat()
+                ))
+        
+        except Exception as e:
+            logger.error(f"Ошибка добавления исключения повторения: {e}")
+            raise DatabaseError(f"Не удалось добавить исключение повторения: {e}")
+    
+    def get_recurrence_exception_dates(self, task_ids: Iterable[int]) -> Dict[int, set[date]]:
+        """Получить даты исключений для набора задач"""
+        try:
+            wanted = set(task_ids)
+            result: Dict[int, set[date]] = {}
+            
+            with self.get_connection() as conn:
+                # Таблица исключений мала, фильтрация в Python дешевле IN (...)
+                cursor = conn.execute("SELECT task_id, exception_date FROM recurrence_exceptions")
+                for task_id, exception_date in cursor.fetchall():
+                    if task_id in wanted:
+                        result.setdefault(task_id, set()).add(date.fromisoformat(exception_date))
+            return result
+        
+        except Exception as e:
+            logger.error(f"Ошибка получения исключений повторения: {e}")
+            raise DatabaseError(f"Не удалось получить исключения повторения: {e}")
+    
+    def get_expansion_candidates(self, until_date: date,
+                                 task_id: Optional[int] = None) -> List[Tuple[Task, Optional[ExpansionState]]]:
+        """
+        Получить повторяющиеся задачи, которые нужно (до)развернуть
+        
+        Возвращаются задачи без состояния разворачивания, с измененным
+        правилом или началом повторения, а также развернутые не до until_date.
+        
+        Args:
+            until_date: Требуемый горизонт разворачивания
+            task_id: Ограничить выборку одной задачей
+        """
+        try:
+            query = f"""
+                SELECT {TASK_COLUMNS_T}, s.rule, s.source_start, s.expanded_until
+                FROM tasks t
+                LEFT JOIN occurrence_expansion s ON s.task_id = t.id
+                WHERE t.recurrence_rule IS NOT NULL
+                  AND (s.task_id IS NULL
+                       OR s.rule IS NOT t.recurrence_rule
+                       OR s.source_start IS NOT {RECURRENCE_START_SQL}
+                       OR s.expanded_until < ?)
+            """
+            params: list = [until_date.isoformat()]
+            if task_id is not None:
+                query += " AND t.id = ?"
+                params.append(task_id)
+            
+            with self.get_connection() as conn:
+                candidates = []
+                for row in conn.execute(query, params).fetchall():
+                    task = self._row_to_task(row[:11])
+                    state = None
+                    if row[11] is not None:
+                        state = ExpansionState(
+                            task_id=task.id,
+                            rule=row[11],
+                            source_start=datetime.fromisoformat(row[12]),
+                            expanded_until=date.fromisoformat(row[13])
+                        )
+                    candidates.append((task, state))
+                return candidates
+        
+        except Exception as e:
+            logger.error(f"Ошибка получения задач для разворачивания: {e}")
+            raise DatabaseError(f"Не удалось получить задачи для разворачивания: {e}")
+    
+    def save_occurrences(self, task_id: int, scheduled: List[datetime],
+                         replace_from: Optional[datetime] = None):
+        """
+        Сохранить развернутые экземпляры задачи
+        
+        Args:
+            task_id: ID повторяющейся задачи
+            scheduled: Даты экземпляров
+            replace_from: Удалить ранее развернутые экземпляры начиная с этого
+                момента, которые пользователь не трогал (не выполнены и не переопределены)
+        """
+        try:
+            now = datetime.now().isoformat()
+            
+            with self.get_connection() as conn:
+                if replace_from is not None:
+                    conn.execute("""
+                        DELETE FROM task_occurrences
+                        WHERE task_id = ? AND scheduled_at >= ? AND status = 'pending'
+                          AND override_title IS NULL AND override_due_at IS NULL
+                    """, (task_id, replace_from.isoformat()))
+                conn.executemany("""
+                    INSERT OR IGNORE INTO task_occurrences (
+                        task_id, scheduled_at, status, created_at, updated_at
+                    ) VALUES (?, ?, 'pending', ?, ?)
+                """, [(task_id, scheduled_at.isoformat(), now, now) for scheduled_at in scheduled])
+                self._commit(conn)
+        
+        except Exception as e:
+            logger.error(f"Ошибка сохранения экземпляров задачи: {e}")
+            raise DatabaseError(f"Не удалось сохранить экземпляры задачи: {e}")
+    
+    def set_expansion_state(self, state: ExpansionState):
+        """Сохранить состояние разворачивания задачи"""
+        try:
+            with self.get_connection() as conn:
+                conn.execute("""
+                    INSERT INTO occurrence_expansion (task_id, rule, source_start, expanded_until)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(task_id) DO UPDATE SET
+                        rule = excluded.rule,
+                        source_start = excluded.source_start,
+                        expanded_until = excluded.expanded_until
+                """, (
+                    state.task_id,
+                    state.rule,
+                    state.source_start.isoformat(),
+                    state.expanded_until.isoformat()
+                ))
+                self._commit(conn)
+        
+        except Exception as e:
+            logger.error(f"Ошибка сохранения состояния разворачивания: {e}")
+            raise DatabaseError(f"Не удалось сохранить состояние разворачивания: {e}")
+    
+    def purge_non_recurring_expansions(self) -> int:
+        """Удалить экземпляры и состояние задач, переставших быть повторяющимися"""
+        try:
+            with self.transaction() as conn:
+                conn.execute("""
+                    DELETE FROM task_occurrences
+                    WHERE status = 'pending'
+                      AND override_title IS NULL AND override_due_at IS NULL
+                      AND task_id IN (
+                          SELECT s.task_id FROM occurrence_expansion s
+                          JOIN tasks t ON t.id = s.task_id
+                          WHERE t.recurrence_rule IS NULL
+                      )
+                """)
+                cursor = conn.execute("""
+                    DELETE FROM occurrence_expansion
+                    WHERE task_id IN (SELECT id FROM tasks WHERE recurrence_rule IS NULL)
+                """)
+                return cursor.rowcount
+        
+        except Exception as e:
+            logger.error(f"Ошибка очистки экземпляров задач: {e}")
+            raise DatabaseError(f"Не удалось очистить экземпляры задач: {e}")
+    
+    # Журнал изменений: общий для всех процессов, работающих с файлом базы данных
+    
+    def get_last_change_seq(self) -> int:
+        """Номер последнего зафиксированного изменения (0, если изменений не было)"""
+        try:
+            with self.get_connection() as conn:
+                return self._read_change_seq(conn)
+        
+        except Exception as e:
+            logger.error(f"Ошибка получения номера изменения: {e}")
+            raise DatabaseError(f"Не удалось получить номер изменения: {e}")
+    
+    def _read_change_seq(self, conn: sqlite3.Connection) -> int:
+        """Номер последнего изменения на соединении (0 до создания журнала)"""
+        try:
+            # sqlite_sequence хранит номер и после очистки журнала
+            row = conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'change_log'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # Таблиц с AUTOINCREMENT еще нет: миграции не применены
+            return 0
+        return row[0] if row else 0
+    
+    def get_own_changes(self, until_seq: int) -> List[Tuple[int, int]]:
+        """
+        Диапазоны номеров (начало, конец], записанные транзакциями этого объекта
+        
+        Args:
+            until_seq: Вернуть только диапазоны, зафиксированные не позже этого номера
+        
+        Returns:
+            Диапазоны в порядке номеров
+        """
+        with self._own_changes_lock:
+            return [span for span in self._own_changes if span[1] <= until_seq]
+    
+    def forget_own_changes(self, until_seq: int):
+        """Забыть собственные изменения, уже пройденные лентой изменений"""
+        with self._own_changes_lock:
+            while self._own_changes and self._own_changes[0][1] <= until_seq:
+                self._own_changes.popleft()
+    
+    def get_changes_since(self, seq: int, limit: int = 1000) -> List[ChangeRecord]:
+        """
+        Получить изменения с номером больше seq в порядке возрастания
+        
+        Номера идут подряд: если первый полученный номер больше seq + 1,
+        промежуточные записи удалены очисткой журнала.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.execute("""
+                    SELECT seq, table_name, row_id, operation, day
+                    FROM change_log
+                    WHERE seq > ?
+                    ORDER BY seq
+                    LIMIT ?
+                """, (seq, limit))
+                
+                return [
+                    ChangeRecord(
+                        seq=row[0],
+                        table_name=row[1],
+                        row_id=row[2],
+                        operation=row[3],
+                        day=date.fromisoformat(row[4]) if row[4] else None
+                    )
+                    for row in cursor.fetchall()
+                ]
+        
+        except Exception as e:
+            logger.error(f"Ошибка получения журнала изменений: {e}")
+            raise DatabaseError(f"Не удалось получить журнал изменений: {e}")
+    
+    def prune_change_log(self, keep: Optional[int] = None) -> int:
+        """
+        Удалить старые записи журнала изменений
+        
+        Args:
+            keep: Сколько последних записей сохранить (по умолчанию CHANGE_LOG_KEEP)
+        
+        Returns:
+            Количество удаленных записей
+        """
+        try:
+            keep = self.CHANGE_LOG_KEEP if keep is None else keep
+            
+            with self.get_connection() as conn:
+                cursor = conn.execute("""
+                    DELETE FROM change_log
+                    WHERE seq <= (SELECT seq FROM sqlite_sequence WHERE name = 'change_log') - ?
+                """, (keep,))
+                # Журнал не относится к данным: write_version не меняется,
+                # и очистка не выглядит изменением данных для кэшей окна
+                if self._transaction_connection() is None:
+                    conn.commit()
+                return cursor.rowcount
+        
+        except Exception as e:
+            logger.error(f"Ошибка очистки журнала изменений: {e}")
+            raise DatabaseError(f"Не удалось очистить журнал изменений: {e}")
+    
+    def _task_insert_params(self, task: Task) -> tuple:
+        """Параметры для INSERT_TASK_SQL"""
+        return (
+            task.list_id,
+            task.title,
+            task.notes,
+            task.due_at.isoformat() if task.due_at else None,
+            task.status.value,
+            task.recurrence_rule.to_rrule_string() if task.recurrence_rule else None,
+            task.recurrence_start.isoformat() if task.recurrence_start else None,
+            task.timezone,
+            task.created_at.isoformat(),
+            task.updated_at.isoformat()
+        )
+    
+    def _task_update_params(self, task: Task) -> tuple:
+        """Параметры для UPDATE_TASK_SQL"""
+        return (
+            task.title,
+            task.notes,
+            task.due_at.isoformat() if task.due_at else None,
+            task.status.value,
+            task.recurrence_rule.to_rrule_string() if task.recurrence_rule else None,
+            task.recurrence_start.isoformat() if task.recurrence_start else None,
+            task.timezone,
+            task.updated_at.isoformat(),
+            task.id
+        )
+    
+    def _row_to_task_list(self, row: tuple) -> TaskList:
+        """Преобразовать строку БД (колонки TASK_LIST_COLUMNS) в объект TaskList"""
+        list_id, list_date, title, created_at, updated_at = row
+        return TaskList(
+            id=list_id,
+            date=date.fromisoformat(list_date),
+            title=title,
+            created_at=datetime.fromisoformat(created_at),
+            updated_at=datetime.fromisoformat(updated_at)
+        )
+    
+    def _row_to_occurrence(self, row: tuple) -> TaskOccurrence:
+        """Преобразовать строку БД (колонки OCCURRENCE_COLUMNS) в объект TaskOccurrence"""
+        (occurrence_id, task_id, scheduled_at, status, completed_at,
+         override_title, override_due_at, created_at, updated_at) = row
+        
+        return TaskOccurrence(
+            id=occurrence_id,
+            task_id=task_id,
+            scheduled_at=datetime.fromisoformat(scheduled_at),
+            status=_STATUS_BY_VALUE[status],
+            completed_at=datetime.fromisoformat(completed_at) if completed_at else None,
+            override_title=override_title,
+            override_due_at=datetime.fromisoformat(override_due_at) if override_due_at else None,
+            created_at=datetime.fromisoformat(created_at),
+            updated_at=datetime.fromisoformat(updated_at)
+        )
+    
+    def _row_to_task(self, row: tuple) -> Task:
+        """Преобразовать строку БД (колонки TASK_COLUMNS) в объект Task"""
+        (task_id, list_id, title, notes, due_at, status, rrule_string,
+         recurrence_start, timezone, created_at, updated_at) = row
         
         return Task(
-            id=row['id'],
-            list_id=row['list_id'],
-            title=row['title'],
-            notes=row['notes'] or "",
-            due_at=datetime.fromisoformat(row['due_at']) if row['due_at'] else None,
-            status=TaskStatus(row['status']),
-            recurrence_rule=recurrence_rule,
-            recurrence_start=datetime.fromisoformat(row['recurrence_start']) if row['recurrence_start'] else None,
-            timezone=row['timezone'],
-            created_at=datetime.fromisoformat(row['created_at']),
-            updated_at=datetime.fromisoformat(row['updated_at'])
+            id=task_id,
+            list_id=list_id,
+            title=title,
+            notes=notes or "",
+            due_at=datetime.fromisoformat(due_at) if due_at else None,
+            status=_STATUS_BY_VALUE[status],
+            recurrence_rule=parse_recurrence_rule(rrule_string) if rrule_string else None,
+            recurrence_start=datetime.fromisoformat(recurrence_start) if recurrence_start else None,
+            timezone=timezone,
+            created_at=datetime.fromisoformat(created_at),
+            updated_at=datetime.fromisoformat(updated_at)
         )
@@ -0,0 +1,127 @@
+"""
+Форматирование дат по языку интерфейса
+Названия месяцев и дней недели и шаблоны берутся из locales/*.json,
+результаты запоминаются по значению
+"""
+
+import logging
+from datetime import date, datetime, time
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+MONTH_KEYS = ("january", "february", "march", "april", "may", "june",
+              "july", "august", "september", "october", "november", "december")
+WEEKDAY_KEYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Шаблоны на случай, если в файле перевода их нет (аварийный fallback)
+DEFAULT_TEMPLATES = {
+    "long_date": "{month_name} {day:02d}, {year}",
+    "short_date": "{day:02d}.{month:02d}.{year}",
+    "time": "{hour:02d}:{minute:02d}",
+}
+
+# Сколько отформатированных значений хранить (при переполнении кэш очищается)
+MAX_CACHE_SIZE = 4096
+
+
+class DateFormatter:
+    """
+    Форматирование дат и времени для интерфейса
+    
+    Не зависит от локали процесса (strftime %B): таблицы названий строятся
+    из переводов один раз на язык. Шаблоны - строки str.format с полями
+    day, month, year, month_name, month_genitive, weekday_name, hour, minute.
+    """
+    
+    def __init__(self, localization):
+        """
+        Args:
+            localization: Localization, из переводов которой берутся названия и шаблоны
+        """
+        self.localization = localization
+        self._templates: Dict[str, str] = {}
+        self._month_names: Tuple[str, ...] = ()
+        self._month_genitive: Tuple[str, ...] = ()
+        self._weekday_names: Tuple[str, ...] = ()
+        self._cache: Dict[Tuple[str, Any], str] = {}
+    
+    def reset(self) -> None:
+        """Сбросить таблицы и кэш (вызывается при загрузке переводов)"""
+        self._templates = {}
+        self._cache.clear()
+    
+    def _ensure_tables(self) -> None:
+        """Построить таблицы названий и шаблонов для текущего языка"""
+        if self._templates:
+            return
+        
+        get_text = self.localization.get_text
+        self._month_names = tuple(get_text(f"calendar.{key}") for key in MONTH_KEYS)
+        self._month_genitive = tuple(get_text(f"date_formats.months_genitive.{key}") for key in MONTH_KEYS)
+        self._weekday_names = tuple(get_text(f"calendar.{key}") for key in WEEKDAY_KEYS)
+        
+        templates = {}
+        for name, default in DEFAULT_TEMPLATES.items():
+            key = f"date_formats.{name}"
+            template = get_text(key)
+            templates[name] = default if template == key else template
+        self._templates = templates
+    
+    def _format(self, name: str, value) -> str:
+        """Отформатировать value по шаблону name (с запоминанием результата)"""
+        cache_key = (name, value)
+        result = self._cache.get(cache_key)
+        if result is not None:
+            return result
+        
+        self._ensure_tables()
+        fields = {}
+        if isinstance(value, date):
+            fields.update(
+                day=value.day, month=value.month, year=value.year,
+                month_name=self._month_names[value.month - 1],
+                month_genitive=self._month_genitive[value.month - 1],
+                weekday_name=self._weekday_names[value.weekday()],
+            )
+        if isinstance(value, (datetime, time)):
+            fields.update(hour=value.hour, minute=value.minute)
+        
+        try:
+            result = self._templates[name].format_map(fields)
+        except (KeyError, ValueError, IndexError) as e:
+            logger.error(f"Ошибка шаблона даты {name}: {e}")
+            result = DEFAULT_TEMPLATES[name].format_map(fields)
+        
+        if len(self._cache) >= MAX_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[cache_key] = result
+        return result
+    
+    def month_name(self, month: int) -> str:
+        """Название месяца (1-12)"""
+        self._ensure_tables()
+        return self._month_names[month - 1]
+    
+    def weekday_name(self, weekday: int) -> str:
+        """Название дня недели (0 - понедельник)"""
+        self._ensure_tables()
+        return self._weekday_names[weekday]
+    
+    def format_long_date(self, value: date) -> str:
+        """Дата с названием месяца: "05 октября 2026" / "October 05, 2026" """
+        return self._format("long_date", value)
+    
+    def format_short_date(self, value: date) -> str:
+        """Числовая дата: "05.10.2026" """
+        return self._format("short_date", value)
+    
+    def format_time(self, value) -> str:
+        """Время: "14:30" (datetime или time)"""
+        if isinstance(value, datetime):
+            value = value.time()
+        return self._format("time", value)
+    
+    def format_datetime(self, value: datetime) -> str:
+        """Числовая дата и время: "05.10.2026 14:30" """
+        return f"{self.format_short_date(value.date())} {self.format_time(value)}"
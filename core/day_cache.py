@@ -0,0 +1,129 @@
+"""
+Кэш загруженных дней: список задач и задачи (с экземплярами повторяющихся) по дате
+Ограниченный LRU, записи сбрасываются по датам, затронутым записью
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .database import Database
+from .models import TaskList
+
+logger = logging.getLogger(__name__)
+
+# Загруженный день: список задач (None, если еще не создан) и задачи с экземплярами
+DayEntry = Tuple[Optional[TaskList], List]
+
+
+def load_day(database: Database, target_date: date) -> DayEntry:
+    """
+    Прочитать день из базы данных без записи (безопасно вызывать из рабочего потока)
+    
+    Экземпляры повторяющихся задач должны быть заранее развернуты до target_date.
+    """
+    task_list = database.get_task_list_by_date(target_date)
+    
+    items = []
+    if task_list and task_list.id:
+        items = database.get_tasks_by_list_id(task_list.id)
+    
+    own_task_ids = {task.id for task in items}
+    items.extend(
+        occurrence for occurrence in database.get_occurrences_by_date(target_date)
+        if occurrence.task_id not in own_task_ids
+    )
+    return task_list, items
+
+
+class DayCache:
+    """
+    Потокобезопасный LRU-кэш дней
+    
+    Записи сбрасываются только для измененных дней (discard, discard_range).
+    Чтение дня начинается с generation(): если день сброшен, пока шло чтение,
+    put() не сохранит устаревший результат.
+    """
+    
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self._entries: OrderedDict[date, DayEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        # Поколение сбросов: дата -> поколение последнего сброса дня и
+        # поколение последнего сброса всех дней (диапазона или всего кэша)
+        self._generation = 0
+        self._discarded: Dict[date, int] = {}
+        self._discarded_all = 0
+    
+    def generation(self) -> int:
+        """Текущее поколение сбросов (берется до чтения дня из базы данных)"""
+        with self._lock:
+            return self._generation
+    
+    def get(self, target_date: date) -> Optional[DayEntry]:
+        """Получить день, если он загружен"""
+        with self._lock:
+            entry = self._entries.get(target_date)
+            if entry is None:
+                return None
+            
+            self._entries.move_to_end(target_date)
+            task_list, items = entry
+            # Копия списка: вызывающий может его изменять
+            return task_list, list(items)
+    
+    def contains(self, target_date: date) -> bool:
+        """Проверить наличие записи без изменения порядка LRU"""
+        with self._lock:
+            return target_date in self._entries
+    
+    def put(self, target_date: date, task_list: Optional[TaskList], items: List,
+            generation: int):
+        """
+        Сохранить день, вытеснив самый давно использованный при переполнении
+        
+        Args:
+            generation: Поколение сбросов на момент начала чтения дня
+        """
+        with self._lock:
+            # День сброшен после начала чтения: прочитанные данные могли устареть
+            if generation < max(self._discarded_all, self._discarded.get(target_date, 0)):
+                return
+            
+            self._entries[target_date] = (task_list, list(items))
+            self._entries.move_to_end(target_date)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+    
+    def discard(self, dates: Iterable[date]):
+        """Сбросить записи указанных дней"""
+        with self._lock:
+            self._generation += 1
+            for target_date in dates:
+                self._entries.pop(target_date, None)
+                self._discarded[target_date] = self._generation
+    
+    def discard_range(self, start: date, end: date):
+        """Сбросить записи дней с start по end включительно (экземпляры повторяющейся задачи)"""
+        with self._lock:
+            for target_date in [d for d in self._entries if start <= d <= end]:
+                del self._entries[target_date]
+            self._reset_generations()
+    
+    def clear(self):
+        """Очистить кэш"""
+        with self._lock:
+            self._entries.clear()
+            self._reset_generations()
+    
+    def _reset_generations(self):
+        """Сбросить все дни: отклоняются все чтения, начатые до этого момента"""
+        self._generation += 1
+        self._discarded_all = self._generation
+        self._discarded.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
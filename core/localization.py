@@ -3,21 +3,71 @@
 Решает проблемы с отображением ключей вместо переводов
 """
 
+import os
 import json
+import pickle
 import logging
-from typing import Dict, Any
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
 from .resource_manager import ResourceManager
+from .date_format import DateFormatter
 
 logger = logging.getLogger(__name__)
 
+# Версия формата дискового кэша переводов (меняется при изменении структуры)
+CACHE_FORMAT_VERSION = 1
+
+
+def flatten_translations(data: Dict[str, Any], prefix: str = '') -> Dict[str, str]:
+    """
+    Развернуть вложенный словарь переводов в плоский по ключам вида "section.key"
+    
+    Пример:
+        {"filters": {"all": "Все"}} -> {"filters.all": "Все"}
+    """
+    flat = {}
+    for key, value in data.items():
+        full_key = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten_translations(value, full_key))
+        else:
+            flat[full_key] = str(value)
+    return flat
+
 
 class Localization:
-    """Система локализации с fallback механизмом"""
+    """
+    Система локализации с fallback механизмом
+    
+    Файлы переводов разворачиваются в плоские таблицы один раз при загрузке,
+    поэтому get_text - это одно обращение к словарю. Разобранные файлы
+    кэшируются для процесса (по языку) и, если disk_cache включен, на диске
+    в pickle рядом с данными приложения; кэш сверяется с mtime и размером файла.
+    """
     
-    def __init__(self, language: str = 'ru'):
+    # Разобранные файлы для процесса: язык -> (подпись файла, вложенный, плоский)
+    _language_cache: Dict[str, Tuple[Tuple, Dict[str, Any], Dict[str, str]]] = {}
+    
+    def __init__(self, language: str = 'ru', disk_cache: bool = True):
+        """
+        Args:
+            language: Язык интерфейса
+            disk_cache: Использовать дисковый кэш разобранных файлов переводов
+        """
         self.current_language = language
+        self.disk_cache = disk_cache
         self.translations: Dict[str, Any] = {}
         self.fallback_translations: Dict[str, Any] = {}
+        
+        # Плоская таблица: переводы текущего языка поверх fallback
+        self._texts: Dict[str, str] = {}
+        self._flat_translations: Dict[str, str] = {}
+        self._flat_fallback: Dict[str, str] = {}
+        
+        # Форматирование дат по текущему языку
+        self.dates = DateFormatter(self)
+        
         self.load_translations()
     
     def load_translations(self) -> None:
@@ -31,12 +81,16 @@ class Localization:
                 self._load_language_file(self.current_language, is_fallback=False)
             else:
                 self.translations = self.fallback_translations.copy()
+                self._flat_translations = self._flat_fallback
                 
             logger.info(f"Локализация загружена: {self.current_language}")
             
         except Exception as e:
             logger.error(f"Ошибка загрузки локализации: {e}")
             self._create_emergency_fallback()
+        
+        self._texts = {**self._flat_fallback, **self._flat_translations}
+        self.dates.reset()
     
     def _load_language_file(self, language: str, is_fallback: bool = False) -> None:
         """Загрузить файл перевода для указанного языка"""
@@ -45,13 +99,14 @@ class Localization:
         
         if resource_path and resource_path.exists():
             try:
-                with open(resource_path, 'r', encoding='utf-8') as f:
-                    translations = json.load(f)
+                translations, flat = self._read_language_file(language, resource_path)
                 
                 if is_fallback:
                     self.fallback_translations = translations
+                    self._flat_fallback = flat
                 else:
                     self.translations = translations
+                    self._flat_translations = flat
                     
                 logger.debug(f"Загружен файл локализации: {resource_path}")
                 
@@ -68,6 +123,70 @@ class Localization:
             if not is_fallback:
                 self._create_emergency_fallback()
     
+    def _read_language_file(self, language: str, resource_path: Path) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Прочитать файл перевода: из кэша процесса, из дискового кэша или из JSON
+        
+        Returns:
+            (вложенный словарь переводов, плоская таблица)
+        """
+        stat = resource_path.stat()
+        signature = (CACHE_FORMAT_VERSION, str(resource_path), stat.st_mtime_ns, stat.st_size)
+        
+        cached = self._language_cache.get(language)
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2]
+        
+        loaded = self._read_disk_cache(language, signature) if self.disk_cache else None
+        if loaded is None:
+            with open(resource_path, 'r', encoding='utf-8') as f:
+                translations = json.load(f)
+            loaded = (translations, flatten_translations(translations))
+            if self.disk_cache:
+                self._write_disk_cache(language, signature, loaded)
+        
+        self._language_cache[language] = (signature, *loaded)
+        return loaded
+    
+    @staticmethod
+    def _disk_cache_path(language: str) -> Path:
+        """Путь к дисковому кэшу разобранного файла перевода"""
+        return ResourceManager.get_app_data_dir() / "cache" / f"locale-{language}.pickle"
+    
+    def _read_disk_cache(self, language: str, signature: Tuple) -> Optional[Tuple[Dict[str, Any], Dict[str, str]]]:
+        """Прочитать дисковый кэш, если он соответствует файлу перевода"""
+        cache_path = self._disk_cache_path(language)
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_signature, translations, flat = pickle.load(f)
+            if cached_signature == signature:
+                return translations, flat
+                
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Дисковый кэш локализации не прочитан {cache_path}: {e}")
+        return None
+    
+    def _write_disk_cache(self, language: str, signature: Tuple,
+                          loaded: Tuple[Dict[str, Any], Dict[str, str]]) -> None:
+        """Записать дисковый кэш (атомарно; ошибки не мешают работе)"""
+        cache_path = self._disk_cache_path(language)
+        temp_path = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".locale-", suffix=".tmp", dir=cache_path.parent)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((signature, *loaded), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+            temp_path = None
+            
+        except Exception as e:
+            logger.debug(f"Дисковый кэш локализации не записан {cache_path}: {e}")
+        finally:
+            if temp_path is not None:
+                Path(temp_path).unlink(missing_ok=True)
+    
     def _create_emergency_fallback(self) -> None:
         """Создать аварийный fallback с базовыми переводами"""
         logger.warning("Создание аварийного fallback для локализации")
@@ -109,8 +228,10 @@ class Localization:
         
         if not self.translations:
             self.translations = emergency_translations
+            self._flat_translations = flatten_translations(emergency_translations)
         if not self.fallback_translations:
             self.fallback_translations = emergency_translations
+            self._flat_fallback = flatten_translations(emergency_translations)
     
     def get_text(self, key: str) -> str:
         """
@@ -122,41 +243,13 @@ class Localization:
         Returns:
             Переведенный текст или ключ если перевод не найден
         """
-        try:
-            # Разбиваем ключ на части
-            keys = key.split('.')
-            
-            # Ищем в основных переводах
-            result = self._get_nested_value(self.translations, keys)
-            if result is not None:
-                return str(result)
-            
-            # Ищем в fallback переводах
-            result = self._get_nested_value(self.fallback_translations, keys)
-            if result is not None:
-                logger.debug(f"Использован fallback для ключа: {key}")
-                return str(result)
-            
-            # Если ничего не найдено, возвращаем ключ
-            logger.warning(f"Перевод не найден для ключа: {key}")
-            return key
-            
-        except Exception as e:
-            logger.error(f"Ошибка получения перевода для ключа {key}: {e}")
-            return key
-    
-    def _get_nested_value(self, data: Dict[str, Any], keys: list[str]) -> Any:
-        """Получить значение из вложенного словаря по списку ключей"""
-        try:
-            current = data
-            for key in keys:
-                if isinstance(current, dict) and key in current:
-                    current = current[key]
-                else:
-                    return None
-            return current
-        except Exception:
-            return None
+        text = self._texts.get(key)
+        if text is not None:
+            return text
+        
+        # Если ничего не найдено, возвращаем ключ
+        logger.warning(f"Перевод не найден для ключа: {key}")
+        return key
     
     def set_language(self, language: str) -> None:
         """Изменить язык интерфейса"""
@@ -5,6 +5,7 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
@@ -111,6 +112,17 @@ class RecurrenceRule:
         )
 
 
+@lru_cache(maxsize=1024)
+def parse_recurrence_rule(rrule_string: str) -> RecurrenceRule:
+    """
+    Разобрать строку RRULE с кэшированием по строке
+    
+    Возвращаемый экземпляр общий для всех задач с одинаковым правилом,
+    поэтому его нельзя изменять на месте - нужно создавать новое правило.
+    """
+    return RecurrenceRule.from_rrule_string(rrule_string)
+
+
 @dataclass
 class Task:
     """Основная задача (может быть повторяющейся)"""
@@ -222,6 +234,25 @@ class RecurrenceException:
             self.created_at = datetime.now()
 
 
+@dataclass
+class ExpansionState:
+    """Состояние разворачивания повторяющейся задачи в экземпляры"""
+    task_id: int
+    rule: str  # RRULE строка, по которой развернуты экземпляры
+    source_start: datetime  # Начало повторения (dtstart) на момент разворачивания
+    expanded_until: date  # Последняя развернутая дата
+
+
+@dataclass
+class ChangeRecord:
+    """Запись журнала изменений (заполняется триггерами базы данных)"""
+    seq: int  # Монотонно растущий номер изменения
+    table_name: str  # task_lists, tasks, task_occurrences, occurrence_expansion, recurrence_exceptions
+    row_id: int  # Для occurrence_expansion и recurrence_exceptions - ID задачи
+    operation: str  # insert, update, delete
+    day: Optional[date]  # Затронутый день, None - изменение затрагивает несколько дней
+
+
 # Вспомогательные функции для валидации
 
 def validate_task(task: Task) -> List[str]:
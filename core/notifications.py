@@ -3,17 +3,30 @@
 Кроссплатформенная реализация с fallback для Linux
 """
 
+import heapq
 import logging
 import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable
+from datetime import date, datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Callable
 from PySide6.QtCore import QObject, Signal, QTimer
 from PySide6.QtWidgets import QSystemTrayIcon, QMessageBox
 
+from .models import TaskOccurrence
+
 logger = logging.getLogger(__name__)
 
 
+def reminder_key(item) -> Hashable:
+    """
+    Ключ напоминания: ID задачи, для экземпляра повторяющейся задачи -
+    (ID задачи, ID экземпляра), чтобы экземпляры напоминали независимо
+    """
+    if isinstance(item, TaskOccurrence):
+        return (item.task_id, item.id)
+    return item.id
+
+
 class NotificationManager(QObject):
     """Менеджер уведомлений с поддержкой системного трея"""
     
@@ -30,7 +43,7 @@ class NotificationManager(QObject):
         
         # Инициализируем системный трей
         self.init_system_tray()
-        
+    
     def init_system_tray(self):
         """Инициализация системного трея"""
         try:
@@ -44,7 +57,7 @@ class NotificationManager(QObject):
                 logger.debug("Системный трей инициализирован")
             else:
                 logger.warning("Системный трей недоступен")
-                
+        
         except Exception as e:
             logger.error(f"Ошибка инициализации системного трея: {e}")
     
@@ -67,7 +80,7 @@ class NotificationManager(QObject):
             else:
                 # Fallback - показываем через QMessageBox
                 self.show_fallback_notification(title, message, notification_type)
-                
+        
         except Exception as e:
             logger.error(f"Ошибка показа уведомления: {e}")
             # Последний fallback
@@ -82,43 +95,48 @@ class NotificationManager(QObject):
                 QMessageBox.warning(None, title, message)
             else:
                 QMessageBox.information(None, title, message)
-                
+        
         except Exception as e:
             logger.error(f"Ошибка fallback уведомления: {e}")
     
+    def _text(self, key: str, default: str) -> str:
+        """Текст перевода или default, если ключа нет в переводах"""
+        text = self.localization.get_text(key)
+        return default if text == key else text
+    
     def show_task_reminder(self, task_title: str, due_time: datetime, task_id: int):
         """Показать напоминание о задаче"""
         try:
-            title = self.localization.get("notifications.reminder_title", "Task Reminder")
-            due_str = due_time.strftime("%H:%M")
-            message = f"{task_title}\n{self.localization.get('notifications.due_at', 'Due at:')} {due_str}"
+            title = self._text("notifications.reminder_title", "Task Reminder")
+            due_str = self.localization.dates.format_time(due_time)
+            message = f"{task_title}\n{self._text('notifications.due_at', 'Due at:')} {due_str}"
             
             self.show_notification(title, message, "info", 10000, task_id)
-            
+        
         except Exception as e:
             logger.error(f"Ошибка показа напоминания: {e}")
     
     def show_overdue_notification(self, task_title: str, was_due: datetime, task_id: int):
         """Показать уведомление о просроченной задаче"""
         try:
-            title = self.localization.get("notifications.overdue_title", "Overdue Task")
-            due_str = was_due.strftime("%H:%M")
-            message = f"{task_title}\n{self.localization.get('notifications.was_due_at', 'Was due at:')} {due_str}"
+            title = self._text("notifications.overdue_title", "Overdue Task")
+            due_str = self.localization.dates.format_time(was_due)
+            message = f"{task_title}\n{self._text('notifications.was_due_at', 'Was due at:')} {due_str}"
             
             self.show_notification(title, message, "warning", 15000, task_id)
-            
+        
         except Exception as e:
             logger.error(f"Ошибка показа уведомления о просрочке: {e}")
     
     def show_daily_summary(self, tasks_count: int, completed_count: int):
         """Показать ежедневную сводку"""
         try:
-            title = self.localization.get("notifications.daily_summary_title", "Daily Summary")
-            message = f"{self.localization.get('notifications.tasks_today', 'Tasks today')}: {tasks_count}\n"
-            message += f"{self.localization.get('notifications.completed', 'Completed')}: {completed_count}"
+            title = self._text("notifications.daily_summary_title", "Daily Summary")
+            message = f"{self._text('notifications.tasks_today', 'Tasks today')}: {tasks_count}\n"
+            message += f"{self._text('notifications.completed', 'Completed')}: {completed_count}"
             
             self.show_notification(title, message, "info", 8000)
-            
+        
         except Exception as e:
             logger.error(f"Ошибка показа ежедневной сводки: {e}")
     
@@ -127,7 +145,7 @@ class NotificationManager(QObject):
         try:
             if reason == QSystemTrayIcon.ActivationReason.DoubleClick:
                 self.notification_clicked.emit("show_main_window")
-                
+        
         except Exception as e:
             logger.error(f"Ошибка обработки активации трея: {e}")
     
@@ -139,7 +157,7 @@ class NotificationManager(QObject):
             
             self.notification_service_running = True
             logger.debug("Сервис уведомлений запущен")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка запуска сервиса уведомлений: {e}")
     
@@ -151,125 +169,334 @@ class NotificationManager(QObject):
             
             self.notification_service_running = False
             logger.debug("Сервис уведомлений остановлен")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка остановки сервиса уведомлений: {e}")
 
 
 class ReminderScheduler(QObject):
-    """Планировщик напоминаний"""
+    """
+    Планировщик напоминаний
+    
+    Напоминания хранятся в двоичной куче по времени срабатывания, а один
+    таймер взводится на ближайшее из них. Планирование и перепланирование
+    выполняются за O(log n), отмена - за O(1): запись помечается удаленной
+    и выбрасывается при извлечении из кучи.
+    """
+    
+    # Максимальный интервал таймера: после сна системы или перевода часов
+    # очередь все равно будет проверена не позже чем через час
+    MAX_TIMER_INTERVAL_MS = 60 * 60 * 1000
+    
+    # Перестраивать кучу, когда удаленных записей больше половины
+    COMPACT_MIN_SIZE = 1024
+    
+    # За сколько до срока показывается напоминание
+    REMINDER_ADVANCE = timedelta(minutes=15)
     
     def __init__(self, notification_manager: NotificationManager):
         super().__init__()
         self.notification_manager = notification_manager
-        self.active_reminders: Dict[int, QTimer] = {}
+        
+        # Куча записей [время, порядковый номер, task_id, название];
+        # у отмененной записи task_id заменяется на None
+        self._heap: List[list] = []
+        self._entries: Dict[int, list] = {}  # task_id -> запись в куче
+        self._sequence = 0
+        self._cancelled_count = 0
+        self._day_keys: Dict[date, Set[Hashable]] = {}  # день -> ключи напоминаний его задач
         self.reminder_lock = threading.Lock()
         
-    def schedule_reminder(self, task_id: int, task_title: str, reminder_time: datetime):
-        """Запланировать напоминание"""
+        # Единственный таймер, взведенный на ближайшее напоминание
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.process_due_reminders)
+    
+    def schedule_reminder(self, task_id: Hashable, task_title: str, reminder_time: datetime,
+                          due_at: Optional[datetime] = None):
+        """
+        Запланировать напоминание (заменяет существующее для задачи)
+        
+        Args:
+            task_id: ID задачи или ключ экземпляра (reminder_key)
+            due_at: Срок задачи для текста уведомления (None - время напоминания)
+        """
         try:
+            # Вычисляем время до напоминания
+            if reminder_time <= datetime.now():
+                logger.debug(f"Время напоминания уже прошло для задачи {task_id}")
+                return
+            
             with self.reminder_lock:
-                # Отменяем существующее напоминание для этой задачи
-                self.cancel_reminder(task_id)
-                
-                # Вычисляем время до напоминания
-                now = datetime.now()
-                if reminder_time <= now:
-                    logger.debug(f"Время напоминания уже прошло для задачи {task_id}")
-                    return
-                
-                delay_ms = int((reminder_time - now).total_seconds() * 1000)
-                
-                # Создаем таймер
-                timer = QTimer()
-                timer.setSingleShot(True)
-                timer.timeout.connect(lambda: self.trigger_reminder(task_id, task_title, reminder_time))
-                timer.start(delay_ms)
-                
-                self.active_reminders[task_id] = timer
-                
-                logger.debug(f"Напоминание запланировано для задачи {task_id} на {reminder_time}")
-                
+                self._cancel_locked(task_id)
+                entry = self._push_locked(task_id, task_title, reminder_time, due_at)
+                is_next = self._heap[0] is entry
+            
+            # Перевзводим таймер, только если новое напоминание стало ближайшим
+            if is_next:
+                self._rearm_timer()
+            
+            logger.debug(f"Напоминание запланировано для задачи {task_id} на {reminder_time}")
+        
         except Exception as e:
             logger.error(f"Ошибка планирования напоминания: {e}")
     
-    def trigger_reminder(self, task_id: int, task_title: str, reminder_time: datetime):
-        """Срабатывание напоминания"""
+    def schedule_reminders(self, reminders: List[tuple]):
+        """
+        Запланировать пакет напоминаний за O(n)
+        
+        Args:
+            reminders: Кортежи (task_id, task_title, reminder_time[, due_at])
+        """
         try:
+            now = datetime.now()
             with self.reminder_lock:
-                # Удаляем таймер из активных
-                if task_id in self.active_reminders:
-                    del self.active_reminders[task_id]
+                for task_id, task_title, reminder_time, *due in reminders:
+                    if reminder_time <= now:
+                        continue
+                    due_at = due[0] if due else None
+                    # Повторная загрузка дня не плодит удаленные записи в куче
+                    existing = self._entries.get(task_id)
+                    if existing is not None and existing[0] == reminder_time and \
+                            existing[3] == task_title and existing[4] == due_at:
+                        continue
+                    self._cancel_locked(task_id)
+                    entry = [reminder_time, self._sequence, task_id, task_title, due_at]
+                    self._sequence += 1
+                    self._heap.append(entry)
+                    self._entries[task_id] = entry
+                heapq.heapify(self._heap)
             
-            # Показываем напоминание
-            self.notification_manager.show_task_reminder(task_title, reminder_time, task_id)
+            self._rearm_timer()
+            logger.debug(f"Запланировано напоминаний: {len(reminders)}")
+        
+        except Exception as e:
+            logger.error(f"Ошибка пакетного планирования напоминаний: {e}")
+    
+    def sync_day(self, day: date, items: Iterable):
+        """
+        Запланировать напоминания задач загруженного дня
+        
+        Напоминания выполненных задач, задач без срока и задач, которых в дне
+        больше нет (например, удаленных другим процессом), отменяются.
+        """
+        try:
+            reminders = []
+            keys = set()
+            for item in items:
+                key = reminder_key(item)
+                keys.add(key)
+                reminder = self._item_reminder(item)
+                if reminder is not None:
+                    reminders.append((key, *reminder))
             
-            logger.debug(f"Напоминание сработало для задачи {task_id}")
+            wanted = {reminder[0] for reminder in reminders}
+            with self.reminder_lock:
+                stale = (self._day_keys.get(day, set()) | keys) - wanted
+                self._day_keys[day] = keys
+                for key in stale:
+                    self._cancel_locked(key)
+            
+            self.schedule_reminders(reminders)
+        
+        except Exception as e:
+            logger.error(f"Ошибка планирования напоминаний дня: {e}")
+    
+    def update_item_reminder(self, item, day: Optional[date] = None):
+        """
+        Перепланировать напоминание после сохранения задачи или экземпляра
+        
+        Args:
+            item: Task или TaskOccurrence
+            day: День, в списке которого показана задача (для sync_day)
+        """
+        key = reminder_key(item)
+        if day is not None:
+            with self.reminder_lock:
+                self._day_keys.setdefault(day, set()).add(key)
+        
+        reminder = self._item_reminder(item)
+        if reminder is None:
+            self.cancel_reminder(key)
+        else:
+            self.schedule_reminder(key, *reminder)
+    
+    def _item_reminder(self, item) -> Optional[tuple]:
+        """(название, время напоминания, срок) для невыполненной задачи со сроком или None"""
+        if item.is_completed:
+            return None
+        if isinstance(item, TaskOccurrence):
+            title, due_at = item.effective_title, item.effective_due_at
+        else:
+            title, due_at = item.title, item.due_at
+        if due_at is None:
+            return None
+        return title, due_at - self.REMINDER_ADVANCE, due_at
+    
+    def process_due_reminders(self):
+        """Показать наступившие напоминания и взвести таймер на следующее"""
+        try:
+            due = []
+            now = datetime.now()
+            
+            with self.reminder_lock:
+                while self._heap and self._heap[0][0] <= now:
+                    reminder_time, _, task_id, task_title, due_at = heapq.heappop(self._heap)
+                    if task_id is None:
+                        self._cancelled_count -= 1
+                        continue
+                    del self._entries[task_id]
+                    due.append((task_id, task_title, reminder_time, due_at))
+            
+            # Уведомления показываются вне блокировки
+            for task_id, task_title, reminder_time, due_at in due:
+                self.trigger_reminder(task_id, task_title, reminder_time, due_at)
+            
+            self._rearm_timer()
+        
+        except Exception as e:
+            logger.error(f"Ошибка обработки напоминаний: {e}")
+    
+    def trigger_reminder(self, task_id: Hashable, task_title: str, reminder_time: datetime,
+                         due_at: Optional[datetime] = None):
+        """Срабатывание напоминания"""
+        try:
+            # Ключ экземпляра повторяющейся задачи начинается с ID задачи
+            if isinstance(task_id, tuple):
+                task_id = task_id[0]
+            
+            # Показываем напоминание со сроком задачи, сохраненным при планировании
+            self.notification_manager.show_task_reminder(
+                task_title, due_at if due_at is not None else reminder_time, task_id
+            )
             
+            logger.debug(f"Напоминание сработало для задачи {task_id}")
+        
         except Exception as e:
             logger.error(f"Ошибка срабатывания напоминания: {e}")
     
-    def cancel_reminder(self, task_id: int):
+    def cancel_reminder(self, task_id: Hashable):
         """Отменить напоминание"""
         try:
             with self.reminder_lock:
-                if task_id in self.active_reminders:
-                    timer = self.active_reminders[task_id]
-                    timer.stop()
-                    del self.active_reminders[task_id]
+                if self._cancel_locked(task_id):
                     logger.debug(f"Напоминание отменено для задачи {task_id}")
-                    
+        
         except Exception as e:
             logger.error(f"Ошибка отмены напоминания: {e}")
     
     def cancel_all_reminders(self):
         """Отменить все напоминания"""
         try:
+            self.timer.stop()
             with self.reminder_lock:
-                for timer in self.active_reminders.values():
-                    timer.stop()
-                self.active_reminders.clear()
-                logger.debug("Все напоминания отменены")
-                
+                self._heap.clear()
+                self._entries.clear()
+                self._day_keys.clear()
+                self._cancelled_count = 0
+            logger.debug("Все напоминания отменены")
+        
         except Exception as e:
             logger.error(f"Ошибка отмены всех напоминаний: {e}")
     
     def get_active_reminders_count(self) -> int:
         """Получить количество активных напоминаний"""
         with self.reminder_lock:
-            return len(self.active_reminders)
+            return len(self._entries)
+    
+    def get_next_reminder_time(self) -> Optional[datetime]:
+        """Время ближайшего напоминания или None"""
+        with self.reminder_lock:
+            self._drop_cancelled_head_locked()
+            return self._heap[0][0] if self._heap else None
     
-    def reschedule_reminders_for_task(self, task_id: int, task_title: str, new_due_time: datetime):
+    def reschedule_reminders_for_task(self, task_id: Hashable, task_title: str, new_due_time: datetime):
         """Перепланировать напоминания для задачи"""
         try:
-            # Отменяем старое напоминание
-            self.cancel_reminder(task_id)
-            
-            # Планируем новое напоминание за 15 минут до срока
-            reminder_time = new_due_time - timedelta(minutes=15)
+            # Планируем новое напоминание за REMINDER_ADVANCE до срока
+            reminder_time = new_due_time - self.REMINDER_ADVANCE
             if reminder_time > datetime.now():
-                self.schedule_reminder(task_id, task_title, reminder_time)
-                
+                # schedule_reminder заменяет старое напоминание задачи
+                self.schedule_reminder(task_id, task_title, reminder_time, new_due_time)
+            else:
+                self.cancel_reminder(task_id)
+        
         except Exception as e:
             logger.error(f"Ошибка перепланирования напоминаний: {e}")
+    
+    # Внутренние методы вызываются под reminder_lock
+    
+    def _push_locked(self, task_id: Hashable, task_title: str, reminder_time: datetime,
+                     due_at: Optional[datetime] = None) -> list:
+        """Добавить запись в кучу"""
+        entry = [reminder_time, self._sequence, task_id, task_title, due_at]
+        self._sequence += 1
+        heapq.heappush(self._heap, entry)
+        self._entries[task_id] = entry
+        return entry
+    
+    def _cancel_locked(self, task_id: Hashable) -> bool:
+        """Пометить напоминание задачи удаленным"""
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return False
+        
+        entry[2] = None
+        self._cancelled_count += 1
+        
+        # Не даем удаленным записям накапливаться в куче
+        if self._cancelled_count > self.COMPACT_MIN_SIZE and self._cancelled_count * 2 > len(self._heap):
+            self._heap = [item for item in self._heap if item[2] is not None]
+            heapq.heapify(self._heap)
+            self._cancelled_count = 0
+        return True
+    
+    def _drop_cancelled_head_locked(self):
+        """Убрать удаленные записи с вершины кучи"""
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+            self._cancelled_count -= 1
+    
+    def _rearm_timer(self):
+        """Взвести таймер на ближайшее напоминание"""
+        next_time = self.get_next_reminder_time()
+        if next_time is None:
+            self.timer.stop()
+            return
+        
+        delay_ms = int((next_time - datetime.now()).total_seconds() * 1000)
+        self.timer.start(max(0, min(delay_ms, self.MAX_TIMER_INTERVAL_MS)))
 
 
 class OverdueChecker(QObject):
     """Проверка просроченных задач"""
     
-    def __init__(self, database, notification_manager: NotificationManager):
+    def __init__(self, database, notification_manager: NotificationManager, repository=None):
+        """
+        Args:
+            database: База данных
+            notification_manager: Менеджер уведомлений
+            repository: AsyncRepository для запроса в потоке базы данных
+                (None - запрос выполняется в вызывающем потоке)
+        """
         super().__init__()
         self.database = database
         self.notification_manager = notification_manager
+        self.repository = repository
+        # Момент предыдущей проверки: уведомляем только о задачах, просроченных после него
+        self.last_check: Optional[datetime] = None
         self.check_timer = QTimer()
         self.check_timer.timeout.connect(self.check_overdue_tasks)
-        
+    
     def start_checking(self, interval_minutes: int = 30):
         """Запустить проверку просроченных задач"""
         try:
+            # Первая проверка охватывает один интервал до запуска, а не всю историю
+            if self.last_check is None:
+                self.last_check = datetime.now() - timedelta(minutes=interval_minutes)
             self.check_timer.start(interval_minutes * 60 * 1000)  # Конвертируем в миллисекунды
             logger.debug(f"Проверка просроченных задач запущена с интервалом {interval_minutes} минут")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка запуска проверки просроченных задач: {e}")
     
@@ -278,7 +505,7 @@ class OverdueChecker(QObject):
         try:
             self.check_timer.stop()
             logger.debug("Проверка просроченных задач остановлена")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка остановки проверки просроченных задач: {e}")
     
@@ -286,16 +513,36 @@ class OverdueChecker(QObject):
         """Проверить просроченные задачи"""
         try:
             now = datetime.now()
-            overdue_tasks = self.database.get_overdue_tasks(now)
+            if self.repository is not None:
+                self.repository.submit(
+                    self.database.get_overdue_tasks, now, since=self.last_check,
+                    on_result=lambda tasks: self._on_overdue_tasks(now, tasks),
+                    on_error=lambda e: logger.error(f"Ошибка проверки просроченных задач: {e}"),
+                    background=True
+                )
+            else:
+                self._on_overdue_tasks(now, self.database.get_overdue_tasks(now, since=self.last_check))
+                
+        except Exception as e:
+            logger.error(f"Ошибка проверки просроченных задач: {e}")
+    
+    def _on_overdue_tasks(self, now: datetime, overdue_tasks: List):
+        """Показать уведомления о задачах, просроченных к моменту проверки now"""
+        try:
+            self.last_check = now
             
-            for task in overdue_tasks:
-                if task.due_datetime and not task.completed:
+            for item in overdue_tasks:
+                if isinstance(item, TaskOccurrence):
+                    self.notification_manager.show_overdue_notification(
+                        item.effective_title, item.effective_due_at, item.task_id
+                    )
+                else:
                     self.notification_manager.show_overdue_notification(
-                        task.title, task.due_datetime, task.id
+                        item.title, item.due_at, item.id
                     )
             
             if overdue_tasks:
                 logger.debug(f"Найдено {len(overdue_tasks)} просроченных задач")
-                
+        
         except Exception as e:
-            logger.error(f"Ошибка проверки просроченных задач: {e}")
+            logger.error(f"Ошибка уведомления о просроченных задачах: {e}")
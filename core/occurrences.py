@@ -0,0 +1,133 @@
+"""
+Движок материализации экземпляров повторяющихся задач
+Разворачивает правила повторения в task_occurrences до горизонта планирования
+"""
+
+import logging
+from datetime import datetime, date, time, timedelta
+from typing import Optional
+
+from .models import Task, ExpansionState
+from .recurrence import expand_rule
+
+logger = logging.getLogger(__name__)
+
+
+def get_recurrence_start(task: Task) -> datetime:
+    """Получить начало повторения задачи (dtstart)"""
+    if task.recurrence_start:
+        return task.recurrence_start
+    if task.due_at:
+        return task.due_at
+    return datetime.combine(task.created_at.date(), time())
+
+
+class OccurrenceExpander:
+    """
+    Инкрементальное разворачивание повторяющихся задач в экземпляры
+    
+    Хранит для каждой задачи правило, начало повторения и дату, до которой
+    она развернута (таблица occurrence_expansion). Полностью пересчитываются
+    только новые задачи и задачи с измененным правилом или началом повторения,
+    остальные лишь продлеваются до горизонта.
+    """
+    
+    def __init__(self, database, horizon_days: int = 90, grace_minutes: int = 10):
+        self.database = database
+        self.horizon_days = horizon_days
+        self.grace_minutes = grace_minutes
+        self.horizon_end = date.today() + timedelta(days=horizon_days)
+    
+    def sync(self) -> int:
+        """
+        Развернуть новые и измененные задачи и продлить остальные до горизонта
+        
+        Returns:
+            Количество обработанных задач
+        """
+        self.database.purge_non_recurring_expansions()
+        return self._expand_until(self.horizon_end)
+    
+    def ensure_horizon(self, target_date: date) -> int:
+        """
+        Лениво продлить горизонт, если пользователь ушел за его пределы
+        
+        Returns:
+            Количество обработанных задач
+        """
+        if target_date <= self.horizon_end:
+            return 0
+        
+        self.horizon_end = target_date + timedelta(days=self.horizon_days)
+        logger.debug(f"Горизонт разворачивания продлен до {self.horizon_end}")
+        return self._expand_until(self.horizon_end)
+    
+    def expand_task(self, task: Task) -> int:
+        """
+        Пересчитать экземпляры одной задачи после ее сохранения
+        
+        Returns:
+            Количество обработанных задач (0 или 1)
+        """
+        if not task.is_recurring:
+            self.database.purge_non_recurring_expansions()
+            return 0
+        return self._expand_until(self.horizon_end, task_id=task.id)
+    
+    def _expand_until(self, until_date: date, task_id: Optional[int] = None) -> int:
+        """Развернуть задачи-кандидаты до until_date одной транзакцией"""
+        candidates = self.database.get_expansion_candidates(until_date, task_id=task_id)
+        if not candidates:
+            return 0
+        
+        exception_dates = self.database.get_recurrence_exception_dates(
+            task.id for task, _ in candidates
+        )
+        
+        with self.database.transaction():
+            for task, state in candidates:
+                self._expand_task(task, state, until_date, exception_dates.get(task.id, set()))
+        
+        logger.debug(f"Развернуто повторяющихся задач: {len(candidates)} (до {until_date})")
+        return len(candidates)
+    
+    def _expand_task(self, task: Task, state: Optional[ExpansionState],
+                     until_date: date, skip_dates: set[date]):
+        """Развернуть одну задачу: полностью или только новый участок окна"""
+        rule_string = task.recurrence_rule.to_rrule_string()
+        dtstart = get_recurrence_start(task)
+        
+        full = (
+            state is None
+            or state.rule != rule_string
+            or state.source_start != dtstart
+        )
+        
+        replace_from = None
+        if state is None:
+            window_start = dtstart
+        elif full:
+            # Прошедшие экземпляры не пересчитываются: заменяется участок
+            # начиная с текущего момента за вычетом льготного периода
+            window_start = max(dtstart, datetime.now() - timedelta(minutes=self.grace_minutes))
+            replace_from = window_start
+            # Не сужаем уже развернутый участок
+            until_date = max(until_date, state.expanded_until)
+        else:
+            window_start = datetime.combine(state.expanded_until + timedelta(days=1), time())
+        
+        window_end = datetime.combine(until_date, time.max)
+        
+        scheduled = [
+            scheduled_at
+            for scheduled_at in expand_rule(task.recurrence_rule, dtstart, window_start, window_end)
+            if scheduled_at.date() not in skip_dates
+        ]
+        
+        self.database.save_occurrences(task.id, scheduled, replace_from=replace_from)
+        self.database.set_expansion_state(ExpansionState(
+            task_id=task.id,
+            rule=rule_string,
+            source_start=dtstart,
+            expanded_until=until_date
+        ))
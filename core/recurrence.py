@@ -0,0 +1,269 @@
+"""
+Разворачивание правил повторения (RRULE) в даты
+Поддерживаемое подмножество: DAILY/WEEKLY/MONTHLY/YEARLY с INTERVAL, BYDAY, UNTIL, COUNT
+Использует векторные вычисления NumPy, если он установлен
+"""
+
+import logging
+from datetime import datetime, date, time, timedelta
+from typing import List, Optional, NamedTuple
+
+from .models import RecurrenceRule, RecurrenceFrequency
+
+logger = logging.getLogger(__name__)
+
+# NumPy импортируется при первом разворачивании, а не при запуске приложения
+# (импорт занимает ~0.1 с); он не обязателен: без него используется чистый Python
+np = None
+_numpy_checked = False
+
+
+def _has_numpy() -> bool:
+    """Импортировать NumPy при первом обращении"""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+        _numpy_checked = True
+    return np is not None
+
+
+def __getattr__(name: str):
+    # HAS_NUMPY вычисляется лениво, чтобы импорт модуля не загружал NumPy
+    if name == "HAS_NUMPY":
+        return _has_numpy()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Порядковый номер 1970-01-01 (начало отсчета datetime64)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Предел поиска для first_occurrences (правило может не срабатывать никогда)
+_MAX_SEARCH_DAYS = 366 * 100
+
+
+class _RuleParams(NamedTuple):
+    """Параметры правила, приведенные к порядковым номерам дней"""
+    frequency: RecurrenceFrequency
+    interval: int
+    start: int  # Порядковый номер дня dtstart
+    week_start: int  # Понедельник недели dtstart
+    month_index: int  # year * 12 + month - 1 для dtstart
+    year: int
+    month: int
+    day: int
+    weekdays: Optional[frozenset]  # BYDAY (0=понедельник), None - не задан
+
+
+def _rule_params(rule: RecurrenceRule, dtstart: datetime) -> _RuleParams:
+    """Подготовить параметры правила (умолчания как в RFC 5545/dateutil)"""
+    start = dtstart.date()
+    weekdays = frozenset(rule.days_of_week) if rule.days_of_week else None
+    if weekdays is None and rule.frequency == RecurrenceFrequency.WEEKLY:
+        weekdays = frozenset((start.weekday(),))
+    
+    return _RuleParams(
+        frequency=rule.frequency,
+        interval=max(rule.interval, 1),
+        start=start.toordinal(),
+        week_start=start.toordinal() - start.weekday(),
+        month_index=start.year * 12 + start.month - 1,
+        year=start.year,
+        month=start.month,
+        day=start.day,
+        weekdays=weekdays
+    )
+
+
+def _day_bounds(rule: RecurrenceRule, dtstart: datetime,
+                window_start: datetime, window_end: datetime) -> tuple[int, int, int]:
+    """
+    Границы перебора в порядковых номерах дней с учетом времени, UNTIL и COUNT
+    
+    Returns:
+        (первый день перебора, последний день перебора, первый день окна)
+    """
+    start_time = dtstart.time()
+    
+    window_low = window_start.toordinal() + (1 if window_start.time() > start_time else 0)
+    window_low = max(window_low, dtstart.toordinal())
+    
+    # COUNT отсчитывается от dtstart, поэтому перебор начинается с него
+    low = dtstart.toordinal() if rule.count else window_low
+    
+    high = window_end.toordinal() - (1 if window_end.time() < start_time else 0)
+    if rule.until_date:
+        high = min(high, rule.until_date.toordinal())
+    
+    return low, high, window_low
+
+
+def _build_numpy_fields(low: int, high: int):
+    """Календарные поля всех дней диапазона [low, high]"""
+    ordinals = np.arange(low, high + 1, dtype=np.int64)
+    days = (ordinals - _EPOCH_ORDINAL).astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    month_index = months.astype(np.int64) + 1970 * 12
+    return {
+        'ordinals': ordinals,
+        'days': days,
+        'weekday': (ordinals - 1) % 7,
+        'month_index': month_index,
+        'year': month_index // 12,
+        'month': month_index % 12 + 1,
+        'day': (days - months.astype('datetime64[D]')).astype(np.int64) + 1,
+    }
+
+
+# Общая таблица календарных полей: (первый день, последний день, поля)
+_fields_cache: Optional[tuple] = None
+
+
+def _numpy_fields(low: int, high: int):
+    """
+    Календарные поля дней окна [low, high]
+    
+    Поля считаются один раз для объединения запрошенных окон, а каждому
+    правилу выдаются срезы (без копирования), что и дает пакетную скорость.
+    """
+    global _fields_cache
+    
+    cached = _fields_cache
+    if cached is None or low < cached[0] or high > cached[1]:
+        base_low, base_high = low, high
+        if cached is not None:
+            base_low, base_high = min(low, cached[0]), max(high, cached[1])
+            if base_high - base_low > _MAX_SEARCH_DAYS:
+                base_low, base_high = low, high
+        cached = (base_low, base_high, _build_numpy_fields(base_low, base_high))
+        _fields_cache = cached
+    
+    start = low - cached[0]
+    stop = high - cached[0] + 1
+    return {name: values[start:stop] for name, values in cached[2].items()}
+
+
+def _numpy_mask(params: _RuleParams, fields):
+    """Маска дней окна, попадающих под правило"""
+    interval = params.interval
+    frequency = params.frequency
+    
+    if params.weekdays is not None:
+        weekday_table = np.zeros(7, dtype=bool)
+        weekday_table[list(params.weekdays)] = True
+        weekday_mask = weekday_table[fields['weekday']]
+    
+    if frequency == RecurrenceFrequency.DAILY:
+        mask = (fields['ordinals'] - params.start) % interval == 0
+        if params.weekdays is not None:
+            mask &= weekday_mask
+    elif frequency == RecurrenceFrequency.WEEKLY:
+        weeks = (fields['ordinals'] - fields['weekday'] - params.week_start) // 7
+        mask = (weeks % interval == 0) & weekday_mask
+    elif frequency == RecurrenceFrequency.MONTHLY:
+        mask = (fields['month_index'] - params.month_index) % interval == 0
+        if params.weekdays is not None:
+            mask &= weekday_mask
+        else:
+            mask &= fields['day'] == params.day
+    else:  # YEARLY
+        mask = (fields['year'] - params.year) % interval == 0
+        if params.weekdays is not None:
+            mask &= weekday_mask
+        else:
+            mask &= (fields['month'] == params.month) & (fields['day'] == params.day)
+    
+    return mask
+
+
+def _python_matches(params: _RuleParams, day: date) -> bool:
+    """Проверить, попадает ли день под правило (fallback без NumPy)"""
+    interval = params.interval
+    frequency = params.frequency
+    weekday = day.weekday()
+    
+    if params.weekdays is not None and weekday not in params.weekdays:
+        return False
+    
+    if frequency == RecurrenceFrequency.DAILY:
+        return (day.toordinal() - params.start) % interval == 0
+    if frequency == RecurrenceFrequency.WEEKLY:
+        return ((day.toordinal() - weekday - params.week_start) // 7) % interval == 0
+    if frequency == RecurrenceFrequency.MONTHLY:
+        if (day.year * 12 + day.month - 1 - params.month_index) % interval:
+            return False
+        return params.weekdays is not None or day.day == params.day
+    # YEARLY
+    if (day.year - params.year) % interval:
+        return False
+    return params.weekdays is not None or (day.month == params.month and day.day == params.day)
+
+
+def expand_dates(rule: RecurrenceRule, dtstart: datetime,
+                 window_start: datetime, window_end: datetime):
+    """
+    Получить дни повторения в окне [window_start, window_end]
+    
+    Returns:
+        numpy.ndarray дней (datetime64[D]) при наличии NumPy, иначе список date
+    """
+    low, high, window_low = _day_bounds(rule, dtstart, window_start, window_end)
+    
+    if high < low:
+        return np.array([], dtype='datetime64[D]') if _has_numpy() else []
+    
+    params = _rule_params(rule, dtstart)
+    
+    if _has_numpy():
+        fields = _numpy_fields(low, high)
+        days = fields['days'][_numpy_mask(params, fields)]
+        if rule.count:
+            days = days[:rule.count]
+            days = days[days >= np.datetime64(date.fromordinal(window_low), 'D')]
+        return days
+    
+    days = []
+    for ordinal in range(low, high + 1):
+        day = date.fromordinal(ordinal)
+        if _python_matches(params, day):
+            days.append(day)
+            if rule.count and len(days) >= rule.count:
+                break
+    if rule.count:
+        days = [day for day in days if day.toordinal() >= window_low]
+    return days
+
+
+def expand_rule(rule: RecurrenceRule, dtstart: datetime,
+                window_start: datetime, window_end: datetime) -> List[datetime]:
+    """
+    Получить даты повторения в окне [window_start, window_end]
+    
+    COUNT отсчитывается от dtstart, поэтому окно может начинаться позже
+    начала повторения без искажения количества.
+    """
+    days = expand_dates(rule, dtstart, window_start, window_end)
+    if _has_numpy():
+        days = days.tolist()
+    
+    start_time = dtstart.time()
+    return [datetime.combine(day, start_time) for day in days]
+
+
+def first_occurrences(rule: RecurrenceRule, dtstart: datetime, limit: int) -> List[datetime]:
+    """Получить первые limit дат повторения начиная с dtstart"""
+    span = 366
+    while True:
+        window_end = datetime.combine(dtstart.date() + timedelta(days=span), time.max)
+        occurrences = expand_rule(rule, dtstart, dtstart, window_end)
+        
+        if len(occurrences) >= limit or span >= _MAX_SEARCH_DAYS:
+            return occurrences[:limit]
+        if rule.count and len(occurrences) >= rule.count:
+            return occurrences
+        if rule.until_date and window_end.date() >= rule.until_date:
+            return occurrences
+        
+        span *= 2
@@ -3,17 +3,43 @@
 Сохранение и загрузка пользовательских предпочтений
 """
 
+import os
 import json
+import atexit
+import base64
+import binascii
 import logging
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, Optional
+
+from PySide6.QtCore import QByteArray
+
 from .resource_manager import ResourceManager
 
 logger = logging.getLogger(__name__)
 
+# Типы, принимаемые для двоичных настроек (геометрия и состояние окна)
+BINARY_TYPES = (bytes, bytearray, memoryview, QByteArray)
+
 
 class Settings:
-    """Управление настройками приложения"""
+    """
+    Управление настройками приложения
+    
+    Значения типизированы по SETTINGS_SCHEMA: двоичные (геометрия окна и т.п.)
+    хранятся в JSON как base64 и возвращаются как bytes. Файл читается при
+    первом обращении, а каждое значение декодируется только когда его запросили.
+    
+    В режиме отложенной записи set() только помечает настройки измененными:
+    все изменения за WRITE_BEHIND_DELAY секунд записываются в файл одним разом
+    (а также при flush() и при завершении процесса).
+    """
+    
+    # Окно объединения записей, секунды
+    WRITE_BEHIND_DELAY = 1.0
     
     DEFAULT_SETTINGS = {
         'language': 'ru',
@@ -28,59 +54,241 @@ class Settings:
         'window_state': None,
     }
     
-    def __init__(self):
+    # Типы значений (None допустимо для всех); настройки вне схемы хранятся как есть
+    SETTINGS_SCHEMA = {
+        'language': str,
+        'theme': str,
+        'start_minimized': bool,
+        'minimize_to_tray': bool,
+        'autostart': bool,
+        'snooze_minutes': int,
+        'expansion_horizon_days': int,
+        'grace_minutes': int,
+        'window_geometry': bytes,
+        'window_state': bytes,
+    }
+    
+    def __init__(self, write_behind: bool = True):
+        """
+        Args:
+            write_behind: Откладывать и объединять запись в файл
+                (False - записывать при каждом изменении)
+        """
         self.settings_file = ResourceManager.get_app_data_dir() / "settings.json"
-        self._settings: Dict[str, Any] = {}
-        self.load()
+        
+        # Значения в виде для JSON (файл читается лениво) и декодированные значения
+        self._stored: Optional[Dict[str, Any]] = None
+        self._values: Dict[str, Any] = {}
+        
+        # Состояние отложенной записи
+        self.write_behind = write_behind
+        self._dirty = False
+        self._batch_depth = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        
+        atexit.register(self.flush)
     
     def load(self) -> None:
         """Загрузить настройки из файла"""
+        with self._lock:
+            self._values = {}
+            try:
+                if self.settings_file.exists():
+                    with open(self.settings_file, 'r', encoding='utf-8') as f:
+                        loaded_settings = json.load(f)
+                    
+                    # Объединяем с настройками по умолчанию
+                    self._stored = {**self._encode_defaults(), **loaded_settings}
+                    logger.info(f"Настройки загружены из {self.settings_file}")
+                else:
+                    self._stored = self._encode_defaults()
+                    logger.info("Используются настройки по умолчанию")
+                    
+            except Exception as e:
+                logger.error(f"Ошибка загрузки настроек: {e}")
+                self._stored = self._encode_defaults()
+    
+    def _ensure_loaded(self) -> Dict[str, Any]:
+        """Прочитать файл при первом обращении к настройкам"""
+        if self._stored is None:
+            self.load()
+        return self._stored
+    
+    def _encode_defaults(self) -> Dict[str, Any]:
+        """Значения по умолчанию в виде для JSON"""
+        return {key: self._encode(key, value) for key, value in self.DEFAULT_SETTINGS.items()}
+    
+    def _coerce(self, key: str, value: Any) -> Any:
+        """
+        Привести значение к типу из схемы
+        
+        Raises:
+            TypeError: Значение не соответствует типу настройки
+        """
+        expected = self.SETTINGS_SCHEMA.get(key)
+        if expected is None or value is None:
+            return value
+        
+        if expected is bytes:
+            # bytes() принимает и число, и список чисел - они двоичными данными не считаются
+            if not isinstance(value, BINARY_TYPES):
+                raise TypeError(f"Настройка {key} должна быть двоичной, получено {type(value).__name__}")
+            return bytes(value.data()) if isinstance(value, QByteArray) else bytes(value)
+        
+        # bool - подкласс int, но число вместо флага (и наоборот) - ошибка
+        if expected is int and isinstance(value, bool):
+            raise TypeError(f"Настройка {key} должна быть числом, получено bool")
+        if not isinstance(value, expected):
+            raise TypeError(
+                f"Настройка {key} должна иметь тип {expected.__name__}, получено {type(value).__name__}"
+            )
+        return value
+    
+    def _encode(self, key: str, value: Any) -> Any:
+        """Значение в виде для JSON"""
+        if value is not None and self.SETTINGS_SCHEMA.get(key) is bytes:
+            return base64.b64encode(value).decode('ascii')
+        return value
+    
+    def _decode(self, key: str, stored: Any) -> Any:
+        """Значение из JSON; некорректное заменяется значением по умолчанию"""
         try:
-            if self.settings_file.exists():
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    loaded_settings = json.load(f)
+            if stored is not None and self.SETTINGS_SCHEMA.get(key) is bytes:
+                return base64.b64decode(stored, validate=True)
+            return self._coerce(key, stored)
+            
+        except (TypeError, ValueError, binascii.Error) as e:
+            logger.warning(f"Некорректное значение настройки {key}, используется значение по умолчанию: {e}")
+            return self.DEFAULT_SETTINGS.get(key)
+    
+    def save(self) -> None:
+        """Сохранить настройки в файл немедленно"""
+        with self._lock:
+            self._ensure_loaded()
+            self._dirty = True
+            self.flush()
+    
+    def flush(self) -> None:
+        """Записать отложенные изменения в файл (атомарно: временный файл и замена)"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            
+            if not self._dirty:
+                return
+            
+            temp_path = None
+            try:
+                # Сериализуем до открытия файла, чтобы ошибка не оставила его пустым
+                content = json.dumps(self._stored, indent=2, ensure_ascii=False)
                 
-                # Объединяем с настройками по умолчанию
-                self._settings = {**self.DEFAULT_SETTINGS, **loaded_settings}
-                logger.info(f"Настройки загружены из {self.settings_file}")
-            else:
-                self._settings = self.DEFAULT_SETTINGS.copy()
-                logger.info("Используются настройки по умолчанию")
+                self.settings_file.parent.mkdir(parents=True, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(
+                    prefix=".settings-", suffix=".tmp", dir=self.settings_file.parent
+                )
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.settings_file)
+                temp_path = None
                 
-        except Exception as e:
-            logger.error(f"Ошибка загрузки настроек: {e}")
-            self._settings = self.DEFAULT_SETTINGS.copy()
+                self._dirty = False
+                logger.info(f"Настройки сохранены в {self.settings_file}")
+                
+            except Exception as e:
+                logger.error(f"Ошибка сохранения настроек: {e}")
+                
+            finally:
+                if temp_path is not None:
+                    Path(temp_path).unlink(missing_ok=True)
     
-    def save(self) -> None:
-        """Сохранить настройки в файл"""
+    @contextmanager
+    def batch(self):
+        """
+        Сгруппировать изменения нескольких настроек в одну запись
+        
+        Пример:
+            with settings.batch():
+                settings.set('window_geometry', geometry)
+                settings.set('window_state', state)
+        """
+        with self._lock:
+            self._batch_depth += 1
         try:
-            self.settings_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self._settings, f, indent=2, ensure_ascii=False)
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._dirty:
+                    self._schedule_flush()
+    
+    def _schedule_flush(self) -> None:
+        """Запланировать запись изменений (вызывается под блокировкой)"""
+        if self._batch_depth > 0:
+            return
+        
+        if not self.write_behind:
+            self.flush()
+            return
+        
+        # Таймер уже взведен: изменение попадет в ту же запись
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.WRITE_BEHIND_DELAY, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Получить значение настройки (тип по SETTINGS_SCHEMA, двоичные - bytes)"""
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
             
-            logger.info(f"Настройки сохранены в {self.settings_file}")
+            stored = self._ensure_loaded()
+            if key not in stored:
+                return default
             
-        except Exception as e:
-            logger.error(f"Ошибка сохранения настроек: {e}")
+            value = self._values[key] = self._decode(key, stored[key])
+            return value
     
-    def get(self, key: str, default: Any = None) -> Any:
-        """Получить значение настройки"""
-        return self._settings.get(key, default)
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Получить двоичное значение (None, если не задано)"""
+        if self.SETTINGS_SCHEMA.get(key) is not bytes:
+            raise TypeError(f"Настройка {key} не является двоичной")
+        return self.get(key)
     
     def set(self, key: str, value: Any) -> None:
-        """Установить значение настройки"""
-        self._settings[key] = value
-        self.save()
+        """
+        Установить значение настройки (запись в файл откладывается)
+        
+        Raises:
+            TypeError: Значение не соответствует типу настройки из схемы
+        """
+        value = self._coerce(key, value)
+        
+        with self._lock:
+            stored = self._ensure_loaded()
+            if key in stored and self.get(key) == value:
+                return
+            
+            self._values[key] = value
+            stored[key] = self._encode(key, value)
+            self._dirty = True
+            self._schedule_flush()
     
     def get_all(self) -> Dict[str, Any]:
         """Получить все настройки"""
-        return self._settings.copy()
+        with self._lock:
+            return {key: self.get(key) for key in self._ensure_loaded()}
     
     def reset_to_defaults(self) -> None:
         """Сбросить настройки к значениям по умолчанию"""
-        self._settings = self.DEFAULT_SETTINGS.copy()
-        self.save()
+        with self._lock:
+            self._stored = self._encode_defaults()
+            self._values = {}
+            self.save()
         logger.info("Настройки сброшены к значениям по умолчанию")
     
     def setup_autostart(self, enabled: bool) -> bool:
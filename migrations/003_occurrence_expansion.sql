@@ -0,0 +1,13 @@
+-- Миграция для инкрементального разворачивания повторяющихся задач
+
+-- Состояние разворачивания каждой повторяющейся задачи
+CREATE TABLE IF NOT EXISTS occurrence_expansion (
+    task_id INTEGER PRIMARY KEY,
+    rule TEXT NOT NULL,  -- RRULE строка, по которой развернуты экземпляры
+    source_updated_at TEXT NOT NULL,  -- tasks.updated_at на момент разворачивания
+    expanded_until TEXT NOT NULL,  -- YYYY-MM-DD, последняя развернутая дата
+    FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
+);
+
+-- Индекс для продления горизонта
+CREATE INDEX IF NOT EXISTS idx_expansion_until ON occurrence_expansion(expanded_until);
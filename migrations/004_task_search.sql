@@ -0,0 +1,33 @@
+-- Миграция для полнотекстового поиска по задачам
+
+-- Индекс FTS5 по названию и заметкам (содержимое хранится в tasks)
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title,
+    notes,
+    content='tasks',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+-- Ранжирование: совпадение в названии весит больше, чем в заметках
+INSERT INTO tasks_fts (tasks_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)');
+
+-- Синхронизация индекса с таблицей задач
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, title, notes) VALUES (new.id, new.title, new.notes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, notes) VALUES ('delete', old.id, old.title, old.notes);
+END;
+
+-- Смена статуса и времени не трогает индекс: только изменение названия или заметок
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, notes ON tasks
+WHEN old.title IS NOT new.title OR old.notes IS NOT new.notes BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, notes) VALUES ('delete', old.id, old.title, old.notes);
+    INSERT INTO tasks_fts (rowid, title, notes) VALUES (new.id, new.title, new.notes);
+END;
+
+-- Индексируем уже существующие задачи
+INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild');
@@ -0,0 +1,11 @@
+-- Миграция для быстрой проверки просроченных задач
+
+-- Частичные индексы только по невыполненным задачам: проверка просрочки
+-- сводится к диапазонному сканированию по времени выполнения
+CREATE INDEX IF NOT EXISTS idx_tasks_pending_due ON tasks(due_at)
+WHERE status = 'pending';
+
+-- Для экземпляров время выполнения - переопределенное или запланированное
+CREATE INDEX IF NOT EXISTS idx_occurrences_pending_due
+ON task_occurrences(COALESCE(override_due_at, scheduled_at))
+WHERE status = 'pending';
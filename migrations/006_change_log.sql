@@ -0,0 +1,74 @@
+-- Миграция для журнала изменений (уведомление других процессов об изменениях)
+
+-- Журнал заполняется триггерами в той же транзакции, что и сами изменения,
+-- поэтому его видят все процессы, работающие с файлом базы данных.
+-- AUTOINCREMENT гарантирует, что номер seq не используется повторно
+-- даже после очистки старых записей
+CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,  -- task_lists, tasks, task_occurrences
+    row_id INTEGER NOT NULL,
+    operation TEXT NOT NULL,  -- insert, update, delete
+    day TEXT  -- YYYY-MM-DD затронутого дня, NULL - изменение затрагивает несколько дней
+);
+
+-- Списки задач
+CREATE TRIGGER IF NOT EXISTS task_lists_log_insert AFTER INSERT ON task_lists BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('task_lists', new.id, 'insert', new.date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_lists_log_update AFTER UPDATE ON task_lists BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('task_lists', new.id, 'update', new.date);
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    SELECT 'task_lists', old.id, 'update', old.date WHERE old.date IS NOT new.date;
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_lists_log_delete AFTER DELETE ON task_lists BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('task_lists', old.id, 'delete', old.date);
+END;
+
+-- Задачи: день списка; повторяющаяся задача видна на многих днях (NULL)
+CREATE TRIGGER IF NOT EXISTS tasks_log_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('tasks', new.id, 'insert', CASE WHEN new.recurrence_rule IS NULL
+        THEN (SELECT date FROM task_lists WHERE id = new.list_id) END);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_log_update AFTER UPDATE ON tasks BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('tasks', new.id, 'update', CASE WHEN new.recurrence_rule IS NULL AND old.recurrence_rule IS NULL
+        THEN (SELECT date FROM task_lists WHERE id = new.list_id) END);
+    -- Задача перенесена в другой список: изменились оба дня
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    SELECT 'tasks', old.id, 'update', (SELECT date FROM task_lists WHERE id = old.list_id)
+    WHERE old.list_id IS NOT new.list_id
+        AND new.recurrence_rule IS NULL AND old.recurrence_rule IS NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_log_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('tasks', old.id, 'delete', CASE WHEN old.recurrence_rule IS NULL
+        THEN (SELECT date FROM task_lists WHERE id = old.list_id) END);
+END;
+
+-- Экземпляры повторяющихся задач: день по запланированному времени
+CREATE TRIGGER IF NOT EXISTS task_occurrences_log_insert AFTER INSERT ON task_occurrences BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('task_occurrences', new.id, 'insert', substr(new.scheduled_at, 1, 10));
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_occurrences_log_update AFTER UPDATE ON task_occurrences BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('task_occurrences', new.id, 'update', substr(new.scheduled_at, 1, 10));
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    SELECT 'task_occurrences', old.id, 'update', substr(old.scheduled_at, 1, 10)
+    WHERE substr(old.scheduled_at, 1, 10) IS NOT substr(new.scheduled_at, 1, 10);
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_occurrences_log_delete AFTER DELETE ON task_occurrences BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('task_occurrences', old.id, 'delete', substr(old.scheduled_at, 1, 10));
+END;
@@ -0,0 +1,31 @@
+-- Миграция для журнала изменений: одна запись на разворачивание задачи
+
+-- Разворачивание вставляет и удаляет экземпляры сотнями: построчная запись
+-- в журнал переполняла ленту изменений (полная перезагрузка). Вставка и
+-- удаление экземпляров теперь отражаются одной записью на задачу
+-- (состояние разворачивания) или на дату (исключение повторения).
+-- Изменения отдельных экземпляров пользователем по-прежнему записываются построчно.
+DROP TRIGGER IF EXISTS task_occurrences_log_insert;
+DROP TRIGGER IF EXISTS task_occurrences_log_delete;
+
+-- Задача развернута заново или до нового горизонта: затронуто много дней (NULL)
+CREATE TRIGGER IF NOT EXISTS occurrence_expansion_log_insert AFTER INSERT ON occurrence_expansion BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('occurrence_expansion', new.task_id, 'insert', NULL);
+END;
+
+CREATE TRIGGER IF NOT EXISTS occurrence_expansion_log_update AFTER UPDATE ON occurrence_expansion BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('occurrence_expansion', new.task_id, 'update', NULL);
+END;
+
+CREATE TRIGGER IF NOT EXISTS occurrence_expansion_log_delete AFTER DELETE ON occurrence_expansion BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('occurrence_expansion', old.task_id, 'delete', NULL);
+END;
+
+-- Пропущенная дата повторения: экземпляр задачи удален с одного дня
+CREATE TRIGGER IF NOT EXISTS recurrence_exceptions_log_insert AFTER INSERT ON recurrence_exceptions BEGIN
+    INSERT INTO change_log (table_name, row_id, operation, day)
+    VALUES ('recurrence_exceptions', new.task_id, 'insert', new.exception_date);
+END;
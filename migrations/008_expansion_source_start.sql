@@ -0,0 +1,15 @@
+-- Миграция: состояние разворачивания хранит начало повторения вместо updated_at
+
+-- Любое сохранение задачи (например, смена статуса) меняло updated_at и
+-- вызывало полное переразворачивание. Экземпляры зависят только от правила
+-- и начала повторения, поэтому сравнивается начало повторения (dtstart).
+ALTER TABLE occurrence_expansion RENAME COLUMN source_updated_at TO source_start;
+
+-- Состояния, совпадающие с задачей, остаются актуальными: переносим в них
+-- начало повторения (recurrence_start, due_at или полночь дня создания)
+UPDATE occurrence_expansion
+SET source_start = (
+    SELECT COALESCE(t.recurrence_start, t.due_at, substr(t.created_at, 1, 10) || 'T00:00:00')
+    FROM tasks t WHERE t.id = occurrence_expansion.task_id
+)
+WHERE source_start = (SELECT t.updated_at FROM tasks t WHERE t.id = occurrence_expansion.task_id);
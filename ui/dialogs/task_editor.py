@@ -9,12 +9,13 @@ from typing import Optional
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QTextEdit,
     QDateEdit, QTimeEdit, QCheckBox, QComboBox, QPushButton, QGroupBox,
-    QLabel, QListWidget, QMessageBox, QSpinBox, QButtonGroup, QRadioButton
+    QLabel, QListWidget, QMessageBox, QSpinBox, QButtonGroup, QRadioButton, QWidget
 )
 from PySide6.QtCore import Qt, QDate, QTime, Signal
 from PySide6.QtGui import QFont
 
 from core.models import Task, TaskOccurrence, RecurrenceRule, RecurrenceFrequency, TaskStatus, validate_task, validate_recurrence_rule
+from core.recurrence import first_occurrences
 
 logger = logging.getLogger(__name__)
 
@@ -426,51 +427,21 @@ class TaskEditorDialog(QDialog):
             if not rule:
                 return
             
-            # Генерируем предварительный просмотр
-            from dateutil.rrule import rrule, DAILY, WEEKLY, MONTHLY, YEARLY
-            from dateutil.rrule import MO, TU, WE, TH, FR, SA, SU
-            
             # Получаем начальную дату
             start_date = self.date_input.date().toPython()
             start_time = self.time_input.time().toPython() if self.has_time_checkbox.isChecked() else time(9, 0)
             start_datetime = datetime.combine(start_date, start_time)
             
-            # Создаем rrule
-            freq_map = {
-                RecurrenceFrequency.DAILY: DAILY,
-                RecurrenceFrequency.WEEKLY: WEEKLY,
-                RecurrenceFrequency.MONTHLY: MONTHLY,
-                RecurrenceFrequency.YEARLY: YEARLY
-            }
-            
-            rrule_kwargs = {
-                'freq': freq_map[rule.frequency],
-                'interval': rule.interval,
-                'dtstart': start_datetime
-            }
-            
-            if rule.days_of_week:
-                weekdays = [MO, TU, WE, TH, FR, SA, SU]
-                rrule_kwargs['byweekday'] = [weekdays[day] for day in rule.days_of_week]
-            
-            if rule.until_date:
-                rrule_kwargs['until'] = datetime.combine(rule.until_date, time(23, 59, 59))
-            elif rule.count:
-                rrule_kwargs['count'] = min(rule.count, 10)  # Ограничиваем предварительный просмотр
-            else:
-                rrule_kwargs['count'] = 10  # Показываем первые 10 повторений
-            
-            # Генерируем даты
-            rule_obj = rrule(**rrule_kwargs)
-            dates = list(rule_obj)
+            # Генерируем первые 10 повторений
+            dates = first_occurrences(rule, start_datetime, 10)
             
             # Обновляем список предварительного просмотра
             self.preview_list.clear()
             for dt in dates[:10]:  # Показываем максимум 10 дат
                 if self.has_time_checkbox.isChecked():
-                    date_str = dt.strftime("%d.%m.%Y %H:%M")
+                    date_str = self.localization.dates.format_datetime(dt)
                 else:
-                    date_str = dt.strftime("%d.%m.%Y")
+                    date_str = self.localization.dates.format_short_date(dt.date())
                 self.preview_list.addItem(date_str)
             
         except Exception as e:
@@ -3,8 +3,9 @@
 """
 
 import logging
-from datetime import date, datetime
-from typing import Optional
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import Any, Callable, List, Optional, Dict, Set, Tuple
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QSplitter,
@@ -18,59 +19,138 @@ from core.localization import Localization
 from core.settings import Settings
 from core.resource_manager import ResourceManager
 from core.models import Task, TaskList, TaskOccurrence
+from core.occurrences import OccurrenceExpander
+from core.day_cache import DayCache, DayEntry, load_day
+from core.async_repository import AsyncRepository
+from core.change_feed import ChangeFeed
+from core.notifications import ReminderScheduler, reminder_key
 
 from .widgets.calendar_widget import CalendarWidget
-from .widgets.task_list import TaskListWidget
+from .widgets.task_list import TaskListWidget, task_key
 from .widgets.toolbar import MainToolBar, StatusToolBar
 from .dialogs.task_editor import TaskEditorDialog
 
 logger = logging.getLogger(__name__)
 
 
+# Фоновое изображение декодируется один раз на процесс (фон окна и иконка приложения)
+_background_pixmap: Optional[QPixmap] = None
+
+
+def load_background_pixmap() -> Optional[QPixmap]:
+    """Получить фоновое изображение (None, если файл не найден)"""
+    global _background_pixmap
+    if _background_pixmap is None:
+        bg_path = ResourceManager.get_resource_path("resources/images/background.png")
+        if bg_path and bg_path.exists():
+            _background_pixmap = QPixmap(str(bg_path))
+    return _background_pixmap
+
+
 class BackgroundWidget(QWidget):
-    """Виджет с фоновым изображением"""
+    """
+    Виджет с фоновым изображением
+    
+    Масштабированное и уже полупрозрачное изображение размером с виджет
+    кэшируется: перерисовка (например, при наведении на строки задач) - это
+    только копирование готового пиксмапа. Во время изменения размера
+    используется быстрое масштабирование, после остановки - сглаженное.
+    """
+    
+    # Прозрачность фона (очень слабый фон)
+    OPACITY = 0.1
+    
+    # Пауза после последнего изменения размера до сглаженного масштабирования
+    RESIZE_SETTLE_MS = 150
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, load_image: bool = True):
+        """
+        Args:
+            load_image: Сразу загрузить изображение (False - позже через load_background)
+        """
         super().__init__(parent)
         self.background_pixmap = None
-        self.load_background()
+        
+        # Готовый фон для текущего размера и признак сглаженного масштабирования
+        self._scaled_background: Optional[QPixmap] = None
+        self._scaled_smooth = False
+        
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(self.RESIZE_SETTLE_MS)
+        self._resize_timer.timeout.connect(self._on_resize_settled)
+        
+        if load_image:
+            self.load_background()
     
     def load_background(self):
         """Загрузить фоновое изображение"""
         try:
-            bg_path = ResourceManager.get_resource_path("resources/images/background.png")
-            if bg_path and bg_path.exists():
-                self.background_pixmap = QPixmap(str(bg_path))
+            self.background_pixmap = load_background_pixmap()
+            if self.background_pixmap is not None:
+                self._scaled_background = None
+                self.update()
                 logger.debug("Фоновое изображение загружено")
             else:
                 logger.warning("Фоновое изображение не найдено")
         except Exception as e:
             logger.error(f"Ошибка загрузки фонового изображения: {e}")
     
+    def _render_background(self, smooth: bool) -> QPixmap:
+        """Масштабировать фон под размер виджета, обрезать по центру и наложить прозрачность"""
+        ratio = self.devicePixelRatioF()
+        target_size = self.size() * ratio
+        
+        # Масштабируем изображение с сохранением пропорций
+        mode = Qt.TransformationMode.SmoothTransformation if smooth else Qt.TransformationMode.FastTransformation
+        scaled_pixmap = self.background_pixmap.scaled(
+            target_size, Qt.AspectRatioMode.KeepAspectRatioByExpanding, mode
+        )
+        
+        result = QPixmap(target_size)
+        result.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(result)
+        painter.setOpacity(self.OPACITY)
+        # Центрируем изображение
+        painter.drawPixmap(
+            (target_size.width() - scaled_pixmap.width()) // 2,
+            (target_size.height() - scaled_pixmap.height()) // 2,
+            scaled_pixmap
+        )
+        painter.end()
+        
+        result.setDevicePixelRatio(ratio)
+        return result
+    
+    def resizeEvent(self, event):
+        """Изменение размера: фон пересчитывается быстро, сглаженный - после паузы"""
+        super().resizeEvent(event)
+        self._scaled_background = None
+        
+        # Первая раскладка до показа окна сразу рисуется со сглаживанием
+        if self.isVisible():
+            self._resize_timer.start()
+    
+    def _on_resize_settled(self):
+        """Размер перестал меняться: пересчитать фон со сглаживанием"""
+        if not self._scaled_smooth:
+            self._scaled_background = None
+            self.update()
+    
     def paintEvent(self, event):
         """Отрисовка фонового изображения"""
         super().paintEvent(event)
         
-        if self.background_pixmap:
+        if self.background_pixmap and not self.background_pixmap.isNull():
             try:
-                painter = QPainter(self)
-                painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-                
-                # Масштабируем изображение с сохранением пропорций
-                scaled_pixmap = self.background_pixmap.scaled(
-                    self.size(),
-                    Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                
-                # Центрируем изображение
-                x = (self.width() - scaled_pixmap.width()) // 2
-                y = (self.height() - scaled_pixmap.height()) // 2
-                
-                # Устанавливаем прозрачность
-                painter.setOpacity(0.1)  # Очень слабый фон
-                painter.drawPixmap(x, y, scaled_pixmap)
+                if self._scaled_background is None:
+                    self._scaled_smooth = not self._resize_timer.isActive()
+                    self._scaled_background = self._render_background(self._scaled_smooth)
                 
+                painter = QPainter(self)
+                painter.drawPixmap(0, 0, self._scaled_background)
+            
             except Exception as e:
                 logger.error(f"Ошибка отрисовки фона: {e}")
 
@@ -81,36 +161,125 @@ class MainWindow(QMainWindow):
     # Сигналы
     closing = Signal()
     
-    def __init__(self, database: Database, localization: Localization, settings: Settings, parent=None):
+    # Максимум результатов поиска по всем датам
+    SEARCH_RESULTS_LIMIT = 200
+    
+    # Кэш загруженных дней и радиус предзагрузки соседних дней
+    DAY_CACHE_SIZE = 32
+    PREFETCH_DAYS = 1
+    
+    # Период проверки изменений базы данных
+    REFRESH_INTERVAL_MS = 60000
+    
+    def __init__(self, database: Database, localization: Localization, settings: Settings, parent=None,
+                 deferred_startup: bool = False):
+        """
+        Args:
+            deferred_startup: Отложить работу, не нужную для первого кадра
+                (вызывающий запускает finish_startup() после первой отрисовки)
+        """
         super().__init__(parent)
         
         self.database = database
         self.localization = localization
         self.settings = settings
+        self.deferred_startup = deferred_startup
+        self._startup_finished = False
         
         self.current_date = date.today()
         self.current_task_list: Optional[TaskList] = None
-        self.current_tasks = []
+        
+        # Разворачивание повторяющихся задач до горизонта планирования
+        self.occurrence_expander = OccurrenceExpander(
+            self.database,
+            self.settings.get('expansion_horizon_days', 90),
+            self.settings.get('grace_minutes', 10)
+        )
+        
+        # Поток базы данных для загрузки и записи без блокировки интерфейса
+        self.repository = AsyncRepository(self.database, self)
+        
+        # LRU-кэш дней (соседние дни предзагружаются в потоке базы данных)
+        self.day_cache = DayCache(self.DAY_CACHE_SIZE)
+        
+        self.change_feed = None
+        # Признак изменения данных (читается только в потоке базы данных:
+        # PRAGMA data_version у каждого соединения свой)
+        self._change_token = None
+        self._search_query: Optional[str] = None
+        self.reminder_scheduler: Optional[ReminderScheduler] = None
+        
+        # Периодическая проверка изменений (день перечитывается, только если база изменилась)
+        self.refresh_timer = QTimer()
+        self.refresh_timer.timeout.connect(self.check_for_changes)
         
         self.setup_ui()
         self.setup_menu()
         self.connect_signals()
-        self.load_current_date_tasks()
-        self.apply_theme()
+        self.load_initial_day()
         self.restore_geometry()
         
-        # Таймер для обновления данных
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.refresh_data)
-        self.refresh_timer.start(60000)  # Обновляем каждую минуту
+        if not deferred_startup:
+            self.finish_startup()
+    
+    def finish_startup(self):
+        """
+        Завершить запуск: работа, не нужная для первого кадра
+        
+        Тема, фон, разворачивание повторяющихся задач (с импортом NumPy),
+        обслуживание базы данных, счетчики календаря и отслеживание изменений.
+        """
+        if self._startup_finished:
+            return
+        
+        self.apply_theme()
+        if self.deferred_startup:
+            self.centralWidget().load_background()
+        
+        self.calendar_widget.set_task_counts_provider(self.get_task_counts)
+        self._startup_finished = True
+        
+        # Обслуживание базы данных - в ее потоке, после загрузки текущего дня
+        self.repository.submit(
+            self._run_startup_maintenance,
+            on_result=self.on_startup_maintenance_done,
+            on_error=lambda e: self.on_startup_maintenance_done((0, 0, None)),
+            background=True
+        )
+    
+    def _run_startup_maintenance(self) -> Tuple[int, int, Optional[Tuple[int, int]]]:
+        """
+        Обслуживание базы данных при запуске (в потоке базы данных)
+        
+        Returns:
+            (обработано повторяющихся задач, удалено списков задач, признак изменения данных)
+        """
+        expanded = self.expand_recurring_tasks()
+        removed = self.compact_task_lists()
+        return expanded, removed, self._read_change_token()
+    
+    def on_startup_maintenance_done(self, result: Tuple[int, int, Optional[Tuple[int, int]]]):
+        """Обработка обслуживания при запуске: перечитать день и начать отслеживать изменения"""
+        expanded, removed, token = result
+        if expanded or removed:
+            # Могли появиться экземпляры повторяющихся задач, а показанный пустой
+            # список - быть удален: день перечитывается без кэша
+            self.day_cache.clear()
+            self.calendar_widget.invalidate_task_counts()
+            self.load_current_date_tasks(quiet=True)
+        
+        # Изменения, сделанные обслуживанием, не считаются внешними
+        self._change_token = token
+        self.start_change_feed()
+        self.refresh_timer.start(self.REFRESH_INTERVAL_MS)
     
     def setup_ui(self):
         """Настройка интерфейса"""
         self.setWindowTitle(self.localization.get_text("app.title"))
         self.setMinimumSize(900, 600)
         
-        # Центральный виджет с фоном
-        central_widget = BackgroundWidget()
+        # Центральный виджет с фоном (при отложенном запуске изображение загружается позже)
+        central_widget = BackgroundWidget(load_image=not self.deferred_startup)
         self.setCentralWidget(central_widget)
         
         # Основной layout
@@ -137,10 +306,12 @@ class MainWindow(QMainWindow):
         
         # Панель инструментов
         self.toolbar = MainToolBar(self.localization)
+        self.toolbar.setObjectName("main_toolbar")  # имя нужно для saveState/restoreState
         self.addToolBar(self.toolbar)
         
         # Статусная строка
         self.status_toolbar = StatusToolBar(self.localization)
+        self.status_toolbar.setObjectName("status_toolbar")
         self.addToolBar(Qt.ToolBarArea.BottomToolBarArea, self.status_toolbar)
         
         logger.debug("Интерфейс главного окна настроен")
@@ -208,7 +379,7 @@ class MainWindow(QMainWindow):
             help_menu.addAction(about_action)
             
             logger.debug("Меню настроено")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка настройки меню: {e}")
     
@@ -223,6 +394,7 @@ class MainWindow(QMainWindow):
             self.task_list_widget.task_edit_requested.connect(self.edit_task)
             self.task_list_widget.task_delete_requested.connect(self.delete_task)
             self.task_list_widget.add_task_requested.connect(self.add_task)
+            self.task_list_widget.global_search_requested.connect(self.on_global_search_requested)
             
             # Панель инструментов
             self.toolbar.add_task_requested.connect(self.add_task)
@@ -234,10 +406,15 @@ class MainWindow(QMainWindow):
             self.toolbar.refresh_requested.connect(self.refresh_data)
             
             logger.debug("Сигналы подключены")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка подключения сигналов: {e}")
     
+    @property
+    def current_tasks(self) -> List:
+        """Задачи и экземпляры текущей даты (хранятся в списке задач)"""
+        return self.task_list_widget.tasks
+    
     def on_date_selected(self, selected_date: date):
         """Обработка выбора даты в календаре"""
         try:
@@ -246,68 +423,358 @@ class MainWindow(QMainWindow):
                 self.load_current_date_tasks()
                 self.update_status()
                 logger.debug(f"Выбрана дата: {selected_date}")
-                
+        
         except Exception as e:
             logger.error(f"Ошибка обработки выбора даты: {e}")
     
-    def load_current_date_tasks(self):
-        """Загрузить задачи для текущей даты"""
+    def get_task_counts(self, start_date: date, end_date: date,
+                        on_result: Callable[[Dict[date, int]], None]):
+        """Запросить количество задач по дням для выделения в календаре (ответ - в потоке GUI)"""
+        self.repository.submit(
+            self._read_task_counts, start_date, end_date,
+            on_result=on_result,
+            on_error=lambda e: logger.error(f"Ошибка получения количества задач по дням: {e}")
+        )
+    
+    def _read_task_counts(self, start_date: date, end_date: date) -> Dict[date, int]:
+        """Прочитать количество задач по дням в потоке базы данных (с продлением горизонта)"""
+        self.occurrence_expander.ensure_horizon(end_date)
+        return self.database.get_task_counts_by_date(start_date, end_date)
+    
+    def expand_recurring_tasks(self) -> int:
+        """
+        Развернуть новые и измененные повторяющиеся задачи до горизонта (в потоке базы данных)
+        
+        Returns:
+            Количество обработанных задач
+        """
+        try:
+            expanded = self.occurrence_expander.sync()
+            logger.debug(f"Синхронизировано повторяющихся задач: {expanded}")
+            return expanded
+        
+        except Exception as e:
+            logger.error(f"Ошибка разворачивания повторяющихся задач: {e}")
+            return 0
+    
+    def compact_task_lists(self) -> int:
+        """
+        Удалить пустые списки задач, созданные простым просмотром дат, и старый журнал изменений
+        (в потоке базы данных)
+        
+        Returns:
+            Количество удаленных списков задач
+        """
         try:
-            self.status_toolbar.set_status(self.localization.get_text("status.loading"))
+            # Транзакция: удаления не вернутся процессу через ленту изменений
+            with self.database.transaction():
+                removed = self.database.delete_empty_task_lists()
+            if removed:
+                logger.info(f"Удалено пустых списков задач: {removed}")
             
-            # Получаем или создаем список задач для даты
-            self.current_task_list = self.database.get_task_list_by_date(self.current_date)
-            if not self.current_task_list:
-                self.current_task_list = TaskList(date=self.current_date)
-                list_id = self.database.create_task_list(self.current_task_list)
-                self.current_task_list.id = list_id
+            pruned = self.database.prune_change_log()
+            if pruned:
+                logger.debug(f"Удалено записей журнала изменений: {pruned}")
+            return removed
+        
+        except Exception as e:
+            logger.error(f"Ошибка удаления пустых списков задач: {e}")
+            return 0
+    
+    def set_reminder_scheduler(self, scheduler: ReminderScheduler):
+        """Подключить планировщик напоминаний (создается после первой отрисовки окна)"""
+        self.reminder_scheduler = scheduler
+        scheduler.sync_day(self.current_date, self.task_list_widget.tasks)
+    
+    def start_change_feed(self):
+        """Следить за изменениями базы данных из других процессов"""
+        self.change_feed = None
+        try:
+            self.change_feed = ChangeFeed(self.database, self, repository=self.repository)
+            self.change_feed.changes_available.connect(self.on_database_changes)
+            self.change_feed.changes_lost.connect(self.on_database_changes_lost)
+            self.change_feed.start()
+        
+        except Exception as e:
+            logger.error(f"Ошибка запуска ленты изменений: {e}")
+    
+    def on_database_changes(self, changes: List):
+        """
+        Применить изменения других процессов из журнала: в кэше сбрасываются
+        затронутые дни, в показанном дне перечитываются только измененные строки
+        """
+        days = {change.day for change in changes}
+        
+        # Изменение без дня (повторяющаяся задача) затрагивает любой день
+        if None in days:
+            self.day_cache.clear()
+        else:
+            self.day_cache.discard(days)
+        self.calendar_widget.invalidate_task_counts()
+        
+        if None not in days and self.current_date not in days:
+            return
+        
+        # Скрытое окно перечитает день при показе (check_for_changes)
+        if not self.isVisible() or self.isMinimized():
+            return
+        
+        self.update_change_token()
+        if None in days:
+            # Экземпляры повторяющейся задачи пересчитаны: день перечитывается целиком
+            self.load_current_date_tasks(quiet=True)
+            return
+        
+        target_date = self.current_date
+        self.repository.submit(
+            self._read_day_changes, target_date,
+            [change for change in changes if change.day == target_date],
+            on_result=partial(self.on_day_changes_loaded, target_date),
+            on_error=self.on_load_failed
+        )
+    
+    def _read_day_changes(self, target_date: date, changes: List) -> Tuple[
+            Optional[TaskList], List[Tuple[tuple, object]], Set[int]]:
+        """
+        Прочитать измененные строки дня в потоке базы данных
+        
+        Returns:
+            (список задач дня, [(ключ задачи, задача или None, если ее больше нет на дне)],
+            ID задач, экземпляры которых удалены с дня исключением повторения)
+        """
+        task_list = self.database.get_task_list_by_date(target_date)
+        list_id = task_list.id if task_list else None
+        
+        updates = []
+        for task_id in sorted({c.row_id for c in changes if c.table_name == 'tasks'}):
+            task = self.database.get_task_by_id(task_id)
+            on_day = task is not None and list_id is not None and task.list_id == list_id
+            updates.append(((False, task_id), task if on_day else None))
+        
+        for occurrence_id in sorted({c.row_id for c in changes if c.table_name == 'task_occurrences'}):
+            occurrence = self.database.get_occurrence_by_id(occurrence_id)
+            on_day = occurrence is not None and occurrence.scheduled_at.date() == target_date
+            updates.append(((True, occurrence_id), occurrence if on_day else None))
+        
+        skipped_task_ids = {c.row_id for c in changes if c.table_name == 'recurrence_exceptions'}
+        return task_list, updates, skipped_task_ids
+    
+    def on_day_changes_loaded(self, target_date: date, result: Tuple[
+            Optional[TaskList], List[Tuple[tuple, object]], Set[int]]):
+        """Применить измененные строки к показанному дню"""
+        # Пользователь перешел на другую дату: день уже сброшен в кэше
+        if target_date != self.current_date:
+            return
+        
+        task_list, updates, skipped_task_ids = result
+        current = {task_key(item): item for item in self.task_list_widget.tasks}
+        
+        # Экземпляры задач, лежащих в списке дня, не показываются (как в load_day)
+        own_task_ids = {key[1] for key in current if not key[0]}
+        own_task_ids.update(key[1] for key, item in updates if not key[0] and item is not None)
+        own_task_ids.difference_update(key[1] for key, item in updates if not key[0] and item is None)
+        
+        for key, item in updates:
+            if isinstance(item, TaskOccurrence) and item.task_id in own_task_ids:
+                item = None
             
-            # Загружаем задачи
-            tasks = []
-            if self.current_task_list.id:
-                tasks = self.database.get_tasks_by_list_id(self.current_task_list.id)
+            if item is None:
+                if key in current:
+                    self._remove_changed_item(current[key])
+            elif key in current:
+                self.task_list_widget.update_task(item)
+            else:
+                self.task_list_widget.add_task(item)
             
-            # TODO: Добавить загрузку экземпляров повторяющихся задач для этой даты
+            if item is not None and self.reminder_scheduler is not None:
+                self.reminder_scheduler.update_item_reminder(item, target_date)
+        
+        for item in current.values():
+            if isinstance(item, TaskOccurrence) and item.task_id in skipped_task_ids:
+                self._remove_changed_item(item)
+        
+        if task_list is not None:
+            self.current_task_list = task_list
+        elif self.current_task_list.id is not None:
+            # Список удален другим процессом: новые задачи создадут его заново
+            self.current_task_list = TaskList(date=target_date)
+        self.task_list_widget.set_list_title(self.current_task_list.title)
+        
+        self.update_status()
+        self.refresh_day_cache()
+        logger.debug(f"Применено изменений дня {target_date}: {len(updates)}")
+    
+    def _remove_changed_item(self, item):
+        """Убрать из показанного дня задачу, удаленную или перенесенную другим процессом"""
+        self.task_list_widget.remove_task(item)
+        if self.reminder_scheduler is not None:
+            self.reminder_scheduler.cancel_reminder(reminder_key(item))
+    
+    def on_database_changes_lost(self):
+        """Журнал не покрывает пропущенные изменения: полная перезагрузка"""
+        if self.isVisible() and not self.isMinimized():
+            self.refresh_data(quiet=True)
+        else:
+            self.day_cache.clear()
+            self.calendar_widget.invalidate_task_counts()
+    
+    def load_initial_day(self):
+        """Показать текущий день сразу (несколько запросов по индексам): первый кадр - со списком задач"""
+        try:
+            self.display_day(self.current_date, *load_day(self.database, self.current_date))
+        
+        except Exception as e:
+            logger.error(f"Ошибка загрузки текущего дня: {e}")
+            self.load_current_date_tasks()
+    
+    def load_current_date_tasks(self, quiet: bool = False):
+        """
+        Загрузить задачи для текущей даты (из кэша сразу, из базы данных - в фоне)
+        
+        Args:
+            quiet: Перечитать уже показанный день без индикации загрузки
+        """
+        try:
+            target_date = self.current_date
+            cached = self.day_cache.get(target_date)
+            if cached is not None:
+                self.display_day(target_date, *cached)
+                return
             
-            self.current_tasks = tasks
-            self.task_list_widget.set_tasks(tasks)
-            self.task_list_widget.set_list_title(self.current_task_list.title)
+            if not quiet:
+                self.status_toolbar.set_status(self.localization.get_text("status.loading"))
             
-            self.update_status()
+            # До загрузки новые задачи попадают в список выбранной даты
+            if self.current_task_list is None or self.current_task_list.date != target_date:
+                self.current_task_list = TaskList(date=target_date)
+            self.repository.submit(
+                self._read_day, target_date,
+                on_result=partial(self.on_day_loaded, target_date),
+                on_error=self.on_load_failed
+            )
+        
+        except Exception as e:
+            self.on_load_failed(e)
+    
+    def _read_day(self, target_date: date) -> Tuple[int, DayEntry]:
+        """Прочитать день в потоке базы данных (горизонт экземпляров продлевается по мере прокрутки)"""
+        self.occurrence_expander.ensure_horizon(target_date)
+        generation = self.day_cache.generation()
+        return generation, load_day(self.database, target_date)
+    
+    def on_day_loaded(self, target_date: date, result: Tuple[int, DayEntry]):
+        """Обработка загруженного дня: показать, если дата все еще выбрана"""
+        generation, (task_list, tasks) = result
+        self.day_cache.put(target_date, task_list, tasks, generation)
+        
+        if target_date != self.current_date:
+            return
+        
+        # Перечитанный день не изменился: список не перестраивается
+        current_list = self.current_task_list
+        same_list = current_list is not None and current_list.date == target_date and (
+            task_list == current_list if task_list is not None else current_list.id is None
+        )
+        if same_list and tasks == self.task_list_widget.tasks:
             self.status_toolbar.set_status(self.localization.get_text("status.ready"))
+            return
+        
+        self.display_day(target_date, task_list, tasks)
+    
+    def on_load_failed(self, error: Exception):
+        """Обработка ошибки загрузки задач"""
+        logger.error(f"Ошибка загрузки задач: {error}")
+        self.status_toolbar.set_status(self.localization.get_text("status.error"))
+        QMessageBox.critical(
+            self,
+            self.localization.get_text("app.error"),
+            f"{self.localization.get_text('errors.load_failed')}: {str(error)}"
+        )
+    
+    def display_day(self, target_date: date, task_list: Optional[TaskList], tasks: List):
+        """Показать задачи дня"""
+        # Даты без списка показываются пустым виртуальным списком: строка
+        # в task_lists создается только вместе с первой задачей
+        self.current_task_list = task_list or TaskList(date=target_date)
+        
+        self.task_list_widget.set_tasks(tasks)
+        self.task_list_widget.set_list_title(self.current_task_list.title)
+        if self.reminder_scheduler is not None:
+            self.reminder_scheduler.sync_day(target_date, tasks)
+        
+        self.update_status()
+        self.status_toolbar.set_status(self.localization.get_text("status.ready"))
+        self.refresh_day_cache()
+        
+        logger.debug(f"Загружено {len(tasks)} задач для {target_date}")
+    
+    def refresh_day_cache(self):
+        """Сохранить текущий день в кэш и предзагрузить соседние дни в фоне"""
+        try:
+            # Список задач текущего дня совпадает с базой после записи через окно
+            self.day_cache.put(self.current_date, self.current_task_list,
+                               self.task_list_widget.tasks, self.day_cache.generation())
             
-            logger.debug(f"Загружено {len(tasks)} задач для {self.current_date}")
-            
+            for distance in range(1, self.PREFETCH_DAYS + 1):
+                for offset in (-distance, distance):
+                    neighbour = self.current_date + timedelta(days=offset)
+                    if not self.day_cache.contains(neighbour):
+                        self.repository.submit(self._prefetch_day, neighbour, background=True)
+        
         except Exception as e:
-            logger.error(f"Ошибка загрузки задач: {e}")
-            self.status_toolbar.set_status(self.localization.get_text("status.error"))
-            QMessageBox.critical(
-                self,
-                self.localization.get_text("app.error"),
-                f"{self.localization.get_text('errors.load_failed')}: {str(e)}"
-            )
+            logger.error(f"Ошибка обновления кэша дней: {e}")
+    
+    def _prefetch_day(self, target_date: date):
+        """Загрузить день в кэш (в потоке базы данных)"""
+        self.occurrence_expander.ensure_horizon(target_date)
+        # Поколение берется до чтения: сброс дня во время чтения отменит сохранение
+        generation = self.day_cache.generation()
+        if not self.day_cache.contains(target_date):
+            self.day_cache.put(target_date, *load_day(self.database, target_date), generation)
+    
+    def on_write_failed(self, error_key: str, error: Exception):
+        """Обработка ошибки записи: показать ошибку и перечитать день из базы данных"""
+        logger.error(f"Ошибка записи задачи: {error}")
+        QMessageBox.critical(
+            self,
+            self.localization.get_text("app.error"),
+            f"{self.localization.get_text(error_key)}: {str(error)}"
+        )
+        
+        # Интерфейс мог показать изменение, которое не попало в базу
+        self.day_cache.clear()
+        self.load_current_date_tasks()
+    
+    def wait_for_background_tasks(self):
+        """Дождаться отправленных записей и остановить поток базы данных"""
+        if self.change_feed is not None:
+            self.change_feed.stop()
+        self.repository.stop()
     
     def on_task_toggled(self, task, is_completed: bool):
         """Обработка изменения статуса задачи"""
         try:
-            if isinstance(task, TaskOccurrence):
-                if is_completed:
-                    task.mark_completed()
-                else:
-                    task.mark_pending()
-                # TODO: Обновить в базе данных
-            else:  # Task
-                if is_completed:
-                    task.mark_completed()
-                else:
-                    task.mark_pending()
-                self.database.update_task(task)
+            if is_completed:
+                task.mark_completed()
+            else:
+                task.mark_pending()
             
+            # Интерфейс обновляется сразу, запись идет в потоке базы данных
             self.task_list_widget.update_task(task)
             self.update_status()
+            if self.reminder_scheduler is not None:
+                self.reminder_scheduler.update_item_reminder(task, self.current_date)
             
-            logger.debug(f"Статус задачи изменен: {task.title if hasattr(task, 'title') else 'occurrence'}")
+            write = (self.database.update_occurrence if isinstance(task, TaskOccurrence)
+                     else self.database.update_task)
+            self.repository.submit(
+                self._write_tracked, write, task,
+                on_result=self.on_task_status_written,
+                on_error=partial(self.on_write_failed, 'errors.save_failed')
+            )
             
+            logger.debug(f"Статус задачи изменен: {task.title if hasattr(task, 'title') else 'occurrence'}")
+        
         except Exception as e:
             logger.error(f"Ошибка изменения статуса задачи: {e}")
             QMessageBox.critical(
@@ -316,13 +783,41 @@ class MainWindow(QMainWindow):
                 f"{self.localization.get_text('errors.save_failed')}: {str(e)}"
             )
     
+    def on_task_status_written(self, result: Tuple[Any, Any, Any]):
+        """Обработка записанного статуса задачи в потоке GUI"""
+        _, token_before, token_after = result
+        self.note_own_write(token_before, token_after)
+        self.refresh_day_cache()
+    
+    def on_global_search_requested(self, query: str):
+        """Поиск задач по всем датам через полнотекстовый индекс (в потоке базы данных)"""
+        self._search_query = query
+        self.repository.submit(
+            self.database.search_tasks, query, limit=self.SEARCH_RESULTS_LIMIT,
+            on_result=partial(self.on_search_results, query),
+            on_error=self.on_search_failed
+        )
+    
+    def on_search_results(self, query: str, results: List):
+        """Показать результаты поиска, если запрос не устарел"""
+        if query != self._search_query or not self.task_list_widget.is_global_search:
+            return
+        
+        self.task_list_widget.set_search_results(results)
+        logger.debug(f"Найдено задач по запросу '{query}': {len(results)}")
+    
+    def on_search_failed(self, error: Exception):
+        """Обработка ошибки поиска задач"""
+        logger.error(f"Ошибка поиска задач: {error}")
+        self.status_toolbar.set_status(self.localization.get_text("status.error"))
+    
     def add_task(self):
         """Добавить новую задачу"""
         try:
             dialog = TaskEditorDialog(self.localization, parent=self)
             dialog.task_saved.connect(self.on_task_saved)
             dialog.exec()
-            
+        
         except Exception as e:
             logger.error(f"Ошибка открытия диалога добавления задачи: {e}")
     
@@ -332,7 +827,7 @@ class MainWindow(QMainWindow):
             dialog = TaskEditorDialog(self.localization, task, parent=self)
             dialog.task_saved.connect(self.on_task_saved)
             dialog.exec()
-            
+        
         except Exception as e:
             logger.error(f"Ошибка открытия диалога редактирования задачи: {e}")
     
@@ -354,17 +849,20 @@ class MainWindow(QMainWindow):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                if isinstance(task, TaskOccurrence):
-                    # TODO: Удалить экземпляр повторяющейся задачи
-                    pass
-                else:  # Task
-                    self.database.delete_task(task.id)
-                
+                # Интерфейс обновляется сразу, удаление идет в потоке базы данных
                 self.task_list_widget.remove_task(task)
+                if self.reminder_scheduler is not None:
+                    self.reminder_scheduler.cancel_reminder(reminder_key(task))
                 self.update_status()
                 
-                logger.info(f"Задача удалена: {task.title if hasattr(task, 'title') else 'occurrence'}")
+                self.repository.submit(
+                    self._write_tracked, self._delete_task, task,
+                    on_result=self.on_task_deleted,
+                    on_error=partial(self.on_write_failed, 'errors.delete_failed')
+                )
                 
+                logger.info(f"Задача удалена: {task.title if hasattr(task, 'title') else 'occurrence'}")
+        
         except Exception as e:
             logger.error(f"Ошибка удаления задачи: {e}")
             QMessageBox.critical(
@@ -373,6 +871,21 @@ class MainWindow(QMainWindow):
                 f"{self.localization.get_text('errors.delete_failed')}: {str(e)}"
             )
     
+    def _delete_task(self, task):
+        """Удалить задачу в потоке базы данных"""
+        if isinstance(task, TaskOccurrence):
+            # Пропускаем дату: исключение не даст развернуть экземпляр снова
+            self.database.add_recurrence_exception(task.task_id, task.scheduled_at.date())
+        else:  # Task
+            self.database.delete_task(task.id)
+    
+    def on_task_deleted(self, result: Tuple[Any, Any, Any]):
+        """Обработка удаленной задачи в потоке GUI"""
+        _, token_before, token_after = result
+        self.note_own_write(token_before, token_after)
+        self.calendar_widget.invalidate_task_counts()
+        self.refresh_day_cache()
+    
     def delete_selected_task(self):
         """Удалить выбранную задачу"""
         # TODO: Получить выбранную задачу из списка
@@ -384,28 +897,21 @@ class MainWindow(QMainWindow):
         pass
     
     def on_task_saved(self, task):
-        """Обработка сохранения задачи"""
+        """Обработка сохранения задачи (запись идет в потоке базы данных)"""
         try:
-            if isinstance(task, TaskOccurrence):
-                # TODO: Сохранить экземпляр повторяющейся задачи
-                pass
-            else:  # Task
-                if task.id:
-                    # Обновляем существующую задачу
-                    self.database.update_task(task)
-                    self.task_list_widget.update_task(task)
-                else:
-                    # Создаем новую задачу
-                    task.list_id = self.current_task_list.id
-                    task_id = self.database.create_task(task)
-                    task.id = task_id
-                    self.task_list_widget.add_task(task)
-                    self.current_tasks.append(task)
-            
-            self.update_status()
-            
-            logger.info(f"Задача сохранена: {task.title if hasattr(task, 'title') else 'occurrence'}")
+            had_occurrences = not isinstance(task, TaskOccurrence) and any(
+                isinstance(item, TaskOccurrence) and item.task_id == task.id
+                for item in self.current_tasks
+            )
+            task_created = not isinstance(task, TaskOccurrence) and not task.id
             
+            self.repository.submit(
+                self._write_tracked, self._write_task, task, self.current_task_list,
+                on_result=partial(self.on_task_written, task, self.current_date,
+                                  task_created, had_occurrences),
+                on_error=partial(self.on_write_failed, 'errors.save_failed')
+            )
+        
         except Exception as e:
             logger.error(f"Ошибка сохранения задачи: {e}")
             QMessageBox.critical(
@@ -414,6 +920,117 @@ class MainWindow(QMainWindow):
                 f"{self.localization.get_text('errors.save_failed')}: {str(e)}"
             )
     
+    def _write_tracked(self, write: Callable, task, *args) -> Tuple[Any, Any, Any]:
+        """
+        Выполнить запись задачи окном в потоке базы данных и сбросить в кэше
+        дни, на которых задача показывалась до записи и показывается после нее
+        
+        Returns:
+            (результат записи, признак изменения данных до записи, после записи)
+        """
+        days_before = self._task_days(task)
+        # Транзакция: записанные изменения не вернутся окну через ленту изменений.
+        # Признак читается под блокировкой записи: чужая запись не попадет между
+        # ним и COMMIT, а своя меняет только write_version (на единицу за транзакцию)
+        with self.database.transaction():
+            token_before = self._read_change_token()
+            result = write(task, *args)
+        token_after = None
+        if token_before is not None:
+            token_after = (token_before[0] + 1, token_before[1])
+        
+        self._discard_task_days(days_before, self._task_days(task))
+        return result, token_before, token_after
+    
+    def _task_days(self, task) -> Tuple[Set[date], Optional[Tuple[date, date]]]:
+        """Дни задачи в потоке базы данных: (отдельные дни, диапазон дней экземпляров)"""
+        if isinstance(task, TaskOccurrence):
+            return {task.scheduled_at.date()}, None
+        if not task.id:
+            return set(), None
+        
+        list_date, occurrence_range = self.database.get_task_dates(task.id)
+        return ({list_date} if list_date else set()), occurrence_range
+    
+    def _discard_task_days(self, *task_days: Tuple[Set[date], Optional[Tuple[date, date]]]):
+        """Сбросить в кэше дни задачи (текущий день кладется обратно из списка после записи)"""
+        dates = set().union(*(days for days, _ in task_days))
+        self.day_cache.discard(dates)
+        
+        ranges = [occurrence_range for _, occurrence_range in task_days if occurrence_range]
+        if ranges:
+            # Повторяющаяся задача: ее экземпляры (и родительская задача в них) на всех днях диапазона
+            self.day_cache.discard_range(min(start for start, _ in ranges),
+                                         max(end for _, end in ranges))
+    
+    def note_own_write(self, token_before, token_after):
+        """
+        Учесть запись окна в признаке изменения данных: своя запись не требует
+        перечитывать день. Если до записи база уже изменилась извне, признак
+        не обновляется и следующая проверка перечитает день.
+        """
+        if token_before is not None and token_before == self._change_token:
+            self._change_token = token_after
+    
+    def _write_task(self, task, task_list: TaskList) -> Optional[int]:
+        """
+        Записать задачу в потоке базы данных
+        
+        Returns:
+            ID списка задач (None для экземпляра повторяющейся задачи)
+        """
+        if isinstance(task, TaskOccurrence):
+            self.database.update_occurrence(task)
+            return None
+        
+        if task.id:
+            # Обновляем существующую задачу
+            self.database.update_task(task)
+        else:
+            # Создаем новую задачу (и список дня, если он еще виртуальный). Список
+            # ищется по дате: показанный пустой список мог удалить обслуживание базы данных
+            with self.database.transaction():
+                existing = self.database.get_task_list_by_date(task_list.date)
+                list_id = existing.id if existing else self.database.create_task_list(task_list)
+                task.list_id = list_id
+                task_id = self.database.create_task(task)
+            task.id = task_id
+        
+        # Пересчитываем экземпляры только этой задачи
+        self.occurrence_expander.expand_task(task)
+        return task.list_id
+    
+    def on_task_written(self, task, target_date: date, task_created: bool,
+                        had_occurrences: bool, result: Tuple[Optional[int], Any, Any]):
+        """Обработка записанной задачи в потоке GUI"""
+        list_id, token_before, token_after = result
+        self.note_own_write(token_before, token_after)
+        
+        # Пока шла запись, пользователь мог перейти на другую дату
+        if target_date == self.current_date:
+            if list_id is not None and self.current_task_list.id is None:
+                self.current_task_list.id = list_id
+            
+            if task_created:
+                self.task_list_widget.add_task(task)
+            else:
+                self.task_list_widget.update_task(task)
+        
+        if self.reminder_scheduler is not None:
+            self.reminder_scheduler.update_item_reminder(task, target_date)
+        
+        if not isinstance(task, TaskOccurrence):
+            # Новая задача или другие экземпляры меняют количество задач по дням
+            if task_created or task.is_recurring or had_occurrences:
+                self.calendar_widget.invalidate_task_counts()
+            if (task.is_recurring or had_occurrences) and target_date == self.current_date:
+                self.load_current_date_tasks()
+        
+        self.update_status()
+        self.refresh_day_cache()
+        
+        logger.info(f"Задача сохранена: {task.title if hasattr(task, 'title') else 'occurrence'}")
+    
     def go_to_today(self):
         """Перейти к сегодняшней дате"""
         self.calendar_widget.go_to_today()
@@ -441,13 +1058,79 @@ class MainWindow(QMainWindow):
             f"Планировщик задач с календарем и напоминаниями"
         )
     
-    def refresh_data(self):
-        """Обновить данные"""
+    def _read_change_token(self) -> Optional[Tuple[int, int]]:
+        """
+        Признак изменения данных в потоке базы данных
+        (None при ошибке: следующая проверка обновит день)
+        """
         try:
-            self.load_current_date_tasks()
-            # TODO: Обновить выделение дат с задачами в календаре
+            return self.database.get_change_token()
+        
+        except Exception as e:
+            logger.error(f"Ошибка проверки изменений базы данных: {e}")
+            return None
+    
+    def check_for_changes(self):
+        """Периодическая проверка: перечитать день, только если база данных изменилась"""
+        # Скрытое в трей или свернутое окно не обновляется (проверка - при показе)
+        if not self.isVisible() or self.isMinimized():
+            return
+        
+        self.repository.submit(
+            self._read_change_token,
+            on_result=self.on_change_token_read,
+            background=True
+        )
+    
+    def on_change_token_read(self, token: Optional[Tuple[int, int]]):
+        """Обработка признака изменения данных: перечитать день, если база изменилась"""
+        if not self.isVisible() or self.isMinimized():
+            return
+        if token is not None and token == self._change_token:
+            return
+        
+        logger.debug("База данных изменилась, день перечитывается")
+        self.refresh_data(quiet=True)
+    
+    def update_change_token(self):
+        """Запомнить признак изменения данных перед перечитыванием дня"""
+        # Запрос в очереди раньше чтения дня: признак не новее прочитанных данных
+        self.repository.submit(
+            self._read_change_token,
+            on_result=self.on_change_token_updated
+        )
+    
+    def on_change_token_updated(self, token: Optional[Tuple[int, int]]):
+        """Запомнить прочитанный признак изменения данных"""
+        self._change_token = token
+    
+    def showEvent(self, event):
+        """Показ окна: проверить изменения, пропущенные пока окно было скрыто"""
+        super().showEvent(event)
+        if self._startup_finished:
+            self.check_for_changes()
+            self.refresh_timer.start(self.REFRESH_INTERVAL_MS)
+    
+    def hideEvent(self, event):
+        """Скрытие окна: периодическая проверка не нужна"""
+        super().hideEvent(event)
+        if self._startup_finished:
+            self.refresh_timer.stop()
+    
+    def refresh_data(self, quiet: bool = False):
+        """
+        Обновить данные
+        
+        Args:
+            quiet: Не показывать индикацию загрузки (фоновая проверка изменений)
+        """
+        try:
+            self.update_change_token()
+            self.day_cache.clear()
+            self.load_current_date_tasks(quiet)
+            self.calendar_widget.invalidate_task_counts()
             logger.debug("Данные обновлены")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка обновления данных: {e}")
     
@@ -455,27 +1138,13 @@ class MainWindow(QMainWindow):
         """Обновить статусную строку"""
         try:
             # Текущая дата
-            if self.localization.current_language == 'ru':
-                date_str = self.current_date.strftime("%d %B %Y")
-                # Заменяем английские названия месяцев на русские
-                month_names = {
-                    'January': 'января', 'February': 'февраля', 'March': 'марта',
-                    'April': 'апреля', 'May': 'мая', 'June': 'июня',
-                    'July': 'июля', 'August': 'августа', 'September': 'сентября',
-                    'October': 'октября', 'November': 'ноября', 'December': 'декабря'
-                }
-                for eng, rus in month_names.items():
-                    date_str = date_str.replace(eng, rus)
-            else:
-                date_str = self.current_date.strftime("%B %d, %Y")
-            
+            date_str = self.localization.dates.format_long_date(self.current_date)
             self.status_toolbar.set_current_date(date_str)
             
             # Счетчик задач
-            total_tasks = len(self.current_tasks)
-            completed_tasks = sum(1 for task in self.current_tasks if task.is_completed)
+            total_tasks, completed_tasks = self.task_list_widget.task_counts()
             self.status_toolbar.set_tasks_count(total_tasks, completed_tasks)
-            
+        
         except Exception as e:
             logger.error(f"Ошибка обновления статуса: {e}")
     
@@ -499,30 +1168,31 @@ class MainWindow(QMainWindow):
                 logger.debug(f"Применена тема: {theme}")
             else:
                 logger.warning(f"Файл темы не найден: {style_file}")
-                
+        
         except Exception as e:
             logger.error(f"Ошибка применения темы: {e}")
     
     def restore_geometry(self):
         """Восстановить геометрию окна"""
         try:
-            geometry = self.settings.get('window_geometry')
+            geometry = self.settings.get_bytes('window_geometry')
             if geometry:
                 self.restoreGeometry(geometry)
             
-            state = self.settings.get('window_state')
+            state = self.settings.get_bytes('window_state')
             if state:
                 self.restoreState(state)
-                
+        
         except Exception as e:
             logger.error(f"Ошибка восстановления геометрии окна: {e}")
     
     def save_geometry(self):
         """Сохранить геометрию окна"""
         try:
-            self.settings.set('window_geometry', self.saveGeometry())
-            self.settings.set('window_state', self.saveState())
-            
+            with self.settings.batch():
+                self.settings.set('window_geometry', self.saveGeometry())
+                self.settings.set('window_state', self.saveState())
+        
         except Exception as e:
             logger.error(f"Ошибка сохранения геометрии окна: {e}")
     
@@ -541,7 +1211,7 @@ class MainWindow(QMainWindow):
                 self.closing.emit()
                 event.accept()
                 logger.debug("Окно закрыто")
-                
+        
         except Exception as e:
             logger.error(f"Ошибка закрытия окна: {e}")
             event.accept()
@@ -565,6 +1235,6 @@ class MainWindow(QMainWindow):
             self.update_status()
             
             logger.debug("Локализация главного окна обновлена")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка обновления локализации главного окна: {e}")
@@ -4,14 +4,15 @@
 
 import logging
 from datetime import date, datetime, timedelta
-from typing import Optional, Callable
+from functools import partial
+from typing import Optional, Callable, Dict, Tuple
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QCalendarWidget, 
     QPushButton, QLabel, QFrame
 )
 from PySide6.QtCore import Signal, QDate, Qt
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QFont, QTextCharFormat, QColor
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +23,23 @@ class CalendarWidget(QWidget):
     # Сигналы
     date_selected = Signal(date)  # Выбрана новая дата
     
+    # Сетка QCalendarWidget: 6 недель, включая дни соседних месяцев
+    GRID_DAYS = 42
+    
     def __init__(self, localization, parent=None):
         super().__init__(parent)
         self.localization = localization
         self.current_date = date.today()
         
+        # Количество задач по дням: источник данных и кэш по месяцам (год, месяц)
+        self.task_counts_provider: Optional[
+            Callable[[date, date, Callable[[Dict[date, int]], None]], None]] = None
+        self._task_counts_cache: Dict[Tuple[int, int], Dict[date, int]] = {}
+        # Поколение кэша: ответы на запросы до сброса кэша отбрасываются
+        self._task_counts_generation = 0
+        # Даты, выделенные сейчас: при смене выделения переформатируется только разница
+        self._highlighted_dates: set[date] = set()
+        
         self.setup_ui()
         self.connect_signals()
     
@@ -125,6 +138,7 @@ class CalendarWidget(QWidget):
         """Подключение сигналов"""
         # Основной календарь
         self.calendar.selectionChanged.connect(self.on_calendar_selection_changed)
+        self.calendar.currentPageChanged.connect(self.on_page_changed)
         
         # Кнопки навигации
         self.today_button.clicked.connect(self.go_to_today)
@@ -151,21 +165,7 @@ class CalendarWidget(QWidget):
     def update_date_label(self):
         """Обновить отображение текущей даты"""
         try:
-            # Форматируем дату в зависимости от языка
-            if self.localization.current_language == 'ru':
-                formatted_date = self.current_date.strftime("%d %B %Y")
-                # Заменяем английские названия месяцев на русские
-                month_names = {
-                    'January': 'января', 'February': 'февраля', 'March': 'марта',
-                    'April': 'апреля', 'May': 'мая', 'June': 'июня',
-                    'July': 'июля', 'August': 'августа', 'September': 'сентября',
-                    'October': 'октября', 'November': 'ноября', 'December': 'декабря'
-                }
-                for eng, rus in month_names.items():
-                    formatted_date = formatted_date.replace(eng, rus)
-            else:
-                formatted_date = self.current_date.strftime("%B %d, %Y")
-            
+            formatted_date = self.localization.dates.format_long_date(self.current_date)
             self.date_label.setText(formatted_date)
             
         except Exception as e:
@@ -216,6 +216,65 @@ class CalendarWidget(QWidget):
         next_monday = today + timedelta(days=7 - days_since_monday)
         self.set_selected_date(next_monday)
     
+    # Выделение дат с задачами
+    
+    def set_task_counts_provider(
+            self, provider: Callable[[date, date, Callable[[Dict[date, int]], None]], None]):
+        """
+        Установить источник количества задач по дням и выделить видимый месяц
+        
+        Args:
+            provider: Асинхронный запрос (начало, конец не включительно, callback);
+                callback получает {дата: количество} в потоке GUI
+        """
+        self.task_counts_provider = provider
+        self.invalidate_task_counts()
+    
+    def invalidate_task_counts(self):
+        """Сбросить кэш количества задач (после изменения задач) и перезапросить видимый месяц"""
+        self._task_counts_cache.clear()
+        self._task_counts_generation += 1
+        self.on_page_changed(self.calendar.yearShown(), self.calendar.monthShown())
+    
+    def visible_range(self, year: int, month: int) -> Tuple[date, date]:
+        """Диапазон дат [начало, конец), видимый в сетке календаря для месяца"""
+        first = date(year, month, 1)
+        first_weekday = self.calendar.firstDayOfWeek().value - 1  # Qt: понедельник = 1
+        offset = (first.weekday() - first_weekday) % 7
+        # Если месяц начинается с первого дня недели, Qt показывает целую неделю до него
+        start = first - timedelta(days=offset or 7)
+        return start, start + timedelta(days=self.GRID_DAYS)
+    
+    def on_page_changed(self, year: int, month: int):
+        """Обработка смены видимого месяца: запрос количества задач только при промахе кэша"""
+        if self.task_counts_provider is None:
+            return
+        
+        try:
+            counts = self._task_counts_cache.get((year, month))
+            if counts is not None:
+                self.highlight_dates_with_tasks(list(counts))
+                return
+            
+            self.task_counts_provider(
+                *self.visible_range(year, month),
+                partial(self.on_task_counts_loaded, self._task_counts_generation, year, month)
+            )
+        
+        except Exception as e:
+            logger.error(f"Ошибка получения количества задач по дням: {e}")
+    
+    def on_task_counts_loaded(self, generation: int, year: int, month: int,
+                              counts: Dict[date, int]):
+        """Обработка количества задач: выделить даты, если месяц все еще показан"""
+        # После сброса кэша уже отправлен новый запрос
+        if generation != self._task_counts_generation:
+            return
+        
+        self._task_counts_cache[(year, month)] = counts
+        if (year, month) == (self.calendar.yearShown(), self.calendar.monthShown()):
+            self.highlight_dates_with_tasks(list(counts))
+    
     def highlight_dates_with_tasks(self, dates_with_tasks: list[date]):
         """
         Выделить даты, на которые есть задачи
@@ -224,19 +283,24 @@ class CalendarWidget(QWidget):
             dates_with_tasks: Список дат с задачами
         """
         try:
-            # Сбрасываем предыдущие выделения
-            self.calendar.setDateTextFormat(QDate(), self.calendar.dateTextFormat(QDate()))
+            new_dates = set(dates_with_tasks)
             
-            # Выделяем даты с задачами
-            from PySide6.QtGui import QTextCharFormat, QColor
+            # Снимаем выделение только с дат, которые его потеряли
+            default_format = QTextCharFormat()
+            for task_date in self._highlighted_dates - new_dates:
+                qdate = QDate(task_date.year, task_date.month, task_date.day)
+                self.calendar.setDateTextFormat(qdate, default_format)
             
+            # Выделяем только новые даты
             format_with_tasks = QTextCharFormat()
             format_with_tasks.setBackground(QColor(0, 120, 212, 50))  # Полупрозрачный синий
             format_with_tasks.setForeground(QColor(0, 120, 212))      # Синий текст
             
-            for task_date in dates_with_tasks:
+            for task_date in new_dates - self._highlighted_dates:
                 qdate = QDate(task_date.year, task_date.month, task_date.day)
                 self.calendar.setDateTextFormat(qdate, format_with_tasks)
+            
+            self._highlighted_dates = new_dates
                 
         except Exception as e:
             logger.error(f"Ошибка выделения дат с задачами: {e}")
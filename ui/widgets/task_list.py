@@ -3,163 +3,396 @@
 """
 
 import logging
+from bisect import bisect_left
 from datetime import datetime, date
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Dict
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
-    QPushButton, QLineEdit, QComboBox, QLabel, QCheckBox, QFrame,
-    QMenu, QMessageBox
+    QWidget, QVBoxLayout, QHBoxLayout, QTreeView, QApplication,
+    QPushButton, QLineEdit, QComboBox, QLabel, QFrame, QMenu,
+    QStyle, QStyledItemDelegate, QStyleOptionButton, QStyleOptionViewItem
 )
-from PySide6.QtCore import Signal, Qt, QTimer
-from PySide6.QtGui import QFont, QAction
+from PySide6.QtCore import (
+    Signal, Qt, QTimer, QAbstractListModel, QModelIndex, QRect, QSize, QEvent,
+    QObject, QRunnable, QThreadPool
+)
+from PySide6.QtGui import QFont, QAction, QFontMetrics, QColor, QPalette
 
 from core.models import Task, TaskOccurrence, TaskStatus
 
 logger = logging.getLogger(__name__)
 
 
-class TaskListItem(QWidget):
-    """Виджет элемента задачи в списке"""
+# Роль модели, возвращающая сам Task/TaskOccurrence
+TASK_ROLE = Qt.ItemDataRole.UserRole + 1
+
+# Фильтры в порядке списка (ключи matches_filter и переводов filters.*)
+FILTER_KEYS = ("all", "active", "completed", "overdue", "today", "upcoming")
+
+# Как часто фоновый проход фильтрации проверяет, не устарел ли он
+FILTER_CANCEL_CHECK = 1024
+
+
+def item_fields(item):
+    """
+    Получить отображаемые поля задачи или экземпляра
+    
+    Returns:
+        (название, срок, выполнена, повторяющаяся)
+    """
+    if isinstance(item, TaskOccurrence):
+        return item.effective_title, item.effective_due_at, item.is_completed, True
+    return item.title, item.due_at, item.is_completed, item.is_recurring
+
+
+def matches_filter(item, current_filter: str, search_text: str, now: datetime, today: date) -> bool:
+    """Проверить, проходит ли задача фильтр по статусу и поиск по названию"""
+    title, due_at, is_completed, _ = item_fields(item)
+    
+    # Применяем фильтр по статусу
+    if current_filter == "active" and is_completed:
+        return False
+    elif current_filter == "completed" and not is_completed:
+        return False
+    elif current_filter == "overdue":
+        if not due_at or is_completed or due_at > now:
+            return False
+    elif current_filter == "today":
+        if not due_at or due_at.date() != today:
+            return False
+    elif current_filter == "upcoming":
+        if not due_at or due_at.date() <= today:
+            return False
+    
+    # Применяем поиск
+    if search_text:
+        if search_text not in title.lower():
+            return False
+    
+    return True
+
+
+def filter_tasks(items: List, current_filter: str, search_text: str, now: datetime, today: date,
+                 is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[List]:
+    """
+    Отфильтровать задачи
+    
+    Args:
+        is_cancelled: Проверка отмены, вызывается каждые FILTER_CANCEL_CHECK задач
+    
+    Returns:
+        Отфильтрованные задачи или None, если проход отменен
+    """
+    filtered = []
+    for position, item in enumerate(items):
+        if is_cancelled and position % FILTER_CANCEL_CHECK == 0 and is_cancelled():
+            return None
+        if matches_filter(item, current_filter, search_text, now, today):
+            filtered.append(item)
+    return filtered
+
+
+def task_key(item) -> tuple:
+    """Ключ задачи в списке: задачи и экземпляры имеют независимые id"""
+    return (isinstance(item, TaskOccurrence), item.id if item.id is not None else id(item))
+
+
+class TaskListModel(QAbstractListModel):
+    """
+    Модель отфильтрованного списка задач (Task и TaskOccurrence)
+    
+    Поддерживает точечные вставку, обновление и удаление строк; номер строки
+    по ключу задачи ищется через словарь. Вставка и удаление сбрасывают только
+    номера от измененной строки и дальше: при следующем поиске заново
+    индексируется лишь этот хвост.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._rows = {}  # ключ задачи -> номер строки
+        self._rows_valid_to = 0  # номера строк меньше этого значения в словаре верны
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._items):
+            return None
+        
+        item = self._items[index.row()]
+        if role == TASK_ROLE:
+            return item
+        if role == Qt.ItemDataRole.DisplayRole:
+            return item_fields(item)[0]
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if item.is_completed else Qt.CheckState.Unchecked
+        return None
+    
+    @property
+    def items(self) -> List:
+        """Задачи в порядке отображения (не изменять напрямую)"""
+        return self._items
+    
+    def set_items(self, items: List):
+        """Заменить содержимое модели"""
+        self.beginResetModel()
+        self._items = list(items)
+        self._rows = {}
+        self._rows_valid_to = 0
+        self.endResetModel()
+    
+    def item_at(self, row: int):
+        """Получить задачу по номеру строки"""
+        return self._items[row]
+    
+    def row_of(self, key) -> Optional[int]:
+        """Номер строки задачи по ключу или None"""
+        row = self._rows.get(key)
+        if row is not None and row < self._rows_valid_to:
+            return row
+        
+        # Строки после последней вставки или удаления индексируются заново
+        rows = self._rows
+        items = self._items
+        for row in range(self._rows_valid_to, len(items)):
+            rows[task_key(items[row])] = row
+        self._rows_valid_to = len(items)
+        return rows.get(key)
+    
+    def insert_item(self, row: int, item):
+        """Вставить задачу в строку row"""
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.insert(row, item)
+        if row == self._rows_valid_to == len(self._items) - 1:
+            # Вставка в конец полностью проиндексированного списка
+            self._rows[task_key(item)] = row
+            self._rows_valid_to += 1
+        else:
+            self._rows_valid_to = min(self._rows_valid_to, row)
+        self.endInsertRows()
+    
+    def update_item(self, row: int, item):
+        """Заменить задачу в строке row и перерисовать только ее"""
+        self._items[row] = item
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+    
+    def remove_item(self, row: int):
+        """Удалить строку row"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._rows.pop(task_key(self._items[row]), None)
+        del self._items[row]
+        self._rows_valid_to = min(self._rows_valid_to, row)
+        self.endRemoveRows()
+
+
+class TaskItemDelegate(QStyledItemDelegate):
+    """
+    Отрисовка строки задачи: чекбокс, название, детали, индикатор повторения
+    и кнопки действий (видны при наведении)
+    
+    Рисуются только видимые строки, виджеты на строку не создаются.
+    """
     
     # Сигналы
     task_toggled = Signal(object, bool)  # task/occurrence, is_completed
     task_edit_requested = Signal(object)  # task/occurrence
     task_delete_requested = Signal(object)  # task/occurrence
     
-    def __init__(self, task_or_occurrence, localization, parent=None):
+    MARGIN_H = 8
+    MARGIN_V = 4
+    SPACING = 8
+    BUTTON_SIZE = 24
+    
+    def __init__(self, localization, parent=None):
         super().__init__(parent)
-        self.item = task_or_occurrence  # Task или TaskOccurrence
         self.localization = localization
+        self.show_dates = False  # Показывать дату (результаты поиска за все даты)
         
-        self.setup_ui()
-        self.connect_signals()
-        self.update_display()
-    
-    def setup_ui(self):
-        """Настройка интерфейса элемента"""
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(8, 4, 8, 4)
-        layout.setSpacing(8)
+        self.title_font = QFont()
+        self.title_font.setPointSize(10)
+        self.completed_title_font = QFont(self.title_font)
+        self.completed_title_font.setStrikeOut(True)
         
-        # Чекбокс выполнения
-        self.completed_checkbox = QCheckBox()
-        layout.addWidget(self.completed_checkbox)
+        self.details_font = QFont()
+        self.details_font.setPointSize(8)
+        self.completed_details_font = QFont(self.details_font)
+        self.completed_details_font.setStrikeOut(True)
         
-        # Основная информация о задаче
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(2)
-        
-        # Название задачи
-        self.title_label = QLabel()
-        font = QFont()
-        font.setPointSize(10)
-        self.title_label.setFont(font)
-        info_layout.addWidget(self.title_label)
-        
-        # Время и дополнительная информация
-        self.details_label = QLabel()
-        font = QFont()
-        font.setPointSize(8)
-        self.details_label.setFont(font)
-        self.details_label.setStyleSheet("color: #666666;")
-        info_layout.addWidget(self.details_label)
-        
-        layout.addLayout(info_layout, 1)  # Растягиваем
+        title_height = QFontMetrics(self.title_font).height()
+        details_height = QFontMetrics(self.details_font).height()
+        self.row_height = max(
+            self.MARGIN_V * 2 + title_height + 2 + details_height,
+            self.MARGIN_V * 2 + self.BUTTON_SIZE
+        )
+    
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(0, self.row_height)
+    
+    def _checkbox_rect(self, option) -> QRect:
+        """Прямоугольник чекбокса в строке"""
+        style = self._style(option)
+        indicator = QStyleOptionButton()
+        size = style.subElementRect(QStyle.SubElement.SE_CheckBoxIndicator, indicator, option.widget).size()
+        rect = option.rect
+        return QRect(rect.left() + self.MARGIN_H,
+                     rect.top() + (rect.height() - size.height()) // 2,
+                     size.width(), size.height())
+    
+    def _button_rects(self, option):
+        """Прямоугольники кнопок редактирования и удаления"""
+        rect = option.rect
+        top = rect.top() + (rect.height() - self.BUTTON_SIZE) // 2
+        delete_rect = QRect(rect.right() - self.MARGIN_H - self.BUTTON_SIZE + 1, top,
+                            self.BUTTON_SIZE, self.BUTTON_SIZE)
+        edit_rect = delete_rect.translated(-self.BUTTON_SIZE - self.SPACING, 0)
+        return edit_rect, delete_rect
+    
+    @staticmethod
+    def _style(option):
+        return option.widget.style() if option.widget else QApplication.style()
+    
+    def _details_text(self, item, due_at) -> str:
+        """Строка деталей: время и признак экземпляра повторения"""
+        details_parts = []
         
-        # Индикатор повторяющейся задачи
-        self.recurring_label = QLabel("🔄")
-        self.recurring_label.setVisible(False)
-        layout.addWidget(self.recurring_label)
+        if due_at:
+            dates = self.localization.dates
+            due_text = dates.format_datetime(due_at) if self.show_dates else dates.format_time(due_at)
+            details_parts.append(f"⏰ {due_text}")
         
-        # Кнопки действий (скрыты по умолчанию)
-        self.edit_button = QPushButton("✏️")
-        self.edit_button.setMaximumSize(24, 24)
-        self.edit_button.setVisible(False)
-        layout.addWidget(self.edit_button)
+        if isinstance(item, TaskOccurrence):
+            details_parts.append("📅 " + self.localization.get_text("task.recurring"))
         
-        self.delete_button = QPushButton("🗑️")
-        self.delete_button.setMaximumSize(24, 24)
-        self.delete_button.setVisible(False)
-        layout.addWidget(self.delete_button)
-    
-    def connect_signals(self):
-        """Подключение сигналов"""
-        self.completed_checkbox.toggled.connect(self.on_completed_toggled)
-        self.edit_button.clicked.connect(self.on_edit_requested)
-        self.delete_button.clicked.connect(self.on_delete_requested)
+        return " | ".join(details_parts)
     
-    def update_display(self):
-        """Обновить отображение элемента"""
+    def paint(self, painter, option, index):
+        item = index.data(TASK_ROLE)
+        if item is None:
+            return
+        
+        painter.save()
         try:
-            # Определяем тип элемента и получаем данные
-            if isinstance(self.item, TaskOccurrence):
-                title = self.item.effective_title
-                due_at = self.item.effective_due_at
-                is_completed = self.item.is_completed
-                is_recurring = True
-            else:  # Task
-                title = self.item.title
-                due_at = self.item.due_at
-                is_completed = self.item.is_completed
-                is_recurring = self.item.is_recurring
+            title, due_at, is_completed, is_recurring = item_fields(item)
+            style = self._style(option)
             
-            # Обновляем название
-            self.title_label.setText(title or self.localization.get_text("task.title"))
+            # Фон строки (чередование, выделение, наведение)
+            background = QStyleOptionViewItem(option)
+            self.initStyleOption(background, index)
+            background.text = ""
+            background.features &= ~QStyleOptionViewItem.ViewItemFeature.HasCheckIndicator
+            style.drawControl(QStyle.ControlElement.CE_ItemViewItem, background, painter, option.widget)
             
-            # Обновляем детали
-            details_parts = []
+            # Чекбокс выполнения
+            check_rect = self._checkbox_rect(option)
+            indicator = QStyleOptionButton()
+            indicator.rect = check_rect
+            indicator.state = QStyle.StateFlag.State_Enabled | (
+                QStyle.StateFlag.State_On if is_completed else QStyle.StateFlag.State_Off
+            )
+            style.drawPrimitive(QStyle.PrimitiveElement.PE_IndicatorCheckBox, indicator, painter, option.widget)
             
-            if due_at:
-                time_str = due_at.strftime("%H:%M")
-                details_parts.append(f"⏰ {time_str}")
+            # Правая часть: кнопки при наведении и индикатор повторения
+            hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+            edit_rect, delete_rect = self._button_rects(option)
+            right = option.rect.right() - self.MARGIN_H
             
-            if isinstance(self.item, TaskOccurrence):
-                details_parts.append("📅 " + self.localization.get_text("task.recurring"))
+            painter.setFont(self.title_font)
+            if hovered:
+                painter.drawText(edit_rect, Qt.AlignmentFlag.AlignCenter, "✏️")
+                painter.drawText(delete_rect, Qt.AlignmentFlag.AlignCenter, "🗑️")
+                right = edit_rect.left() - self.SPACING
             
-            self.details_label.setText(" | ".join(details_parts))
+            if is_recurring:
+                recurring_rect = QRect(right - self.BUTTON_SIZE + 1, edit_rect.top(),
+                                       self.BUTTON_SIZE, self.BUTTON_SIZE)
+                painter.drawText(recurring_rect, Qt.AlignmentFlag.AlignCenter, "🔄")
+                right = recurring_rect.left() - self.SPACING
             
-            # Обновляем чекбокс
-            self.completed_checkbox.setChecked(is_completed)
+            # Название и детали
+            left = check_rect.right() + self.SPACING
+            text_width = max(right - left, 0)
+            top = option.rect.top() + self.MARGIN_V
             
-            # Показываем индикатор повторения
-            self.recurring_label.setVisible(is_recurring)
-            
-            # Применяем стиль для выполненных задач
-            if is_completed:
-                self.title_label.setStyleSheet("text-decoration: line-through; color: #888888;")
-                self.details_label.setStyleSheet("text-decoration: line-through; color: #888888;")
+            if option.state & QStyle.StateFlag.State_Selected:
+                title_color = option.palette.color(QPalette.ColorRole.HighlightedText)
             else:
-                self.title_label.setStyleSheet("")
-                self.details_label.setStyleSheet("color: #666666;")
-                
+                title_color = option.palette.color(QPalette.ColorRole.Text)
+            
+            title_font = self.completed_title_font if is_completed else self.title_font
+            title_metrics = QFontMetrics(title_font)
+            painter.setFont(title_font)
+            painter.setPen(QColor("#888888") if is_completed else title_color)
+            title_text = title or self.localization.get_text("task.title")
+            painter.drawText(QRect(left, top, text_width, title_metrics.height()),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                             title_metrics.elidedText(title_text, Qt.TextElideMode.ElideRight, text_width))
+            
+            details = self._details_text(item, due_at)
+            if details:
+                details_font = self.completed_details_font if is_completed else self.details_font
+                details_metrics = QFontMetrics(details_font)
+                painter.setFont(details_font)
+                painter.setPen(QColor("#888888") if is_completed else QColor("#666666"))
+                painter.drawText(QRect(left, top + title_metrics.height() + 2, text_width, details_metrics.height()),
+                                 Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                                 details_metrics.elidedText(details, Qt.TextElideMode.ElideRight, text_width))
+        
         except Exception as e:
-            logger.error(f"Ошибка обновления отображения задачи: {e}")
-    
-    def on_completed_toggled(self, checked: bool):
-        """Обработка изменения статуса выполнения"""
-        self.task_toggled.emit(self.item, checked)
-        self.update_display()
-    
-    def on_edit_requested(self):
-        """Обработка запроса редактирования"""
-        self.task_edit_requested.emit(self.item)
-    
-    def on_delete_requested(self):
-        """Обработка запроса удаления"""
-        self.task_delete_requested.emit(self.item)
-    
-    def enterEvent(self, event):
-        """Показать кнопки при наведении мыши"""
-        self.edit_button.setVisible(True)
-        self.delete_button.setVisible(True)
-        super().enterEvent(event)
-    
-    def leaveEvent(self, event):
-        """Скрыть кнопки при уходе мыши"""
-        self.edit_button.setVisible(False)
-        self.delete_button.setVisible(False)
-        super().leaveEvent(event)
+            logger.error(f"Ошибка отрисовки задачи: {e}")
+        finally:
+            painter.restore()
+    
+    def editorEvent(self, event, model, option, index) -> bool:
+        """Обработка кликов по чекбоксу и кнопкам действий"""
+        if event.type() != QEvent.Type.MouseButtonRelease or event.button() != Qt.MouseButton.LeftButton:
+            return super().editorEvent(event, model, option, index)
+        
+        item = index.data(TASK_ROLE)
+        if item is None:
+            return False
+        
+        position = event.position().toPoint()
+        edit_rect, delete_rect = self._button_rects(option)
+        
+        if self._checkbox_rect(option).contains(position):
+            self.task_toggled.emit(item, not item.is_completed)
+            return True
+        if edit_rect.contains(position):
+            self.task_edit_requested.emit(item)
+            return True
+        if delete_rect.contains(position):
+            self.task_delete_requested.emit(item)
+            return True
+        
+        return super().editorEvent(event, model, option, index)
+
+
+class _FilterSignals(QObject):
+    """Сигналы фонового прохода фильтрации (доставляются в поток GUI)"""
+    finished = Signal(int, list)  # поколение, отфильтрованные задачи
+
+
+class _FilterTask(QRunnable):
+    """Фоновый проход фильтрации по снимку списка задач"""
+    
+    def __init__(self, generation: int, items: List, params: tuple,
+                 is_cancelled: Callable[[], bool]):
+        super().__init__()
+        self.generation = generation
+        self.items = items
+        self.params = params
+        self.is_cancelled = is_cancelled
+        self.signals = _FilterSignals()
+    
+    def run(self):
+        try:
+            filtered = filter_tasks(self.items, *self.params, is_cancelled=self.is_cancelled)
+            if filtered is not None:
+                self.signals.finished.emit(self.generation, filtered)
+        except Exception as e:
+            logger.error(f"Ошибка фоновой фильтрации задач: {e}")
 
 
 class TaskListWidget(QWidget):
@@ -170,14 +403,45 @@ class TaskListWidget(QWidget):
     task_edit_requested = Signal(object)  # task/occurrence
     task_delete_requested = Signal(object)  # task/occurrence
     add_task_requested = Signal()
+    global_search_requested = Signal(str)  # текст запроса
+    
+    # Задержка поиска после последнего нажатия клавиши (мс)
+    SEARCH_DEBOUNCE_MS = 300
+    
+    # С какого размера списка фильтрация выполняется в фоновом потоке
+    FILTER_WORKER_THRESHOLD = 2000
     
     def __init__(self, localization, parent=None):
         super().__init__(parent)
         self.localization = localization
-        self.tasks = []  # Список Task и TaskOccurrence
-        self.filtered_tasks = []
+        
+        # Хранилище Task и TaskOccurrence по ключу (порядок словаря - порядок списка)
+        self._store: Dict[tuple, object] = {}
+        self._order: Dict[tuple, int] = {}  # ключ -> порядковый номер для вставки
+        self._next_order = 0
+        
+        # Счетчики выполненных: по всем задачам и по видимым строкам
+        self._completed_keys = set()
+        self._visible_completed_keys = set()
+        
+        # Результаты поиска по всем датам: ключ -> задача (в порядке релевантности)
+        self._search_results: Dict[tuple, object] = {}
+        self._result_order: Dict[tuple, int] = {}
+        
         self.current_filter = "all"
         self.search_text = ""
+        self.global_search = False
+        
+        # Поколение прохода фильтрации: результаты устаревших проходов отбрасываются
+        self._filter_generation = 0
+        self._filter_pending = False
+        self._filter_pool = QThreadPool(self)
+        self._filter_pool.setMaxThreadCount(1)
+        
+        # Один перезапускаемый таймер на все нажатия клавиш
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
         
         self.setup_ui()
         self.connect_signals()
@@ -194,8 +458,21 @@ class TaskListWidget(QWidget):
         # Поиск и фильтры
         self.create_search_and_filters(layout)
         
-        # Список задач
-        self.task_list = QListWidget()
+        # Список задач: модель + делегат, рисуются только видимые строки
+        self.task_model = TaskListModel(self)
+        self.task_delegate = TaskItemDelegate(self.localization, self)
+        
+        # QTreeView без заголовка и отступов вместо QListView: на dataChanged
+        # он перерисовывает одну строку, а QListView перекладывает весь список
+        self.task_list = QTreeView()
+        self.task_list.setObjectName("taskList")
+        self.task_list.setModel(self.task_model)
+        self.task_list.setItemDelegate(self.task_delegate)
+        self.task_list.setHeaderHidden(True)
+        self.task_list.setRootIsDecorated(False)
+        self.task_list.setIndentation(0)
+        self.task_list.setUniformRowHeights(True)
+        self.task_list.setMouseTracking(True)
         self.task_list.setAlternatingRowColors(True)
         layout.addWidget(self.task_list)
         
@@ -237,6 +514,12 @@ class TaskListWidget(QWidget):
         self.search_input.setPlaceholderText(self.localization.get_text("toolbar.search") + "...")
         search_layout.addWidget(self.search_input)
         
+        # Режим поиска по всем датам (полнотекстовый индекс базы данных)
+        self.global_search_button = QPushButton(self.localization.get_text("toolbar.search_all"))
+        self.global_search_button.setCheckable(True)
+        self.global_search_button.setToolTip(self.localization.get_text("toolbar.search_all_tooltip"))
+        search_layout.addWidget(self.global_search_button)
+        
         controls_layout.addLayout(search_layout)
         
         # Фильтры
@@ -245,14 +528,7 @@ class TaskListWidget(QWidget):
         filter_layout.addWidget(filter_label)
         
         self.filter_combo = QComboBox()
-        self.filter_combo.addItems([
-            self.localization.get_text("filters.all"),
-            self.localization.get_text("filters.active"),
-            self.localization.get_text("filters.completed"),
-            self.localization.get_text("filters.overdue"),
-            self.localization.get_text("filters.today"),
-            self.localization.get_text("filters.upcoming")
-        ])
+        self.fill_filter_combo()
         filter_layout.addWidget(self.filter_combo)
         
         filter_layout.addStretch()
@@ -286,170 +562,287 @@ class TaskListWidget(QWidget):
         """Подключение сигналов"""
         self.add_button.clicked.connect(lambda _: self.add_task_requested.emit())
         self.search_input.textChanged.connect(self.on_search_changed)
-        self.filter_combo.currentTextChanged.connect(self.on_filter_changed)
+        self.search_timer.timeout.connect(self.run_search)
+        self.global_search_button.toggled.connect(self.on_global_search_toggled)
+        self.filter_combo.currentIndexChanged.connect(self.on_filter_changed)
+        
+        # Действия над строками списка
+        self.task_delegate.task_toggled.connect(self.task_toggled.emit)
+        self.task_delegate.task_edit_requested.connect(self.task_edit_requested.emit)
+        self.task_delegate.task_delete_requested.connect(self.task_delete_requested.emit)
         
         # Контекстное меню для списка
         self.task_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.task_list.customContextMenuRequested.connect(self.show_context_menu)
     
+    @property
+    def tasks(self) -> List:
+        """Все задачи списка (Task и TaskOccurrence)"""
+        return list(self._store.values())
+    
+    @property
+    def filtered_tasks(self) -> List:
+        """Задачи, прошедшие фильтр и поиск, в порядке отображения"""
+        return self.task_model.items
+    
+    @property
+    def is_global_search(self) -> bool:
+        """Показываются ли результаты поиска по всем датам"""
+        return self.global_search and bool(self.search_text.strip())
+    
+    def task_counts(self) -> tuple[int, int]:
+        """Количество всех и выполненных задач списка"""
+        return len(self._store), len(self._completed_keys)
+    
     def set_tasks(self, tasks: List):
         """Установить список задач"""
-        self.tasks = tasks
+        self._store = {}
+        self._order = {}
+        self._completed_keys = set()
+        for task in tasks:
+            self._put(task)
+        self.apply_filters()
+    
+    def set_search_results(self, tasks: List):
+        """Показать результаты поиска по всем датам"""
+        self._search_results = {task_key(task): task for task in tasks}
+        self._result_order = {key: order for order, key in enumerate(self._search_results)}
         self.apply_filters()
     
     def add_task(self, task):
         """Добавить задачу в список"""
-        self.tasks.append(task)
-        self.apply_filters()
+        key = self._put(task)
+        if self._restart_pending_filter():
+            return
+        if not self.is_global_search and self._matches(task, datetime.now(), date.today()):
+            self._show(key, task)
+        self.update_status()
     
     def update_task(self, updated_task):
-        """Обновить задачу в списке"""
-        for i, task in enumerate(self.tasks):
-            if (hasattr(task, 'id') and hasattr(updated_task, 'id') and 
-                task.id == updated_task.id and type(task) == type(updated_task)):
-                self.tasks[i] = updated_task
-                break
-        self.apply_filters()
+        """Обновить задачу в списке (перерисовывается только ее строка)"""
+        key = task_key(updated_task)
+        if key in self._store:
+            self._put(updated_task)
+        if key in self._search_results:
+            self._search_results[key] = updated_task
+        
+        if key not in self._displayed_source() or self._restart_pending_filter():
+            return
+        
+        row = self.task_model.row_of(key)
+        if self._matches(updated_task, datetime.now(), date.today()):
+            if row is None:
+                self._show(key, updated_task)
+            else:
+                self.task_model.update_item(row, updated_task)
+                self._track_visible_completed(key, updated_task)
+        elif row is not None:
+            self._hide(key, row)
+        
+        self.update_status()
     
     def remove_task(self, task_to_remove):
         """Удалить задачу из списка"""
-        self.tasks = [task for task in self.tasks 
-                     if not (hasattr(task, 'id') and hasattr(task_to_remove, 'id') and
-                            task.id == task_to_remove.id and type(task) == type(task_to_remove))]
+        key = task_key(task_to_remove)
+        if self._store.pop(key, None) is not None:
+            self._order.pop(key, None)
+            self._completed_keys.discard(key)
+        self._search_results.pop(key, None)
+        
+        if self._restart_pending_filter():
+            return
+        
+        row = self.task_model.row_of(key)
+        if row is not None:
+            self._hide(key, row)
+        
+        self.update_status()
+    
+    def _put(self, task) -> tuple:
+        """Записать задачу в хранилище и обновить счетчик выполненных"""
+        key = task_key(task)
+        if key not in self._order:
+            self._order[key] = self._next_order
+            self._next_order += 1
+        self._store[key] = task
+        
+        if task.is_completed:
+            self._completed_keys.add(key)
+        else:
+            self._completed_keys.discard(key)
+        return key
+    
+    def _restart_pending_filter(self) -> bool:
+        """
+        Перезапустить незавершенный фоновый проход фильтрации
+        
+        Проход работает по снимку списка, поэтому точечное изменение модели
+        было бы перезаписано его результатом.
+        
+        Returns:
+            True, если проход был перезапущен
+        """
+        if not self._filter_pending:
+            return False
         self.apply_filters()
+        return True
+    
+    def _displayed_source(self) -> Dict[tuple, object]:
+        """Задачи, из которых строится отображение: список дня или результаты поиска"""
+        return self._search_results if self.is_global_search else self._store
+    
+    def _show(self, key: tuple, task):
+        """Вставить строку задачи с сохранением порядка источника"""
+        order = self._result_order if self.is_global_search else self._order
+        row = bisect_left(self.task_model.items, order[key], key=lambda item: order[task_key(item)])
+        self.task_model.insert_item(row, task)
+        self._track_visible_completed(key, task)
+    
+    def _hide(self, key: tuple, row: int):
+        """Убрать строку задачи из отображения"""
+        self.task_model.remove_item(row)
+        self._visible_completed_keys.discard(key)
+    
+    def _track_visible_completed(self, key: tuple, task):
+        if task.is_completed:
+            self._visible_completed_keys.add(key)
+        else:
+            self._visible_completed_keys.discard(key)
     
     def on_search_changed(self, text: str):
         """Обработка изменения поискового запроса"""
         self.search_text = text.lower()
-        # Добавляем небольшую задержку для оптимизации
-        QTimer.singleShot(300, self.apply_filters)
+        # Перезапускаем задержку: поиск выполнится один раз после паузы в наборе
+        self.search_timer.start()
     
-    def on_filter_changed(self, filter_text: str):
+    def on_global_search_toggled(self, checked: bool):
+        """Переключение поиска по всем датам"""
+        self.global_search = checked
+        self.run_search()
+    
+    def run_search(self):
+        """Выполнить поиск: по всем датам через базу данных или по текущему списку"""
+        self.search_timer.stop()
+        if self.is_global_search:
+            self.global_search_requested.emit(self.search_input.text())
+        else:
+            self._search_results = {}
+            self._result_order = {}
+            self.apply_filters()
+    
+    def fill_filter_combo(self):
+        """Заполнить список фильтров; ключ фильтра хранится в данных элемента"""
+        current_index = self.filter_combo.currentIndex()
+        
+        # Перезаполнение не меняет выбранный фильтр
+        self.filter_combo.blockSignals(True)
+        try:
+            self.filter_combo.clear()
+            for filter_key in FILTER_KEYS:
+                self.filter_combo.addItem(self.localization.get_text(f"filters.{filter_key}"), filter_key)
+            self.filter_combo.setCurrentIndex(max(current_index, 0))
+        finally:
+            self.filter_combo.blockSignals(False)
+    
+    def on_filter_changed(self, index: int):
         """Обработка изменения фильтра"""
-        filter_map = {
-            self.localization.get_text("filters.all"): "all",
-            self.localization.get_text("filters.active"): "active",
-            self.localization.get_text("filters.completed"): "completed",
-            self.localization.get_text("filters.overdue"): "overdue",
-            self.localization.get_text("filters.today"): "today",
-            self.localization.get_text("filters.upcoming"): "upcoming"
-        }
-        self.current_filter = filter_map.get(filter_text, "all")
+        self.current_filter = self.filter_combo.itemData(index) or "all"
         self.apply_filters()
     
+    def _filter_params(self) -> tuple:
+        """Снимок параметров фильтрации для filter_tasks"""
+        # Результаты поиска по всем датам уже отобраны индексом
+        search_text = "" if self.is_global_search else self.search_text
+        return self.current_filter, search_text, datetime.now(), date.today()
+    
+    def _matches(self, task, now: datetime, today: date) -> bool:
+        """Проверить, проходит ли задача текущие фильтр и поиск"""
+        current_filter, search_text, _, _ = self._filter_params()
+        return matches_filter(task, current_filter, search_text, now, today)
+    
     def apply_filters(self):
-        """Применить фильтры и поиск"""
+        """
+        Применить фильтры и поиск ко всему списку
+        
+        Большие списки фильтруются в фоновом потоке; новый вызов отменяет
+        незавершенный проход, а его результат будет отброшен.
+        """
         try:
-            # Фильтрация по статусу
-            filtered = []
-            now = datetime.now()
-            today = date.today()
-            
-            for task in self.tasks:
-                # Определяем параметры задачи
-                if isinstance(task, TaskOccurrence):
-                    is_completed = task.is_completed
-                    due_at = task.effective_due_at
-                    title = task.effective_title
-                else:  # Task
-                    is_completed = task.is_completed
-                    due_at = task.due_at
-                    title = task.title
-                
-                # Применяем фильтр по статусу
-                if self.current_filter == "active" and is_completed:
-                    continue
-                elif self.current_filter == "completed" and not is_completed:
-                    continue
-                elif self.current_filter == "overdue":
-                    if not due_at or is_completed or due_at > now:
-                        continue
-                elif self.current_filter == "today":
-                    if not due_at or due_at.date() != today:
-                        continue
-                elif self.current_filter == "upcoming":
-                    if not due_at or due_at.date() <= today:
-                        continue
-                
-                # Применяем поиск
-                if self.search_text:
-                    if self.search_text not in title.lower():
-                        continue
-                
-                filtered.append(task)
+            self._filter_generation += 1
+            generation = self._filter_generation
+            items = list(self._displayed_source().values())
+            params = self._filter_params()
             
-            self.filtered_tasks = filtered
-            self.update_list_display()
-            self.update_status()
+            if len(items) < self.FILTER_WORKER_THRESHOLD:
+                self._filter_pending = False
+                self._on_filtered(generation, filter_tasks(items, *params))
+                return
             
+            self._filter_pending = True
+            task = _FilterTask(
+                generation, items, params,
+                lambda: self._filter_generation != generation
+            )
+            task.signals.finished.connect(self._on_filtered)
+            self._filter_pool.start(task)
+        
         except Exception as e:
             logger.error(f"Ошибка применения фильтров: {e}")
     
-    def update_list_display(self):
-        """Обновить отображение списка"""
+    def _on_filtered(self, generation: int, filtered: List):
+        """Показать результат прохода фильтрации, если он не устарел"""
+        if generation != self._filter_generation:
+            return
+        
         try:
-            # Очищаем список
-            self.task_list.clear()
+            self._filter_pending = False
+            self.task_delegate.show_dates = self.is_global_search
             
-            # Добавляем отфильтрованные задачи
-            for task in self.filtered_tasks:
-                item = QListWidgetItem()
-                task_widget = TaskListItem(task, self.localization)
-                
-                # Подключаем сигналы
-                task_widget.task_toggled.connect(self.task_toggled.emit)
-                task_widget.task_edit_requested.connect(self.task_edit_requested.emit)
-                task_widget.task_delete_requested.connect(self.task_delete_requested.emit)
-                
-                # Устанавливаем размер элемента
-                item.setSizeHint(task_widget.sizeHint())
-                
-                # Добавляем в список
-                self.task_list.addItem(item)
-                self.task_list.setItemWidget(item, task_widget)
-                
+            self._visible_completed_keys = {
+                task_key(task) for task in filtered if task.is_completed
+            }
+            self.task_model.set_items(filtered)
+            self.update_status()
+        
         except Exception as e:
-            logger.error(f"Ошибка обновления отображения списка: {e}")
+            logger.error(f"Ошибка применения фильтров: {e}")
     
     def update_status(self):
         """Обновить строку статуса"""
         try:
-            total_count = len(self.filtered_tasks)
-            completed_count = sum(1 for task in self.filtered_tasks 
-                                if (task.is_completed if isinstance(task, TaskOccurrence) 
-                                   else task.is_completed))
+            total_count = self.task_model.rowCount()
+            completed_count = len(self._visible_completed_keys)
             
             status_text = f"{total_count} {self.localization.get_text('status.tasks_count')}"
             if completed_count > 0:
                 status_text += f", {completed_count} {self.localization.get_text('status.completed_count')}"
             
             self.status_label.setText(status_text)
-            
+        
         except Exception as e:
             logger.error(f"Ошибка обновления статуса: {e}")
     
     def show_context_menu(self, position):
         """Показать контекстное меню"""
         try:
-            item = self.task_list.itemAt(position)
-            if not item:
+            index = self.task_list.indexAt(position)
+            if not index.isValid():
                 return
+            item = index.data(TASK_ROLE)
             
             menu = QMenu(self)
             
             # Действия для задачи
             edit_action = QAction(self.localization.get_text("toolbar.edit"), self)
-            edit_action.triggered.connect(lambda: self.task_edit_requested.emit(
-                self.task_list.itemWidget(item).item))
+            edit_action.triggered.connect(lambda: self.task_edit_requested.emit(item))
             menu.addAction(edit_action)
             
             delete_action = QAction(self.localization.get_text("toolbar.delete"), self)
-            delete_action.triggered.connect(lambda: self.task_delete_requested.emit(
-                self.task_list.itemWidget(item).item))
+            delete_action.triggered.connect(lambda: self.task_delete_requested.emit(item))
             menu.addAction(delete_action)
             
             menu.exec(self.task_list.mapToGlobal(position))
-            
+        
         except Exception as e:
             logger.error(f"Ошибка показа контекстного меню: {e}")
     
@@ -463,25 +856,17 @@ class TaskListWidget(QWidget):
             # Обновляем тексты элементов управления
             self.add_button.setText(self.localization.get_text("toolbar.add"))
             self.search_input.setPlaceholderText(self.localization.get_text("toolbar.search") + "...")
+            self.global_search_button.setText(self.localization.get_text("toolbar.search_all"))
+            self.global_search_button.setToolTip(self.localization.get_text("toolbar.search_all_tooltip"))
             
             # Обновляем фильтры
-            current_index = self.filter_combo.currentIndex()
-            self.filter_combo.clear()
-            self.filter_combo.addItems([
-                self.localization.get_text("filters.all"),
-                self.localization.get_text("filters.active"),
-                self.localization.get_text("filters.completed"),
-                self.localization.get_text("filters.overdue"),
-                self.localization.get_text("filters.today"),
-                self.localization.get_text("filters.upcoming")
-            ])
-            self.filter_combo.setCurrentIndex(current_index)
+            self.fill_filter_combo()
             
-            # Обновляем отображение
-            self.update_list_display()
+            # Обновляем отображение (тексты строк берутся делегатом при отрисовке)
+            self.task_list.viewport().update()
             self.update_status()
             
             logger.debug("Локализация списка задач обновлена")
-            
+        
         except Exception as e:
             logger.error(f"Ошибка обновления локализации списка задач: {e}")